@@ -3,26 +3,38 @@ Website Kalsifikasi Penyakit Daun Tebu
 """
 
 import streamlit as st
-import cv2
 import numpy as np
-import joblib
-import matplotlib.pyplot as plt
-import shap
-from PIL import Image
-import io
+import dataclasses
+import importlib.util
+import os
 import base64
+import io
+import threading
 
-# Optional import 
+# Optional import (cek saja; google.generativeai baru di-import saat rekomendasi diminta)
 try:
-    import google.generativeai as genai
-    GEMINI_AVAILABLE = True
+    GEMINI_AVAILABLE = importlib.util.find_spec("google.generativeai") is not None
 except ImportError:
     GEMINI_AVAILABLE = False
+if not GEMINI_AVAILABLE:
     print("\n⚠️  WARNING: google.generativeai not installed!")
     print("   Aplikasi tetap jalan, tapi rekomendasi AI tidak tersedia.")
     print("   Install dengan: pip install google-generativeai\n")
 
-from feature_extraction import extract_features, create_readable_feature_names
+from feature_extraction import get_feature_extractor, create_readable_feature_names
+from inference import INFERENCE_VERSION, InferenceResult, run_inference
+from xai import create_explainer, load_background_summary, DEFAULT_BACKEND
+from result_cache import DiskResultCache, ExplanationCache, explanation_key, file_digest
+from explanation_jobs import ExplanationWorkerPool
+from recommendation_cache import RecommendationCache, recommendation_key
+from recommendation_fetch import CircuitBreaker, RecommendationFetcher
+from recommendation_store import get_rule_based
+from compress_model import AGREEMENT_LABEL_RULE, compressed_model_path, load_compressed_model
+from model_store import fused_pipeline, load_model_package
+from image_ingest import NormalizedImage
+from svm_engine import FusedSVMPipeline, SVMEngine, verify_against_sklearn
+from ui_assets import stylesheet_html
+import ui_templates
 
 # ==================== PAGE CONFIG ====================
 st.set_page_config(
@@ -33,974 +45,8 @@ st.set_page_config(
 )
 
 # ==================== CLEAN CSS STYLING ====================
-st.markdown("""
-<style>
-    @import url('https://fonts.googleapis.com/css2?family=Inter:wght@400;500;600;700;800&display=swap');
-    
-    * {
-        font-family: 'Inter', -apple-system, BlinkMacSystemFont, 'Segoe UI', sans-serif;
-    }
-    
-    /* HIDE SIDEBAR */
-    [data-testid="collapsedControl"] {
-        display: none !important;
-        visibility: hidden !important;
-    }
-    
-    [data-testid="stSidebar"] {
-        display: none !important;
-        visibility: hidden !important;
-        width: 0 !important;
-        min-width: 0 !important;
-    }
-    
-    section[data-testid="stSidebar"] {
-        display: none !important;
-        visibility: hidden !important;
-        width: 0 !important;
-    }
-    
-    [data-testid="stSidebar"] > div {
-        display: none !important;
-    }
-    
-    /* Clean background */
-    .stApp {
-        background: linear-gradient(135deg, #f7f9f6 0%, #ffffff 100%);
-    }
-    
-    /* Compact header */
-    .main-header {
-        background: linear-gradient(135deg, #2d5016 0%, #4a7c2e 100%);
-        padding: 1.8rem 2rem;
-        border-radius: 20px;
-        text-align: center;
-        box-shadow: 0 8px 24px rgba(45, 80, 22, 0.12);
-        margin-bottom: 2rem;
-    }
-    
-    .main-header h1 {
-        color: #ffffff;
-        font-size: 1.9rem;
-        font-weight: 800;
-        margin: 0;
-        letter-spacing: -0.5px;
-    }
-    
-    .main-header p {
-        color: rgba(255, 255, 255, 0.92);
-        font-size: 0.95rem;
-        margin: 0.5rem 0 0 0;
-        font-weight: 500;
-    }
-    
-    /* Card - NO BOX, just title + line */
-    .modern-card {
-        background: transparent !important;
-        border: none !important;
-        box-shadow: none !important;
-        padding: 0 !important;
-        margin-bottom: 2rem;
-    }
-    
-    .card-title {
-        color: #2d5016;
-        font-size: 1.05rem;
-        font-weight: 700;
-        margin: 0 0 1.2rem 0;
-        padding-bottom: 0.6rem;
-        border-bottom: 3px solid #8bc34a;
-    }
-    
-    /* Camera input styling */
-    [data-testid="stCameraInput"] {
-        border-radius: 12px;
-        overflow: hidden;
-    }
-    
-    [data-testid="stCameraInput"] button {
-        background: linear-gradient(135deg, #4a7c2e 0%, #6b9d4a 100%) !important;
-        color: white !important;
-        border: none !important;
-        padding: 0.8rem 1.5rem !important;
-        font-size: 0.95rem !important;
-        font-weight: 600 !important;
-        border-radius: 8px !important;
-        transition: all 0.3s ease !important;
-    }
-    
-    [data-testid="stCameraInput"] button:hover {
-        background: linear-gradient(135deg, #3a5f23 0%, #4a7c2e 100%) !important;
-        transform: translateY(-1px) !important;
-    }
-    
-    /* RESPONSIVE DESIGN - Complete */
-    
-    /* Tablet (Portrait & Landscape) */
-    @media (max-width: 1024px) {
-        .main-header {
-            padding: 1.5rem !important;
-        }
-        
-        .result-card {
-            min-height: 160px !important;
-        }
-    }
-    
-    /* Mobile & Small Tablets */
-    @media (max-width: 768px) {
-        .main-header h1 {
-            font-size: 1.5rem !important;
-        }
-        
-        .main-header p {
-            font-size: 0.85rem !important;
-        }
-        
-        .card-title, .plot-title {
-            font-size: 0.95rem !important;
-        }
-        
-        .result-value {
-            font-size: 1.8rem !important;
-        }
-        
-        .xai-header {
-            font-size: 1.2rem !important;
-        }
-        
-        [data-testid="column"] {
-            padding: 0 0.5rem !important;
-        }
-        
-        .info-box {
-            font-size: 0.85rem !important;
-            padding: 1rem !important;
-        }
-        
-        .stProgress {
-            max-width: 320px !important;
-        }
-    }
-    
-    /* Small Mobile */
-    @media (max-width: 480px) {
-        .main-header {
-            padding: 1.2rem 1rem !important;
-            margin-bottom: 1.5rem !important;
-        }
-        
-        .main-header h1 {
-            font-size: 1.3rem !important;
-        }
-        
-        .result-card {
-            padding: 1.5rem 1rem !important;
-            min-height: 140px !important;
-        }
-        
-        .result-value {
-            font-size: 1.5rem !important;
-        }
-        
-        .card-title, .plot-title {
-            font-size: 0.9rem !important;
-        }
-        
-        .stProgress {
-            max-width: 250px !important;
-        }
-        
-        .info-box {
-            padding: 0.8rem 1rem !important;
-            font-size: 0.8rem !important;
-        }
-        
-        .stButton>button {
-            padding: 0.8rem 1.5rem !important;
-            font-size: 0.95rem !important;
-        }
-        
-        /* Tabs responsive */
-        .stTabs [data-baseweb="tab"] {
-            padding: 0.5rem 0.8rem !important;
-            font-size: 0.85rem !important;
-        }
-    }
-    
-    /* File uploader - ALL TEXT VISIBLE */
-    [data-testid="stFileUploader"] {
-        background: transparent !important;
-    }
-    
-    [data-testid="stFileUploaderDropzone"] {
-        background: #fafbfa !important;
-        border: 2px dashed #6b9d4a !important;
-        border-radius: 16px !important;
-        padding: 1.5rem !important;
-        transition: all 0.3s ease !important;
-    }
-    
-    [data-testid="stFileUploaderDropzone"]:hover {
-        border-color: #4a7c2e !important;
-        background: #f5f7f4 !important;
-    }
-    
-    /* FIX: ALL text in uploader = DARK/VISIBLE */
-    [data-testid="stFileUploaderDropzone"] *,
-    [data-testid="stFileUploaderDropzone"] p,
-    [data-testid="stFileUploaderDropzone"] span,
-    [data-testid="stFileUploaderDropzone"] div,
-    [data-testid="stFileUploaderDropzone"] label,
-    [data-testid="stFileUploaderDropzone"] small {
-        color: #2d2d2d !important;
-    }
-    
-    [data-testid="stFileUploaderDropzoneInstructions"] {
-        color: #1a3a0f !important;
-        font-weight: 600 !important;
-    }
-    
-    [data-testid="stFileUploaderFileName"] {
-        color: #2d5016 !important;
-        font-weight: 700 !important;
-    }
-    
-    [data-testid="stFileUploaderFileSize"] {
-        color: #2d5016 !important;
-        font-weight: 600 !important;
-        background: #f1f8f4 !important;
-        padding: 0.2rem 0.5rem !important;
-        border-radius: 4px !important;
-    }
-    
-    /* Smooth fade-in animation for preview */
-    @keyframes fadeIn {
-        from {
-            opacity: 0;
-            transform: translateY(10px);
-        }
-        to {
-            opacity: 1;
-            transform: translateY(0);
-        }
-    }
-    
-    .img-preview-box {
-        animation: fadeIn 0.3s ease-in;
-    }
-    
-    /* CRITICAL: Image preview wrapper INSIDE card */
-    .img-preview-box {
-        background: #f8faf7;
-        border-radius: 12px;
-        padding: 1rem;
-        border: 2px solid #e1e8dd;
-        text-align: center;
-        min-height: 300px;
-        display: flex;
-        flex-direction: column;
-        align-items: center;
-        justify-content: center;
-        transition: all 0.3s ease;
-    }
-    
-    .img-preview-box img {
-        max-width: 100%;
-        max-height: 350px;
-        object-fit: contain;
-        border-radius: 8px;
-        box-shadow: 0 4px 12px rgba(0,0,0,0.08);
-        display: block;
-        margin: 0 auto;
-        animation: fadeIn 0.4s ease-in;
-    }
-    
-    .img-caption {
-        color: #555555 !important;
-        font-size: 0.85rem;
-        margin-top: 0.8rem;
-        font-weight: 500;
-    }
-    
-    .empty-state {
-        color: #666666 !important;
-        padding: 2rem;
-        text-align: center;
-    }
-    
-    .empty-state p {
-        color: #666666 !important;
-    }
-    
-    .empty-icon {
-        font-size: 3rem;
-        opacity: 0.4;
-        margin-bottom: 0.5rem;
-    }
-    
-    /* Modern button */
-    .stButton>button {
-        width: 100%;
-        background: linear-gradient(135deg, #4a7c2e 0%, #6b9d4a 100%) !important;
-        color: white !important;
-        border: none !important;
-        padding: 1rem 2rem !important;
-        font-size: 1rem !important;
-        font-weight: 700 !important;
-        border-radius: 14px !important;
-        letter-spacing: 0.5px !important;
-        box-shadow: 0 4px 14px rgba(74, 124, 46, 0.25) !important;
-        transition: all 0.3s cubic-bezier(0.4, 0, 0.2, 1) !important;
-    }
-    
-    .stButton>button:hover {
-        background: linear-gradient(135deg, #3a5f23 0%, #4a7c2e 100%) !important;
-        transform: translateY(-2px) !important;
-        box-shadow: 0 8px 20px rgba(74, 124, 46, 0.35) !important;
-    }
-    
-    .stButton>button:disabled {
-        background: #e0e0e0 !important;
-        color: #999999 !important;
-        transform: none !important;
-        box-shadow: none !important;
-    }
-    
-    /* Result cards */
-    .result-card {
-        background: linear-gradient(135deg, #ffffff 0%, #f5f9f3 100%);
-        border-radius: 20px;
-        padding: 2rem;
-        text-align: center;
-        box-shadow: 0 6px 20px rgba(0, 0, 0, 0.06);
-        border-left: 4px solid #6b9d4a;
-        min-height: 180px;
-        display: flex;
-        flex-direction: column;
-        justify-content: center;
-        transition: transform 0.3s ease;
-    }
-    
-    .result-card:hover {
-        transform: translateY(-4px);
-        box-shadow: 0 12px 32px rgba(0, 0, 0, 0.1);
-    }
-    
-    .result-label {
-        color: #2d5016 !important;
-        font-size: 0.85rem;
-        font-weight: 700;
-        text-transform: uppercase;
-        letter-spacing: 1.5px;
-        margin-bottom: 1rem;
-    }
-    
-    .result-value {
-        color: #2d5016;
-        font-size: 2.2rem;
-        font-weight: 800;
-        margin: 0.5rem 0;
-        line-height: 1.2;
-    }
-    
-    .result-desc {
-        color: #4a7c2e !important;
-        font-size: 0.85rem;
-        margin-top: 0.8rem;
-        line-height: 1.5;
-    }
-    
-    /* Info box */
-    .info-box {
-        background: linear-gradient(135deg, #f5f9f3 0%, #ffffff 100%);
-        border-left: 4px solid #6b9d4a;
-        padding: 1.2rem 1.5rem;
-        border-radius: 14px;
-        margin: 1.5rem 0;
-        font-size: 0.92rem;
-        color: #2d5016;
-        line-height: 1.7;
-        box-shadow: 0 2px 8px rgba(0,0,0,0.04);
-    }
-    
-    .info-box strong {
-        color: #2d5016;
-    }
-    
-    /* XAI section */
-    .xai-header {
-        color: #2d5016;
-        font-size: 1.4rem;
-        font-weight: 800;
-        text-align: center;
-        margin: 3rem 0 2rem 0;
-        letter-spacing: -0.3px;
-    }
-    
-    /* Gemini recommendation styling (for AI-generated) */
-    .gemini-recommendation h3 {
-        color: #d84315 !important;
-        font-size: 1.15rem;
-        font-weight: 800;
-        margin: 1.8rem 0 1rem 0;
-        padding-bottom: 0.6rem;
-        border-bottom: 3px solid #ff9800;
-    }
-    
-    .gemini-recommendation h3:first-child {
-        margin-top: 0;
-    }
-    
-    .gemini-recommendation h4 {
-        color: #e65100 !important;
-        font-size: 1rem;
-        font-weight: 700;
-        margin: 1.5rem 0 0.8rem 0;
-        padding-bottom: 0.5rem;
-        border-bottom: 2px solid #ffe0b2;
-    }
-    
-    .gemini-recommendation h4:first-child {
-        margin-top: 0;
-    }
-    
-    .gemini-recommendation h5 {
-        color: #e65100 !important;
-        font-size: 0.95rem;
-        font-weight: 700;
-        margin: 1.2rem 0 0.6rem 0;
-    }
-    
-    .gemini-recommendation p {
-        color: #5d4037 !important;
-        font-size: 0.9rem;
-        line-height: 1.8;
-        margin: 0.5rem 0;
-    }
-    
-    .gemini-recommendation ul, .gemini-recommendation ol {
-        color: #5d4037 !important;
-        font-size: 0.9rem;
-        line-height: 1.8;
-        margin: 0.5rem 0;
-        padding-left: 1.5rem;
-    }
-    
-    .gemini-recommendation li {
-        margin: 0.3rem 0;
-        color: #5d4037 !important;
-    }
-    
-    .gemini-recommendation strong {
-        color: #e65100 !important;
-        font-weight: 700;
-    }
-    
-    /* Rule-based recommendation styling (GREEN theme for fallback) */
-    .rule-based-recommendation h3 {
-        color: #194d19 !important;
-        font-size: 1.15rem;
-        font-weight: 800;
-        margin: 1.8rem 0 1rem 0;
-        padding-bottom: 0.6rem;
-        border-bottom: 3px solid #66bb6a;
-    }
-    
-    .rule-based-recommendation h3:first-child {
-        margin-top: 0;
-    }
-    
-    .rule-based-recommendation h4 {
-        color: #1b5e20 !important;
-        font-size: 1rem;
-        font-weight: 700;
-        margin: 1.5rem 0 0.8rem 0;
-        padding-bottom: 0.5rem;
-        border-bottom: 2px solid #81c784;
-    }
-    
-    .rule-based-recommendation h4:first-child {
-        margin-top: 0;
-    }
-    
-    .rule-based-recommendation h5 {
-        color: #2e7d32 !important;
-        font-size: 0.95rem;
-        font-weight: 700;
-        margin: 1.2rem 0 0.6rem 0;
-    }
-    
-    .rule-based-recommendation p {
-        color: #1b5e20 !important;
-        font-size: 0.9rem;
-        line-height: 1.8;
-        margin: 0.5rem 0;
-    }
-    
-    .rule-based-recommendation strong {
-        color: #1b5e20 !important;
-        font-weight: 700;
-    }
-    
-    .rule-based-recommendation ul, .rule-based-recommendation ol {
-        color: #2e7d32 !important;
-        font-size: 0.9rem;
-        line-height: 1.8;
-        margin: 0.5rem 0;
-        padding-left: 1.5rem;
-    }
-    
-    .rule-based-recommendation li {
-        margin: 0.3rem 0;
-        color: #2e7d32 !important;
-    }
-    
-    /* Error message code styling */
-    code {
-        background: #f5f5f5;
-        padding: 0.2rem 0.5rem;
-        border-radius: 4px;
-        font-family: 'Courier New', monospace;
-        font-size: 0.75rem;
-        color: #666;
-        display: inline-block;
-        max-width: 100%;
-        word-wrap: break-word;
-    }
-    
-    /* Plot cards - NO BOX, just title + line */
-    .plot-card {
-        background: transparent !important;
-        border: none !important;
-        box-shadow: none !important;
-        padding: 0 !important;
-        margin-bottom: 2rem;
-    }
-    
-    .plot-title {
-        color: #2d5016;
-        font-size: 1.05rem;
-        font-weight: 700;
-        margin: 0 0 1.2rem 0;
-        padding-bottom: 0.6rem;
-        border-bottom: 3px solid #8bc34a;
-    }
-    
-    .plot-caption {
-        color: #555555 !important;
-        font-size: 0.8rem;
-        text-align: center;
-        margin-top: 1rem;
-        line-height: 1.6;
-    }
-    
-    /* Footer */
-    .footer {
-        text-align: center;
-        padding: 2rem 1rem;
-        margin-top: 3rem;
-        color: #666666 !important;
-        font-size: 0.88rem;
-        border-top: 1px solid #e8ede8;
-    }
-    
-    .footer p {
-        color: #666666 !important;
-    }
-    
-    .footer strong {
-        color: #2d5016 !important;
-    }
-    
-    /* Hide Streamlit branding */
-    #MainMenu {visibility: hidden;}
-    footer {visibility: hidden;}
-    .stDeployButton {display: none;}
-    
-    /* Radio buttons - SUPER DARK TEXT */
-    [data-testid="stRadio"] {
-        background: transparent !important;
-        margin-bottom: 0.5rem !important;
-        margin-top: 0 !important;
-    }
-    
-    /* Hide radio label completely */
-    [data-testid="stRadio"] > label:first-child {
-        display: none !important;
-    }
-    
-    [data-testid="stRadio"] > div {
-        gap: 0.8rem !important;
-        background: transparent !important;
-        display: flex !important;
-        flex-direction: row !important;
-        margin-top: 0 !important;
-        padding-top: 0 !important;
-    }
-    
-    /* DESKTOP: Hide camera option (only show file upload) */
-    @media (min-width: 769px) {
-        [data-testid="stRadio"] [role="radiogroup"] > label:nth-child(2) {
-            display: none !important;
-        }
-    }
-    
-    /* MOBILE: Show both options */
-    @media (max-width: 768px) {
-        [data-testid="stRadio"] [role="radiogroup"] > label {
-            display: inline-flex !important;
-        }
-    }
-    
-    [data-testid="stRadio"] > div > label,
-    [data-testid="stRadio"] label,
-    [data-testid="stRadio"] [role="radiogroup"] > label,
-    [data-testid="stRadio"] div[role="radiogroup"] label {
-        color: #0d1f07 !important;  /* VERY DARK GREEN - SUPER VISIBLE */
-        font-weight: 700 !important;
-        font-size: 0.9rem !important;
-        background: #f1f8f4 !important;
-        border: 2px solid #c5e1a5 !important;
-        padding: 0.6rem 1.2rem !important;  /* More compact */
-        cursor: pointer !important;
-        transition: all 0.3s ease !important;
-        border-radius: 10px !important;
-        display: inline-flex !important;
-        align-items: center !important;
-        min-width: 130px !important;  /* Smaller width */
-        justify-content: center !important;
-        box-shadow: 0 2px 4px rgba(0,0,0,0.05) !important;
-    }
-    
-    /* Text inside label - VERY DARK */
-    [data-testid="stRadio"] label span,
-    [data-testid="stRadio"] label div,
-    [data-testid="stRadio"] label p {
-        color: #0d1f07 !important;
-    }
-    
-    [data-testid="stRadio"] > div > label:hover,
-    [data-testid="stRadio"] label:hover {
-        background: #e8f5e9 !important;
-        border-color: #8bc34a !important;
-        color: #0d1f07 !important;
-    }
-    
-    /* Show radio circle */
-    [data-testid="stRadio"] [data-baseweb="radio"] {
-        display: inline-block !important;
-        margin-right: 8px !important;
-        flex-shrink: 0 !important;
-    }
-    
-    /* Selected state - green gradient WITH WHITE TEXT */
-    [data-testid="stRadio"] > div > label:has(input:checked),
-    [data-testid="stRadio"] label:has(input:checked),
-    [data-testid="stRadio"] [role="radiogroup"] > label:has(input:checked) {
-        background: linear-gradient(135deg, #4a7c2e 0%, #6b9d4a 100%) !important;
-        border-color: #4a7c2e !important;
-        color: white !important;
-        font-weight: 700 !important;
-        box-shadow: 0 4px 12px rgba(74, 124, 46, 0.3) !important;
-    }
-    
-    /* WHITE text when selected */
-    [data-testid="stRadio"] label:has(input:checked) span,
-    [data-testid="stRadio"] label:has(input:checked) div,
-    [data-testid="stRadio"] label:has(input:checked) p {
-        color: white !important;
-        font-weight: 700 !important;
-    }
-    
-    [data-testid="stRadio"] [role="radiogroup"] > label:has(input:checked) [data-baseweb="radio"] {
-        background-color: white !important;
-        border-color: white !important;
-    }
-    
-    /* Tabs styling - Green theme */
-    .stTabs [data-baseweb="tab-list"] {
-        gap: 0.5rem;
-        background: transparent;
-    }
-    
-    .stTabs [data-baseweb="tab"] {
-        background: #f1f8f4;
-        border-radius: 8px;
-        padding: 0.6rem 1.2rem;
-        color: #2d5016;
-        font-weight: 600;
-        border: 1px solid #e1e8dd;
-    }
-    
-    .stTabs [data-baseweb="tab"]:hover {
-        background: #e8f5e9;
-        color: #2d5016;
-    }
-    
-    .stTabs [aria-selected="true"] {
-        background: linear-gradient(135deg, #4a7c2e 0%, #6b9d4a 100%) !important;
-        color: white !important;
-        border: none !important;
-    }
-    
-    .stTabs [data-baseweb="tab-panel"] {
-        padding-top: 1rem;
-    }
-    
-    /* RESPONSIVE DESIGN - Mobile & Tablet */
-    
-    /* Tablet (768px and below) */
-    @media (max-width: 768px) {
-        .main-header h1 {
-            font-size: 1.5rem !important;
-        }
-        
-        .main-header p {
-            font-size: 0.85rem !important;
-        }
-        
-        .modern-card, .plot-card {
-            padding: 1.2rem !important;
-        }
-        
-        .card-title, .plot-title {
-            font-size: 0.95rem !important;
-        }
-        
-        .result-card {
-            padding: 1.5rem !important;
-            min-height: 150px !important;
-        }
-        
-        .result-value {
-            font-size: 1.8rem !important;
-        }
-        
-        .xai-header {
-            font-size: 1.2rem !important;
-        }
-        
-        .stProgress {
-            max-width: 300px !important;
-        }
-    }
-    
-    /* Mobile (480px and below) */
-    @media (max-width: 480px) {
-        .main-header {
-            padding: 1.2rem 1rem !important;
-        }
-        
-        .main-header h1 {
-            font-size: 1.3rem !important;
-        }
-        
-        .main-header p {
-            font-size: 0.8rem !important;
-        }
-        
-        .modern-card, .plot-card {
-            padding: 1rem !important;
-            border-radius: 12px !important;
-        }
-        
-        .card-title, .plot-title {
-            font-size: 0.9rem !important;
-            margin-bottom: 1rem !important;
-        }
-        
-        .result-card {
-            padding: 1.2rem !important;
-            min-height: 120px !important;
-        }
-        
-        .result-label {
-            font-size: 0.75rem !important;
-        }
-        
-        .result-value {
-            font-size: 1.5rem !important;
-        }
-        
-        .result-desc {
-            font-size: 0.75rem !important;
-        }
-        
-        .xai-header {
-            font-size: 1.1rem !important;
-            margin: 2rem 0 1.5rem 0 !important;
-        }
-        
-        .info-box {
-            padding: 1rem !important;
-            font-size: 0.85rem !important;
-        }
-        
-        .stProgress {
-            max-width: 250px !important;
-        }
-        
-        .stButton>button {
-            padding: 0.8rem 1.5rem !important;
-            font-size: 0.9rem !important;
-        }
-        
-        /* Stack columns on mobile */
-        [data-testid="column"] {
-            min-width: 100% !important;
-            margin-bottom: 1rem !important;
-        }
-    }
-    
-    /* Very small mobile (360px and below) */
-    @media (max-width: 360px) {
-        .main-header h1 {
-            font-size: 1.1rem !important;
-        }
-        
-        .result-value {
-            font-size: 1.3rem !important;
-        }
-        
-        .stProgress {
-            max-width: 200px !important;
-        }
-    }
-    
-    /* CUSTOM PROGRESS BAR - Beautiful Aesthetic */
-    .stProgress {
-        max-width: 400px !important;
-        margin: 0 auto !important;
-        position: relative !important;
-    }
-    
-    .stProgress > div > div > div > div {
-        background: linear-gradient(90deg, #42a5f5 0%, #66bb6a 50%, #26a69a 100%) !important;
-        height: 4px !important;
-        border-radius: 3px !important;
-        box-shadow: 0 2px 8px rgba(66, 165, 245, 0.4) !important;
-        animation: shimmer 2s infinite !important;
-    }
-    
-    @keyframes shimmer {
-        0% { opacity: 0.8; }
-        50% { opacity: 1; }
-        100% { opacity: 0.8; }
-    }
-    
-    .stProgress > div > div {
-        background: linear-gradient(135deg, #e3f2fd 0%, #e8f5e9 100%) !important;
-        height: 4px !important;
-        border-radius: 3px !important;
-    }
-    
-    /* Browse Files Button - GREEN THEME */
-    [data-testid="stFileUploaderDropzone"] button {
-        background: linear-gradient(135deg, #4a7c2e 0%, #6b9d4a 100%) !important;
-        color: white !important;
-        border: none !important;
-        padding: 0.6rem 1.5rem !important;
-        font-size: 0.9rem !important;
-        font-weight: 600 !important;
-        border-radius: 8px !important;
-        transition: all 0.3s ease !important;
-    }
-    
-    [data-testid="stFileUploaderDropzone"] button:hover {
-        background: linear-gradient(135deg, #3a5f23 0%, #4a7c2e 100%) !important;
-        transform: translateY(-1px) !important;
-        box-shadow: 0 4px 12px rgba(74, 124, 46, 0.3) !important;
-    }
-    
-    [data-testid="stFileUploaderDropzone"] button:active {
-        background: linear-gradient(135deg, #2d5016 0%, #3a5f23 100%) !important;
-        transform: translateY(0) !important;
-    }
-    
-    /* Hide default spinner - use progress bar instead */
-    [data-testid="stSpinner"] {
-        display: none !important;
-    }
-    
-    /* Hide "Running" messages */
-    [data-testid="stStatusWidget"] {
-        display: none !important;
-    }
-    
-    [data-testid="column"] {
-        padding-top: 0 !important;
-    }
-    
-    /* ==================== FLOATING TUTORIAL BUTTON ==================== */
-    
-    /* Floating Tutorial Button - Kanan Bawah (Always Visible) */
-    .tutorial-floating-btn {
-    position: fixed;
-    bottom: 2rem;
-    right: 2rem;
-    z-index: 999;
-    background: linear-gradient(135deg, #4a7c2e 0%, #6b9d4a 100%);
-    color: white !important;  /* WHITE TEXT - NOT BLUE! */
-    padding: 1rem 1.2rem;
-    border-radius: 40px;
-    /* NO shadow - removed completely */
-    text-decoration: none;
-    font-weight: 700;
-    font-size: 1.05rem;
-    display: inline-flex;
-    align-items: center;
-    gap: 0.8rem;
-    transition: all 0.3s ease;
-    cursor: pointer;
-    border: 2px solid #2d5016;
-    }
-    
-    .tutorial-floating-btn:hover {
-    transform: translateY(-2px);
-    /* NO shadow on hover - clean! */
-    background: linear-gradient(135deg, #3a5f23 0%, #4a7c2e 100%);
-    text-decoration: none;
-    color: white !important;
-    }
-
-    .tutorial-floating-btn .icon {
-    font-size: 1.4rem;
-    }
-    
-    /* Text inside button - force WHITE */
-    .tutorial-floating-btn span {
-        color: white !important;
-    }
-    
-    /* RESPONSIVE - Tutorial Button */
-    @media (max-width: 768px) {
-        .tutorial-floating-btn {
-            bottom: 1rem;
-            right: 1rem;
-            padding: 0.6rem 1rem;
-            font-size: 0.85rem;
-        }
-    
-        .tutorial-floating-btn .icon {
-            font-size: 1.2rem;
-        }
-    }
-    
-    @media (max-width: 480px) {
-        .tutorial-floating-btn {
-            padding: 0.55rem 0.9rem;
-            font-size: 0.8rem;
-            bottom: 0.8rem;
-            right: 0.8rem;
-        }
-    
-        .tutorial-floating-btn .icon {
-            font-size: 1.1rem;
-        }
-    }
-</style>
-""", unsafe_allow_html=True)
+# Tema ada di assets/css/app.css, dikirim sebagai <link> ke stylesheet statis (ui_assets)
+st.markdown(stylesheet_html("app"), unsafe_allow_html=True)
 
 # ==================== SESSION STATE ====================
 if 'image' not in st.session_state:
@@ -1014,24 +60,208 @@ if 'validation_error' not in st.session_state:
 
 # ==================== FUNCTIONS ====================
 
+def get_setting(name, default=None):
+    """Baca setting dari .streamlit/secrets.toml, lalu environment variable"""
+    try:
+        value = st.secrets.get(name, None)
+    except Exception:
+        value = None
+    return value if value is not None else os.getenv(name, default)
+
+MODEL_PATH = 'sugarcane_disease_classifier_full.pkl'
+
+# Backend XAI: 'linear' (surrogate cepat, < 1 detik), 'grouped' (SHAP per grup fitur)
+# atau 'kernel' (KernelExplainer exact)
+XAI_BACKEND = get_setting("XAI_BACKEND", DEFAULT_BACKEND)
+
+# Ringkasan background SHAP: k titik ('kmeans' / 'medoids'), 0 = pakai semua baris
+XAI_BACKGROUND_K = int(get_setting("XAI_BACKGROUND_K", 10))
+XAI_BACKGROUND_METHOD = get_setting("XAI_BACKGROUND_METHOD", "kmeans")
+
+# Engine prediksi: 'numpy' (SVMEngine, cepat), 'sklearn' (SVC.predict_proba), atau
+# 'compressed' (SVM aproksimasi hasil compress_model.py, SHAP ikut memakainya)
+SVM_ENGINE = get_setting("SVM_ENGINE", "numpy")
+COMPRESSED_MODEL_PATH = get_setting("COMPRESSED_MODEL_PATH", str(compressed_model_path(MODEL_PATH)))
+# Kesepakatan prediksi minimum (laporan compress_model.py) agar model terkompresi dipakai
+COMPRESSED_MIN_AGREEMENT = float(get_setting("COMPRESSED_MIN_AGREEMENT", 0.98))
+# Tipe data kernel SVM di jalur prediksi (engine numpy): 'float64' atau 'float32'
+INFERENCE_DTYPE = get_setting("INFERENCE_DTYPE", "float64")
+
+# Cache hasil di disk (fitur, probabilitas, SHAP) per isi gambar, 0 MB = nonaktif
+RESULT_CACHE_DIR = get_setting("RESULT_CACHE_DIR", ".cache/results")
+RESULT_CACHE_MAX_MB = float(get_setting("RESULT_CACHE_MAX_MB", 256))
+
+# Nama array SHAP di cache, unik per konfigurasi explainer
+SHAP_CACHE_NAME = f"shap-{XAI_BACKEND}-{XAI_BACKGROUND_METHOD}-k{XAI_BACKGROUND_K}"
+if SVM_ENGINE == 'compressed':
+    SHAP_CACHE_NAME += '-compressed'
+
+# Cache SHAP di memori (dibagi semua sesi): batas entry, ukuran, dan umur
+SHAP_CACHE_MAX_ENTRIES = int(get_setting("SHAP_CACHE_MAX_ENTRIES", 128))
+SHAP_CACHE_MAX_MB = float(get_setting("SHAP_CACHE_MAX_MB", 64))
+SHAP_CACHE_TTL = float(get_setting("SHAP_CACHE_TTL", 3600))
+
+# Gambar plot XAI yang sudah dirender (PNG atau SVG) di-cache di memori per
+# (penjelasan SHAP, kelas, jenis plot), dibagi semua sesi; umur = SHAP_CACHE_TTL
+PLOT_FORMAT = get_setting("PLOT_FORMAT", "png")
+PLOT_DPI = 200  # sama dengan default st.pyplot
+# Lebar maksimum gambar (px) yang dikirim Streamlit apa adanya; gambar lebih
+# lebar di-resize dan di-encode ulang oleh st.image di setiap rerun
+PLOT_MAX_WIDTH = 1460
+PLOT_CACHE_MAX_ENTRIES = int(get_setting("PLOT_CACHE_MAX_ENTRIES", 384))
+PLOT_CACHE_MAX_MB = float(get_setting("PLOT_CACHE_MAX_MB", 64))
+
+# Cache rekomendasi LLM per (penyakit, model, versi prompt, tanggal), TTL dalam detik
+RECOMMENDATION_CACHE_DIR = get_setting("RECOMMENDATION_CACHE_DIR", ".cache/recommendations")
+RECOMMENDATION_CACHE_TTL = float(get_setting("RECOMMENDATION_CACHE_TTL", 24 * 3600))
+
+# Batas waktu (detik) request rekomendasi; circuit breaker terbuka setelah N kali
+# berturut-turut gagal (quota/jaringan) dan rule-based dipakai selama cooldown
+RECOMMENDATION_TIMEOUT = float(get_setting("RECOMMENDATION_TIMEOUT", 10))
+RECOMMENDATION_BREAKER_FAILURES = int(get_setting("RECOMMENDATION_BREAKER_FAILURES", 3))
+RECOMMENDATION_BREAKER_COOLDOWN = float(get_setting("RECOMMENDATION_BREAKER_COOLDOWN", 300))
+
+# Worker pool SHAP (dibagi semua sesi) dan interval polling UI dalam detik
+SHAP_WORKERS = int(get_setting("SHAP_WORKERS", 2))
+SHAP_POLL_INTERVAL = 0.5
+
+@st.cache_resource
+def load_compressed_engine(source_digest):
+    """SVMEngine terkompresi dari COMPRESSED_MODEL_PATH, None bila tidak bisa dipakai"""
+    try:
+        compressed = load_compressed_model(COMPRESSED_MODEL_PATH)
+    except (OSError, EOFError) as e:
+        print(f"⚠️  Model terkompresi tidak bisa dibaca ({e}), pakai engine numpy")
+        return None
+    if compressed.get('source_digest') != source_digest:
+        print(f"⚠️  {COMPRESSED_MODEL_PATH} dibuat dari model lain, pakai engine numpy")
+        return None
+    
+    report = compressed['report']
+    if report.get('label_rule') != AGREEMENT_LABEL_RULE:
+        print(f"⚠️  Laporan kesepakatan {COMPRESSED_MODEL_PATH} memakai aturan label lama, "
+              f"buat ulang dengan compress_model.py; pakai engine numpy")
+        return None
+    summary = (f"{compressed['method']}, {len(compressed['engine'].support_vectors)} SV: "
+               f"kesepakatan {report['agreement']:.1%}, "
+               f"|Δproba| maks {report['proba_max_abs_diff']:.4f}")
+    if report['agreement'] < COMPRESSED_MIN_AGREEMENT:
+        print(f"⚠️  Model terkompresi ({summary}) di bawah COMPRESSED_MIN_AGREEMENT "
+              f"{COMPRESSED_MIN_AGREEMENT:.1%}, pakai engine numpy")
+        return None
+    print(f"🗜️  Model terkompresi ({summary})")
+    return compressed['engine']
+
+def select_inference_engine(model_package):
+    """
+    Pasang classifier (ruang fitur ter-scale, untuk SHAP) dan pipeline (fitur
+    mentah, scaler dilipat ke SVM) untuk prediksi sesuai SVM_ENGINE
+
+    Returns:
+        str: versi model untuk key cache hasil
+    """
+    model, scaler = model_package['model'], model_package['scaler']
+    model_version = file_digest(MODEL_PATH)
+    model_package['classifier'] = model
+    model_package['pipeline'] = None
+    if SVM_ENGINE == 'sklearn':
+        return model_version
+    
+    if SVM_ENGINE == 'compressed':
+        engine = load_compressed_engine(model_version)
+        if engine is not None:
+            model_package['classifier'] = engine
+            model_package['pipeline'] = FusedSVMPipeline.from_engine(engine, scaler,
+                                                                     dtype=INFERENCE_DTYPE)
+            return f"{model_version}-compressed-{file_digest(COMPRESSED_MODEL_PATH)}"
+    
+    # Engine numpy harus sama persis dengan sklearn, dicek dulu
+    check_rows = np.asarray(model_package['X_background'][:20])
+    
+    engine = SVMEngine.from_sklearn(model)
+    check = verify_against_sklearn(engine, model, check_rows)
+    if check['predict_agreement'] == 1.0 and check['proba_max_abs_diff'] < 1e-9:
+        model_package['classifier'] = engine
+    else:
+        print(f"⚠️  SVMEngine berbeda dari sklearn, pakai sklearn: {check}")
+    
+    # Dari artifact mmap bila ada (sv / scale tidak dibangun ulang di heap)
+    pipeline = fused_pipeline(model_package, INFERENCE_DTYPE)
+    check = verify_against_sklearn(pipeline, model, scaler.inverse_transform(check_rows),
+                                   scaler=scaler)
+    tolerance = 1e-4 if pipeline.dtype == np.float32 else 1e-9
+    if check['predict_agreement'] == 1.0 and check['proba_max_abs_diff'] < tolerance:
+        model_package['pipeline'] = pipeline
+    else:
+        print(f"⚠️  FusedSVMPipeline berbeda dari sklearn, pakai sklearn: {check}")
+    return model_version
+
+def inference_engine_tag(model_package):
+    """
+    Engine yang benar-benar dipakai untuk prediksi, untuk versi cache hasil
+    
+    Termasuk dtype pipeline (float32 bisa beda ~1e-5 dan membalik label yang
+    hampir seri) dan fallback ke sklearn bila verifikasi engine gagal.
+    """
+    pipeline = model_package['pipeline']
+    if pipeline is not None:
+        return f"fused-{pipeline.dtype.name}"
+    classifier = model_package['classifier']
+    return 'sklearn' if classifier is model_package['model'] else type(classifier).__name__
+
 @st.cache_resource
 def load_model():
-    """Load model"""
+    """Load model (hanya jalur klasifikasi; explainer dibuat saat pertama dibutuhkan)"""
     try:
-        model_package = joblib.load('sugarcane_disease_classifier_full.pkl')
+        # Pakai artifact mmap (model_store.py) bila ada: array dibagi antar proses
+        model_package = load_model_package(MODEL_PATH)
         
-        def model_predict(X):
-            return model_package['model'].predict_proba(X)
+        model_version = select_inference_engine(model_package)
         
-        explainer = shap.KernelExplainer(model_predict, model_package['X_background'])
-        model_package['explainer'] = explainer
+        model_package['explainer'] = None
+        model_package['explainer_lock'] = threading.Lock()
         model_package['feature_names'] = create_readable_feature_names()
+        model_package['feature_extractor'] = get_feature_extractor()
+        
+        # Cache hasil dipakai bersama oleh semua sesi; versi model + engine ikut di key
+        model_package['result_cache'] = None
+        if RESULT_CACHE_MAX_MB > 0:
+            model_package['result_cache'] = DiskResultCache(
+                RESULT_CACHE_DIR, RESULT_CACHE_MAX_MB * 1024 * 1024,
+                f"{model_version}-{inference_engine_tag(model_package)}-i{INFERENCE_VERSION}")
+        model_package['explanation_cache'] = ExplanationCache(
+            SHAP_CACHE_MAX_ENTRIES, SHAP_CACHE_MAX_MB * 1024 * 1024, SHAP_CACHE_TTL)
+        model_package['plot_cache'] = ExplanationCache(
+            PLOT_CACHE_MAX_ENTRIES, PLOT_CACHE_MAX_MB * 1024 * 1024, SHAP_CACHE_TTL)
         
         return model_package
     except Exception as e:
         st.error(f"Error loading model: {str(e)}")
         st.stop()
 
+def get_explainer(model_package):
+    """
+    Explainer XAI, dibuat sekali saat pertama dibutuhkan (bisa dari worker pool)
+    Ringkasan background dan import shap ikut ditunda sampai sini.
+    """
+    with model_package['explainer_lock']:
+        if model_package['explainer'] is None:
+            def model_predict(X):
+                return model_package['classifier'].predict_proba(X)
+            
+            # Background diringkas sekali lalu di-cache di sebelah file model
+            background, background_weights = load_background_summary(
+                MODEL_PATH, model_package['X_background'],
+                XAI_BACKGROUND_K, XAI_BACKGROUND_METHOD)
+            
+            explainer = create_explainer(XAI_BACKEND, model_predict,
+                                         background, len(model_package['classes']),
+                                         background_weights=background_weights)
+            # Label plot XAI: nama grup (backend 'grouped') atau nama fitur
+            model_package['explanation_names'] = explainer.group_names or model_package['feature_names']
+            model_package['explainer'] = explainer
+    return model_package['explainer']
+
 def validate_sugarcane_leaf(img_array):
     """
     Validasi apakah gambar adalah daun tebu atau bukan
@@ -1044,97 +274,136 @@ def validate_sugarcane_leaf(img_array):
     return True, "✅ Pre-check disabled"
 
 def predict_image(image, model_package):
-    """Prediksi gambar dengan validasi"""
+    """Prediksi gambar (NormalizedImage dari upload/kamera) dengan validasi"""
     try:
-        img_array = np.array(image)
+        # Buffer upload diperkecil ke dekat 256x256, sudah BGR
+        img_bgr = image.feature_input()
         
         # ===== VALIDASI 1: Pre-check visual =====
-        is_valid, validation_reason = validate_sugarcane_leaf(img_array)
+        is_valid, validation_reason = validate_sugarcane_leaf(img_bgr)
         
         if not is_valid:
             return "INVALID_IMAGE", 0, None, None, validation_reason
         
-        # ===== LANJUT KE PREDIKSI =====
-        img_bgr = cv2.cvtColor(img_array, cv2.COLOR_RGB2BGR)
+        # ===== CEK CACHE HASIL (foto yang sama pernah dianalisis) =====
+        result_cache = model_package['result_cache']
+        image_key = result_cache.key(img_bgr) if result_cache else None
+        cached = result_cache.get(image_key) if result_cache else None
         
-        features = extract_features(img_bgr)
-        features = features.reshape(1, -1)
-        features_scaled = model_package['scaler'].transform(features)
+        # Pipeline fused (scaler + SVM) bila aktif, selain itu scaler + classifier
+        pipeline = model_package['pipeline']
+        scaler = pipeline or model_package['scaler']
         
-        prediction = model_package['model'].predict(features_scaled)[0]
-        probabilities = model_package['model'].predict_proba(features_scaled)[0]
+        if cached is not None and 'features' in cached:
+            features = cached['features'].reshape(1, -1)
+            features_scaled = scaler.transform(features)
+            inference = InferenceResult.from_arrays(cached, image_key)
+        else:
+            # ===== LANJUT KE PREDIKSI =====
+            features = model_package['feature_extractor'].extract(img_bgr)
+            features = features.reshape(1, -1)
+            features_scaled = scaler.transform(features)  # untuk SHAP
+            
+            # Satu kali inferensi: kelas, probabilitas, decision values
+            if pipeline is not None:
+                inference = run_inference(pipeline, features)
+            else:
+                inference = run_inference(model_package['classifier'], features_scaled)
+            
+            if result_cache:
+                inference = dataclasses.replace(inference, image_key=image_key)
+                result_cache.put(image_key, {'features': features[0], **inference.to_arrays()})
         
         # ===== VALIDASI 2: Confidence threshold =====
-        max_confidence = np.max(probabilities) * 100
+        max_confidence = inference.max_confidence
         
         # ✅ CHECK 1: Reject jika < 50%
         if max_confidence < 50:
-            return "LOW_CONFIDENCE", max_confidence, features_scaled, prediction, \
+            return "LOW_CONFIDENCE", max_confidence, features_scaled, inference, \
                 f"🚫 Confidence terlalu rendah ({max_confidence:.1f}%). Gambar mungkin bukan daun tebu atau foto tidak jelas. Upload foto daun tebu yang lebih tajam dan fokus."
 
         # ✅ CHECK 2: Reject jika >= 99.5% (terlalu sempurna)
         if max_confidence > 99.9:
-            return "LOW_CONFIDENCE", max_confidence, features_scaled, prediction, \
+            return "LOW_CONFIDENCE", max_confidence, features_scaled, inference, \
                 f"🚫 Gambar terlalu sempurna ({max_confidence:.1f}%). Kemungkinan bukan foto daun tebu asli. Upload foto daun tebu yang jelas."
         
 
-        disease_name = model_package['classes'][prediction]
-        confidence = probabilities[prediction] * 100
+        disease_name = model_package['classes'][inference.prediction]
         
-        return disease_name, confidence, features_scaled, prediction, None
+        return disease_name, inference.confidence, features_scaled, inference, None
         
     except Exception as e:
         st.error(f"Error: {str(e)}")
         return None, None, None, None, str(e)
-
-@st.cache_data
-def compute_shap_cached(_model_package, features_key):
-    """Compute SHAP"""
-    try:
-        features_scaled = np.frombuffer(bytes.fromhex(features_key)).reshape(1, -1)
-        shap_values = _model_package['explainer'].shap_values(features_scaled, nsamples=50)
-        
-        if isinstance(shap_values, list):
-            shap_values = np.stack(shap_values, axis=0)
-        
-        if shap_values.ndim == 3:
-            n_classes = len(_model_package['classes'])
-            if shap_values.shape[2] == n_classes:
-                shap_values = np.transpose(shap_values, (2, 0, 1))
-            elif shap_values.shape[1] == n_classes:
-                shap_values = np.transpose(shap_values, (1, 0, 2))
-        elif shap_values.ndim == 2:
-            shap_values = shap_values[np.newaxis, :, :]
-        
+
+@st.cache_resource
+def get_explanation_pool():
+    """Worker pool SHAP, satu per proses server"""
+    return ExplanationWorkerPool(SHAP_WORKERS)
+
+def compute_shap_cached(model_package, features_scaled, image_key=None, progress=None):
+    """
+    Compute SHAP (bentuk output: n_classes x 1 x n_features)
+    Urutan cek: cache memori -> cache disk (per gambar) -> hitung ulang
+    Dijalankan di worker pool, jadi error dilempar (bukan st.error)
+    """
+    explanation_cache = model_package['explanation_cache']
+    result_cache = model_package['result_cache']
+    key = explanation_key(features_scaled, SHAP_CACHE_NAME)
+    
+    shap_values = explanation_cache.get(key)
+    if shap_values is not None:
         return shap_values
-    except Exception as e:
-        st.error(f"Error SHAP: {str(e)}")
-        return None
+    
+    cached = result_cache.get(image_key) if result_cache and image_key else None
+    if cached is not None and SHAP_CACHE_NAME in cached:
+        shap_values = cached[SHAP_CACHE_NAME]
+    else:
+        shap_values = get_explainer(model_package).shap_values(features_scaled, progress=progress)
+        if result_cache and image_key:
+            result_cache.put(image_key, {SHAP_CACHE_NAME: shap_values})
+    
+    explanation_cache.put(key, shap_values)
+    print(f"📊 SHAP cache: {explanation_cache.stats()}")
+    return shap_values
+
+def submit_shap_job(model_package, features_scaled, image_key=None):
+    """Mulai perhitungan SHAP di background, kembalikan ExplanationJob"""
+    key = explanation_key(features_scaled, SHAP_CACHE_NAME)
+    return get_explanation_pool().submit(key, compute_shap_cached,
+                                         model_package, features_scaled, image_key)
 
 
 def create_feature_importance_plot(shap_values, model_package):
     """Feature Importance - SIMPLE matplotlib bars"""
+    # Figure dibuat langsung tanpa pyplot (state global pyplot tidak thread-safe,
+    # sedangkan script Streamlit tiap sesi jalan di thread sendiri).
+    # Di-import saat plot pertama, bukan saat startup.
+    from matplotlib import colormaps
+    from matplotlib.figure import Figure
+    
     try:
         # Calculate mean absolute SHAP values
         mean_abs_shap = np.mean(np.abs(shap_values), axis=(0, 1))
         
         # Get top 12 features
-        n_features = min(12, len(mean_abs_shap), len(model_package['feature_names']))
+        n_features = min(12, len(mean_abs_shap), len(model_package['explanation_names']))
         top_indices = np.argsort(mean_abs_shap)[-n_features:][::-1]
         top_values = mean_abs_shap[top_indices]
         
-        valid_indices = [i for i in top_indices if i < len(model_package['feature_names'])]
-        top_names = [model_package['feature_names'][i][:30] for i in valid_indices]
+        valid_indices = [i for i in top_indices if i < len(model_package['explanation_names'])]
+        top_names = [model_package['explanation_names'][i][:30] for i in valid_indices]
         top_values = top_values[:len(valid_indices)]
         
         if len(top_values) == 0:
             return None
         
         # Create plot
-        fig, ax = plt.subplots(figsize=(8, 6))
+        fig = Figure(figsize=(8, 6))
+        ax = fig.subplots()
         
         # Green gradient
-        colors = plt.cm.Greens(np.linspace(0.4, 0.9, len(top_values)))
+        colors = colormaps['Greens'](np.linspace(0.4, 0.9, len(top_values)))
         ax.barh(range(len(top_values)), top_values, color=colors, 
                 edgecolor='#2d5016', linewidth=1.5, alpha=0.95)
         
@@ -1146,7 +415,7 @@ def create_feature_importance_plot(shap_values, model_package):
         ax.set_facecolor('#fafbfa')
         
         fig.patch.set_facecolor('white')
-        plt.tight_layout()
+        fig.tight_layout()
         return fig
     except Exception as e:
         print(f"❌ Feature Importance Error: {e}")
@@ -1157,6 +426,8 @@ def create_feature_importance_plot(shap_values, model_package):
 
 def create_force_plot(shap_values, features_scaled, prediction, model_package):
     """Force Plot - MIRIP Jupyter style (single horizontal stacked bar)"""
+    from matplotlib.figure import Figure
+    
     try:
         shap_vals = shap_values[prediction, 0, :]
         
@@ -1168,15 +439,15 @@ def create_force_plot(shap_values, features_scaled, prediction, model_package):
             base_value = expected_value
         
         # Get top 10 features by absolute SHAP value
-        n_features = min(10, len(shap_vals), len(model_package['feature_names']))
+        n_features = min(10, len(shap_vals), len(model_package['explanation_names']))
         idx = np.argsort(np.abs(shap_vals))[::-1][:n_features]
         
-        valid_indices = [i for i in idx if i < len(model_package['feature_names'])]
+        valid_indices = [i for i in idx if i < len(model_package['explanation_names'])]
         if len(valid_indices) == 0:
             return None
         
         top_shap = shap_vals[valid_indices]
-        top_names = [model_package['feature_names'][i] for i in valid_indices]
+        top_names = [model_package['explanation_names'][i] for i in valid_indices]
         top_values = features_scaled[0, valid_indices]
         
         # Sort positive first (descending), then negative (ascending)
@@ -1195,7 +466,8 @@ def create_force_plot(shap_values, features_scaled, prediction, model_package):
         sorted_values = [top_values[i] for i in sorted_idx]
         
         # Create figure - single horizontal bar
-        fig, ax = plt.subplots(figsize=(12, 2))
+        fig = Figure(figsize=(12, 2))
+        ax = fig.subplots()
         
         # Stack bars horizontally
         cumsum = base_value
@@ -1253,7 +525,7 @@ def create_force_plot(shap_values, features_scaled, prediction, model_package):
         ax.set_facecolor('white')
         
         fig.patch.set_facecolor('white')
-        plt.tight_layout()
+        fig.tight_layout()
         return fig
     except Exception as e:
         print(f"❌ Force Plot Error: {e}")
@@ -1264,6 +536,8 @@ def create_force_plot(shap_values, features_scaled, prediction, model_package):
 
 def create_waterfall_plot(shap_values, features_scaled, prediction, model_package):
     """Waterfall - EXACT Jupyter style"""
+    from matplotlib.figure import Figure
+    
     try:
         shap_vals = shap_values[prediction, 0, :]
         
@@ -1275,15 +549,15 @@ def create_waterfall_plot(shap_values, features_scaled, prediction, model_packag
             base_value = expected_value
         
         # Get top 15 features
-        n_features = min(15, len(shap_vals), len(model_package['feature_names']))
+        n_features = min(15, len(shap_vals), len(model_package['explanation_names']))
         idx_sorted = np.argsort(np.abs(shap_vals))[::-1][:n_features]
         
-        valid_indices = [i for i in idx_sorted if i < len(model_package['feature_names'])]
+        valid_indices = [i for i in idx_sorted if i < len(model_package['explanation_names'])]
         if len(valid_indices) == 0:
             return None
         
         top_shap = shap_vals[valid_indices]
-        top_names = [model_package['feature_names'][i] for i in valid_indices]
+        top_names = [model_package['explanation_names'][i] for i in valid_indices]
         top_values = features_scaled[0, valid_indices]
         
         # Sort by SHAP value (highest to lowest)
@@ -1293,7 +567,8 @@ def create_waterfall_plot(shap_values, features_scaled, prediction, model_packag
         sorted_values = [top_values[i] for i in sort_idx]
         
         # Create figure
-        fig, ax = plt.subplots(figsize=(8, 7.5))
+        fig = Figure(figsize=(8, 7.5))
+        ax = fig.subplots()
         
         # Y positions
         y_pos = np.arange(len(sorted_shap))
@@ -1354,7 +629,7 @@ def create_waterfall_plot(shap_values, features_scaled, prediction, model_packag
         ax.invert_yaxis()
         
         fig.patch.set_facecolor('white')
-        plt.tight_layout(rect=[0, 0, 1, 0.97])
+        fig.tight_layout(rect=[0, 0, 1, 0.97])
         return fig
     except Exception as e:
         print(f"❌ Waterfall Error: {e}")
@@ -1363,116 +638,340 @@ def create_waterfall_plot(shap_values, features_scaled, prediction, model_packag
         return None
 
 
-def get_rule_based_recommendation(disease_name):
+def render_figure(fig, fmt=None):
     """
-    Rule-based recommendation system (fallback when Gemini unavailable)
-    Berdasarkan pengetahuan domain penyakit tebu
+    Render figure matplotlib ke bytes (PNG/SVG)
+    
+    Figure dibuat tanpa pyplot, jadi tidak terdaftar di state global dan
+    tidak perlu plt.close: dibebaskan GC seperti objek biasa.
+    """
+    from PIL import Image
+    
+    fmt = fmt or PLOT_FORMAT
+    dpi = min(PLOT_DPI, PLOT_MAX_WIDTH / fig.get_figwidth())
+    # bbox_inches='tight' mengubah lebar akhir, jadi dpi dikoreksi bila masih kelebaran
+    for _ in range(3):
+        buffer = io.BytesIO()
+        fig.savefig(buffer, format=fmt, dpi=dpi, bbox_inches='tight')
+        if fmt == 'svg':
+            break
+        width = Image.open(buffer).width
+        if width <= PLOT_MAX_WIDTH:
+            break
+        dpi *= 0.99 * PLOT_MAX_WIDTH / width
+    return buffer.getvalue()
+
+def get_plot_image(model_package, key, create_plot):
     """
+    Bytes plot dari cache, atau dibuat dan dirender sekali lalu disimpan
     
-    recommendations = {
-        "Healthy": """<h3>🌿 Daun Sehat - Tips Perawatan Lanjutan</h3>
-            
-            <h4>1. Menjaga Kesehatan Daun Tebu</h4>
-            <p><strong>Langkah-langkah perawatan rutin:</strong></p>
-            <ul>
-                <li>Lakukan inspeksi visual setiap 1-2 minggu untuk deteksi dini penyakit</li>
-                <li>Jaga kebersihan lahan dari gulma dan sisa tanaman</li>
-                <li>Pastikan drainase lahan baik agar tidak tergenang air</li>
-                <li>Berikan nutrisi seimbang sesuai fase pertumbuhan</li>
-            </ul>
-            
-            <h4>2. Pencegahan Serangan Penyakit</h4>
-            <p><strong>Tips pencegahan umum:</strong></p>
-            <ul>
-                <li>Gunakan varietas tebu yang tahan penyakit sesuai wilayah</li>
-                <li>Terapkan rotasi tanaman untuk memutus siklus penyakit</li>
-                <li>Hindari luka pada batang saat pemeliharaan</li>
-                <li>Jaga jarak tanam yang cukup untuk sirkulasi udara</li>
-            </ul>
-            
-            <h4>3. Monitoring Berkala</h4>
-            <p><strong>Yang perlu diperhatikan:</strong></p>
-            <ul>
-                <li>Perhatikan perubahan warna daun (menguning, kecoklatan, belang)</li>
-                <li>Cek tekstur daun (bintik-bintik, karat, bercak)</li>
-                <li>Amati pertumbuhan tanaman secara keseluruhan</li>
-                <li>Catat kondisi cuaca dan kelembaban</li>
-            </ul>""",
-        
-        "Red Rot": """<h3>Red Rot - Rekomendasi Penanganan</h3>
-            
-            <h4>1. Penanganan agar penyakit tidak meluas</h4>
-            <p><strong>Tindakan segera yang perlu dilakukan:</strong></p>
-            <p>Red rot pada tebu yang disebabkan oleh Colletotrichum falcatum merupakan penyakit utama yang dapat menurunkan produktivitas secara signifikan. Berdasarkan Hossain dkk. (2020), upaya untuk mencegah agar penyakit tidak meluas dilakukan melalui penerapan Integrated Disease Management (IDM). Pendekatan ini mencakup penggunaan bahan tanam (setts) bebas patogen, penanaman varietas tebu yang memiliki ketahanan terhadap red rot, serta penerapan sanitasi lahan dan kebun secara ketat. Selain itu, praktik agronomis seperti rotasi tanaman dan pengelolaan drainase yang baik direkomendasikan untuk menekan keberadaan dan perkembangan inokulum jamur di lapangan, sehingga potensi penyebaran penyakit dapat diminimalkan.</p>
+    Args:
+        key: (digest penjelasan SHAP, kelas, jenis plot)
+        create_plot: fungsi tanpa argumen -> figure (None jika gagal)
+    
+    Returns:
+        bytes PNG/SVG, atau None jika plot gagal dibuat
+    """
+    plot_cache = model_package['plot_cache']
+    image = plot_cache.get(key)
+    if image is not None:
+        return image.tobytes()
+    
+    # Explainer (nama fitur, expected value) baru dibutuhkan saat plot belum di cache
+    get_explainer(model_package)
+    fig = create_plot()
+    if fig is None:
+        return None
+    image = render_figure(fig)
+    plot_cache.put(key, np.frombuffer(image, dtype=np.uint8))
+    return image
 
-            
-            <h4>2. Penanganan jika penyakit sudah meluas</h4>
-            <p><strong>Strategi pengelolaan lahan:</strong></p>
-            <p>Apabila penyakit red rot telah muncul dan menyebar di pertanaman, Hossain dkk. (2020) menegaskan bahwa pengendalian dengan satu metode saja, khususnya secara kimia, tidak memberikan hasil yang efektif. Oleh karena itu, pengelolaan penyakit tetap harus dilakukan secara terpadu, dengan mengombinasikan beberapa strategi seperti penggunaan varietas tahan, perlakuan bahan tanam, serta metode fisik pendukung. Salah satu teknik yang dilaporkan dapat membantu menekan infeksi patogen pada bahan tanam adalah heat therapy, yang digunakan sebagai bagian dari sistem manajemen terpadu untuk mengurangi tingkat infeksi ketika populasi patogen di lapangan sudah relatif tinggi </p>
-            
-            <h4>3. Pencegahan pada tanaman tebu lainnya</h4>
-            <p><strong>Langkah pencegahan:</strong></p>
-            <p>Untuk mencegah terjadinya serangan red rot pada area tanam lain atau pada musim tanam berikutnya, Hossain dkk. (2020) menekankan pentingnya keberlanjutan praktik pencegahan. Langkah-langkah yang direkomendasikan meliputi penggunaan material tanam yang bebas patogen, pemilihan varietas yang toleran atau tahan terhadap red rot, serta penerapan sanitasi kebun dan rotasi tanaman secara konsisten. Penerapan manajemen lahan yang baik bertujuan untuk mencegah akumulasi inokulum jamur di tanah, sehingga risiko serangan red rot pada pertanaman berikutnya dapat ditekan</p>""",
+def show_plot_image(image):
+    """
+    Tampilkan bytes plot; gambar yang sama memakai URL media yang sama
+    (st.image use_container_width butuh Streamlit >= 1.40)
+    """
+    if PLOT_FORMAT == 'svg':
+        st.image(image.decode(), use_container_width=True)
+    else:
+        st.image(image, use_container_width=True)
+
+
+def render_xai_section(model_package):
+    """
+    Isi bagian XAI: progress bar selama job SHAP berjalan, plot setelah selesai
+    Dijalankan sebagai fragment yang di-rerun berkala selama job belum selesai.
+    """
+    job = st.session_state.shap_job
+    
+    if not job.done():
+        st.session_state.shap_polling = True
+        col_empty1, col_shap_progress, col_empty2 = st.columns([1, 2, 1])
+        with col_shap_progress:
+            st.markdown(ui_templates.SHAP_LOADING_HTML, unsafe_allow_html=True)
+            st.progress(job.progress)
+        return
+    
+    if st.session_state.get('shap_polling'):
+        # Job selesai saat polling: rerun penuh sekali supaya polling berhenti
+        st.session_state.shap_polling = False
+        st.rerun()
+    
+    try:
+        shap_values = job.result()
+    except Exception as e:
+        st.error(f"Error SHAP: {str(e)}")
+        return
+    
+    render_xai_plots(shap_values, model_package)
+
+
+def render_xai_plots(shap_values, model_package):
+    """Tiga kolom plot XAI: Feature Importance, Force, Waterfall"""
+    features_scaled = st.session_state.features_scaled
+    prediction = st.session_state.prediction
+    # Plot cukup dirender sekali per penjelasan SHAP (fitur + konfigurasi explainer) dan kelas
+    explanation_digest = explanation_key(features_scaled, SHAP_CACHE_NAME)
+    
+    def explanation_values():
+        # Nilai yang ditampilkan di plot (per fitur, atau rata-rata per grup)
+        return get_explainer(model_package).feature_values(features_scaled)
+    
+    col1, col2, col3 = st.columns(3, gap="medium")
+    
+    with col1:
+        st.markdown('<div class="plot-card">', unsafe_allow_html=True)
+        st.markdown('<div class="plot-title">Feature Importance</div>', unsafe_allow_html=True)
+        
+        image = get_plot_image(
+            model_package, (explanation_digest, prediction, 'importance'),
+            lambda: create_feature_importance_plot(shap_values, model_package))
+        if image:
+            show_plot_image(image)
+        else:
+            st.error("❌ Error: Plot gagal dimuat. Check console untuk details.")
+        
+        st.markdown('<div class="plot-caption">Fitur paling berpengaruh pada prediksi</div>', unsafe_allow_html=True)
+        
+        # CARA BACA GRAFIK
+        pred_class = model_package['classes'][prediction]
+        
+        if pred_class == "Healthy":
+            explanation = "<strong>Cara baca grafik kiri:</strong><br>✅ Bar paling panjang = fitur paling penting<br>✅ Lihat: HSV Saturation, Hue (warna hijau) ada di atas → artinya warna hijau segar yang bikin model yakin ini SEHAT<br>✅ Tidak ada fitur merah/coklat/kasar → makanya bukan penyakit!"
+        elif pred_class == "Red Rot":
+            explanation = "<strong>Cara baca grafik kiri:</strong><br>✅ Bar paling panjang = fitur paling penting<br>✅ Lihat: Red channel, HOG (tekstur kasar) ada di atas → artinya warna merah & tekstur kasar yang bikin model yakin ini RED ROT<br>✅ Cocok dengan Red Rot yang daunya merah kecoklatan & kasar!"
+        elif pred_class == "Mosaic":
+            explanation = "<strong>Cara baca grafik kiri:</strong><br>✅ Bar paling panjang = fitur paling penting<br>✅ Lihat: Kontras, variance, edge ada di atas → artinya pola belang-belang tidak teratur yang bikin model yakin ini MOSAIC<br>✅ Cocok dengan Mosaic yang daunnya belang-belang!"
+        elif pred_class == "Yellow":
+            explanation = "<strong>Cara baca grafik kiri:</strong><br>✅ Bar paling panjang = fitur paling penting<br>✅ Lihat: Yellow channel, brightness ada di atas → artinya warna kuning terang yang bikin model yakin ini YELLOW<br>✅ Cocok dengan Yellow yang daunnya menguning!"
+        elif pred_class == "Rust":
+            explanation = "<strong>Cara baca grafik kiri:</strong><br>✅ Bar paling panjang = fitur paling penting<br>✅ Lihat: HOG (tekstur kasar), warna coklat/orange ada di atas → artinya tekstur kasar & warna karat yang bikin model yakin ini RUST<br>✅ Cocok dengan Rust yang daunnya kasar & berkarat!"
+        else:
+            explanation = "Lihat bar paling panjang - itu fitur yang paling menentukan hasil deteksi."
         
-        "Mosaic": """<h3>Mosaic - Rekomendasi Penanganan</h3>
-            
-            <h4>1. Penanganan agar penyakit tidak meluas</h4>
-            <p><strong>Tindakan pencegahan penyebaran:</strong></p>
-            <p>Penyakit mosaic pada tebu disebabkan oleh beberapa virus utama, yaitu Sugarcane mosaic virus (SCMV), Sorghum mosaic virus (SrMV), dan Sugarcane streak mosaic virus (SCSMV), yang dapat menurunkan aktivitas fotosintesis dan pertumbuhan tanaman. Lu dkk. (2021) menjelaskan bahwa upaya pencegahan agar penyakit tidak meluas terutama difokuskan pada penggunaan material tanam bebas virus serta pemanfaatan varietas yang memiliki tingkat ketahanan lebih baik. Hal ini penting karena sistem perbanyakan tebu secara vegetatif memungkinkan virus terakumulasi dan menyebar apabila bahan tanam yang terinfeksi terus digunakan</p>
-            
-            <h4>2. Penanganan jika penyakit sudah meluas</h4>
-            <p><strong>Strategi pengelolaan:</strong></p>
-            <p>Apabila penyakit mosaic telah muncul dan menyebar di pertanaman, Lu dkk. (2021) merekomendasikan pendekatan pengelolaan yang berfokus pada identifikasi virus secara akurat menggunakan metode molekuler, seperti teknik berbasis PCR, untuk memastikan jenis virus penyebab infeksi. Selain itu, pengendalian penyebaran dilakukan melalui pengelolaan vektor serangga serta penghapusan tanaman yang terinfeksi (roguing) guna mengurangi sumber inokulum virus di lahan dan menekan penyebaran lanjutan ke tanaman sehat</p>
-            
-            <h4>3. Pencegahan pada tanaman tebu lainnya</h4>
-            <p><strong>Langkah pencegahan:</strong></p>
-            <p>Untuk mencegah terjadinya serangan mosaic pada area tanam lain atau pada musim tanam berikutnya, Lu dkk. (2021) menekankan pentingnya keberlanjutan praktik pencegahan. Langkah-langkah yang direkomendasikan meliputi penggunaan material tanam yang bebas virus, pemilihan varietas yang toleran atau tahan terhadap mosaic, serta penerapan sanitasi kebun dan rotasi tanaman secara konsisten. Penerapan manajemen lahan yang baik bertujuan untuk mencegah akumulasi inokulum virus di tanah, sehingga risiko serangan mosaic pada pertanaman berikutnya dapat ditekan</p>""",
+        st.markdown(ui_templates.PLOT_NOTE_HTML.format(
+            background='#fff3e0', border='#f57c00', color='#e65100', explanation=explanation), unsafe_allow_html=True)
         
-        "Yellow": """<h3>Yellow/Chlorotic - Rekomendasi Penanganan</h3>
-            
-            <h4>1. Penanganan agar penyakit tidak meluas</h4>
-            <p><strong>Tindakan perbaikan nutrisi dan kesehatan:</strong></p>
-            <p>Yellow leaf disease disebabkan oleh Sugarcane yellow leaf virus (SCYLV) dan sering ditularkan oleh vektor seperti kutu daun, sehingga riset ilmiah menekankan pentingnya resistensi genetis varietas terhadap virus ini serta pengendalian terhadap vektor serangga jika tersedia. (Bertasello dkk., 2023)</p>
-            
-            <h4>2. Penanganan jika penyakit sudah meluas</h4>
-            <p><strong>Perbaikan kondisi lahan:</strong></p>
-            <p>Setelah yellow leaf menyebar, manajemen dapat melibatkan monitoring populasi vektor dan penggunaan varietas yang toleran terhadap SCYLV, karena stress virus lebih mudah dikelola dengan pendekatan varietas yang lebih tahan dan kontrol populasi vektor di lapangan. (Bertasello dkk., 2023)</p>
-            
-            <h4>3. Pencegahan pada tanaman tebu lainnya</h4>
-            <p><strong>Langkah pencegahan:</strong></p>
-            <p>Pencegahan pada tanaman baru mempertimbangkan screening varietas berdasarkan preferensi vektor dan resistensi terhadap virus untuk mengurangi peluang tersebarnya yellow leaf di blok tanaman lain. (Bertasello dkk., 2023)</p>""",
+        st.session_state.pred_class = pred_class
         
-        "Rust": """<h3>Rust/Karat - Rekomendasi Penanganan</h3>
-            
-            <h4>1. Penanganan agar penyakit tidak meluas</h4>
-            <p><strong>Tindakan pengendalian penyakit karat:</strong></p>
-            <p>Rust pada tebu, yang termasuk penyakit daun foliar utama, biasanya dikontrol terutama melalui pemilihan varietas yang tahan karena resistensi varietas sangat penting untuk menahan penyebaran penyakit ini. Serangan rust dapat menyebar melalui uredospora yang terbawa angin sehingga varietas tahan mengurangi kemungkinan epidemi lanjutan (Viswanathan, 2022).</p>
-            
-            <h4>2. Penanganan jika penyakit sudah meluas</h4>
-            <p><strong>Strategi pengelolaan serangan berat:</strong></p>
-            <p>Ketika rust sudah menyebar di ladang, literature jurnal mencatat bahwa pengendalian kimia yang efektif sulit dan penggunaan fungisida berulang mungkin diperlukan di lapangan yang sangat terserang, tetapi strategi utama tetap pada varietas tahan dan pengelolaan tangguh terhadap kondisi lingkungan yang mendukung rust (Viswanathan, 2022).</p>
-            
-            <h4>3. Pencegahan pada tanaman tebu lainnya</h4>
-            <p><strong>Langkah pencegahan:</strong></p>
-            <p>Untuk pencegahan pada tanaman tebu lainnya, menjaga keragaman varietas dan tidak tergantung hanya pada satu tipe varietas dapat membantu menekan epidemi rust di area yang lebih luas karena variasi genetik dapat memperlambat penyebaran varietas rust yang agresif (Viswanathan, 2022).</p>"""
-    }
+        st.markdown('</div>', unsafe_allow_html=True)
+    
+    with col2:
+        st.markdown('<div class="plot-card">', unsafe_allow_html=True)
+        st.markdown('<div class="plot-title">Force Plot</div>', unsafe_allow_html=True)
+        
+        image = get_plot_image(
+            model_package, (explanation_digest, prediction, 'force'),
+            lambda: create_force_plot(shap_values, explanation_values(), prediction, model_package))
+        if image:
+            show_plot_image(image)
+        else:
+            st.error("❌ Error: Plot gagal dimuat. Check console untuk details.")
+        
+        st.markdown('<div class="plot-caption">Dampak setiap fitur pada keputusan</div>', unsafe_allow_html=True)
+        
+        # CARA BACA GRAFIK
+        pred_class = st.session_state.get('pred_class', 'Unknown')
+        
+        if pred_class == "Healthy":
+            explanation = "<strong>Cara baca grafik tengah:</strong><br>🟦 <strong>Biru banyak</strong> = fitur-fitur menarik ke \"SEHAT\"<br>🟥 Pink sedikit = fitur penyakit lemah<br>→ Biru > Pink = Model yakin ini SEHAT, bukan penyakit!"
+        elif pred_class == "Red Rot":
+            explanation = "<strong>Cara baca grafik tengah:</strong><br>🟥 <strong>Pink banyak</strong> = fitur-fitur mendorong ke \"RED ROT\"<br>🟦 Biru sedikit = fitur sehat kalah<br>→ Pink > Biru = Model yakin ini RED ROT!"
+        elif pred_class == "Mosaic":
+            explanation = "<strong>Cara baca grafik tengah:</strong><br>🟥 <strong>Pink banyak</strong> = fitur-fitur mendorong ke \"MOSAIC\"<br>🟦 Biru sedikit = fitur teratur kalah<br>→ Pink > Biru = Model yakin ini MOSAIC!"
+        elif pred_class == "Yellow":
+            explanation = "<strong>Cara baca grafik tengah:</strong><br>🟥 <strong>Pink banyak</strong> = fitur-fitur mendorong ke \"YELLOW\"<br>🟦 Biru sedikit = fitur hijau kalah<br>→ Pink > Biru = Model yakin ini YELLOW!"
+        elif pred_class == "Rust":
+            explanation = "<strong>Cara baca grafik tengah:</strong><br>🟥 <strong>Pink banyak</strong> = fitur-fitur mendorong ke \"RUST\"<br>🟦 Biru sedikit = fitur halus kalah<br>→ Pink > Biru = Model yakin ini RUST!"
+        else:
+            explanation = "🟥 Pink = mendorong ke hasil deteksi | 🟦 Biru = menahan dari hasil deteksi"
+        
+        st.markdown(ui_templates.PLOT_NOTE_HTML.format(
+            background='#e3f2fd', border='#1976d2', color='#0d47a1', explanation=explanation), unsafe_allow_html=True)
+        
+        st.markdown('</div>', unsafe_allow_html=True)
     
-    # Get recommendation, strip ALL whitespace including newlines
-    recommendation_html = recommendations.get(disease_name, 
-        """<h4>ℹ️ Informasi Umum</h4>
-        <p>Untuk rekomendasi penanganan penyakit ini, silakan konsultasikan dengan penyuluh pertanian setempat 
-        atau hubungi Dinas Pertanian terdekat untuk mendapatkan panduan yang sesuai dengan kondisi lahan Anda.</p>"""
-    )
+    with col3:
+        st.markdown('<div class="plot-card">', unsafe_allow_html=True)
+        st.markdown('<div class="plot-title">Waterfall Plot</div>', unsafe_allow_html=True)
+        
+        image = get_plot_image(
+            model_package, (explanation_digest, prediction, 'waterfall'),
+            lambda: create_waterfall_plot(shap_values, explanation_values(), prediction, model_package))
+        if image:
+            show_plot_image(image)
+        else:
+            st.error("❌ Error: Plot gagal dimuat. Check console untuk details.")
+        
+        st.markdown('<div class="plot-caption">Alur keputusan model AI</div>', unsafe_allow_html=True)
+        
+        # CARA BACA GRAFIK
+        pred_class = st.session_state.get('pred_class', 'Unknown')
+        
+        if pred_class == "Healthy":
+            explanation = "<strong>Cara baca grafik kanan:</strong><br>• <strong>Angka KIRI</strong> (misal: 0.85) = nilai fitur di gambar kamu<br>• <strong>Angka KANAN</strong> (misal: +0.15) = seberapa besar fitur ini bikin model yakin<br>• <strong>+0.15</strong> (positif) = NAMBAH keyakinan ke SEHAT<br>→ Banyak angka + dari fitur hijau/halus = Yakin SEHAT!"
+        elif pred_class == "Red Rot":
+            explanation = "<strong>Cara baca grafik kanan:</strong><br>• <strong>Angka KIRI</strong> (misal: -0.75) = nilai fitur di gambar kamu<br>• <strong>Angka KANAN</strong> (misal: +0.26) = seberapa besar fitur ini bikin model yakin<br>• <strong>+0.26</strong> (besar!) = NAMBAH banyak keyakinan ke RED ROT<br>→ Angka + besar dari fitur merah/kasar = Yakin RED ROT!"
+        elif pred_class == "Mosaic":
+            explanation = "<strong>Cara baca grafik kanan:</strong><br>• <strong>Angka KIRI</strong> (misal: -0.52) = nilai fitur di gambar kamu<br>• <strong>Angka KANAN</strong> (misal: +0.18) = seberapa besar fitur ini bikin model yakin<br>• <strong>+0.18</strong> (positif) = NAMBAH keyakinan ke MOSAIC<br>→ Angka + dari fitur kontras/pola = Yakin MOSAIC!"
+        elif pred_class == "Yellow":
+            explanation = "<strong>Cara baca grafik kanan:</strong><br>• <strong>Angka KIRI</strong> (misal: 3.24) = nilai fitur di gambar kamu<br>• <strong>Angka KANAN</strong> (misal: +0.22) = seberapa besar fitur ini bikin model yakin<br>• <strong>+0.22</strong> (besar!) = NAMBAH banyak keyakinan ke YELLOW<br>→ Angka + besar dari fitur kuning = Yakin YELLOW!"
+        elif pred_class == "Rust":
+            explanation = "<strong>Cara baca grafik kanan:</strong><br>• <strong>Angka KIRI</strong> (misal: -0.758) = nilai fitur di gambar kamu<br>• <strong>Angka KANAN</strong> (misal: +0.26) = seberapa besar fitur ini bikin model yakin<br>• <strong>+0.26</strong> (besar!) = NAMBAH banyak keyakinan ke RUST<br>→ Angka + besar dari fitur kasar/karat = Yakin RUST!"
+        else:
+            explanation = "Angka kiri = nilai fitur | Angka kanan (+/-) = kontribusi ke hasil"
+        
+        st.markdown(ui_templates.PLOT_NOTE_HTML.format(
+            background='#f3e5f5', border='#7b1fa2', color='#4a148c', explanation=explanation), unsafe_allow_html=True)
+        
+        st.markdown('</div>', unsafe_allow_html=True)
+
+
+def get_rule_based_recommendation(disease_name):
+    """
+    Rule-based recommendation system (fallback when Gemini unavailable)
+    Teks sudah dirender sekali saat import (recommendation_store)
+    """
+    return get_rule_based(disease_name).body
+
+
+# Model Gemini di-hardcode: list_models() = 1 API request = BUANG QUOTA!
+GEMINI_MODEL = 'gemini-2.5-flash'
+
+# Naikkan setiap kali RECOMMENDATION_PROMPT diubah (jawaban lama di cache tidak dipakai)
+RECOMMENDATION_PROMPT_VERSION = 1
+RECOMMENDATION_PROMPT = """Kamu adalah asisten pertanian untuk petani tebu. Kamu akan menerima nama penyakit daun tebu yang sudah ditentukan dari hasil klasifikasi model SVM.
+
+Penyakit yang terdeteksi: {disease_name}
+
+Tugas kamu adalah memberikan rekomendasi penanganan bersifat umum, aman, dan mudah dipahami petani, tanpa menyebutkan dosis, merek, atau bahan kimia spesifik, sesuaikan penanganan dengan cuaca terupdate hari ini. 
+
+Batasi jawaban hanya pada tiga bagian berikut:
+
+1. Penanganan agar penyakit tidak meluas
+Jelaskan langkah-langkah umum yang bisa dilakukan petani untuk mencegah penyebaran penyakit ke tanaman lain.
+
+2. Penanganan jika penyakit sudah meluas
+Jelaskan tindakan pengelolaan lahan dan tanaman secara umum jika sebagian besar tanaman sudah terdampak.
+
+3. Pencegahan pada tanaman tebu lainnya
+Berikan saran pencegahan agar tanaman tebu yang masih sehat tidak ikut terserang.
+
+Gunakan bahasa yang sederhana, non-teknis, dan ramah petani.
+
+Dilarang:
+* Memberikan rekomendasi penggunaan pestisida, fungisida, atau bahan kimia tertentu
+* Menyebutkan dosis, campuran, atau prosedur teknis berisiko
+* Memberikan diagnosis ulang atau mempertanyakan hasil klasifikasi
+
+Jika diperlukan, arahkan petani untuk berkonsultasi dengan penyuluh pertanian atau sumber resmi setempat.
+tambahkan informasi pula mengenai penyakit tersebut, yang dapat menyebabkan kerugian pada tanaman tebu.
+
+Format jawaban dalam HTML dengan struktur:
+<h4>1. Penanganan agar penyakit tidak meluas</h4>
+<p>...</p>
+
+<h4>2. Penanganan jika penyakit sudah meluas</h4>
+<p>...</p>
+
+<h4>3. Pencegahan pada tanaman tebu lainnya</h4>
+<p>...</p>
+"""
+
+
+class GeminiClient:
+    """Client LLM Gemini (stub untuk testing cukup punya model_name + generate)"""
     
-    # Clean up: remove leading/trailing whitespace and normalize
-    return recommendation_html.strip()
+    def __init__(self, api_key, model_name=GEMINI_MODEL, timeout=None):
+        import google.generativeai as genai
+        genai.configure(api_key=api_key)
+        self.model_name = model_name
+        self.timeout = timeout
+        self._model = genai.GenerativeModel(model_name)
+    
+    def generate(self, prompt):
+        request_options = {"timeout": self.timeout} if self.timeout else None
+        response = self._model.generate_content(prompt, request_options=request_options)
+        return response.text if response else None
+
+
+@st.cache_resource
+def get_gemini_client(api_key):
+    return GeminiClient(api_key, timeout=RECOMMENDATION_TIMEOUT)
+
+
+@st.cache_resource
+def get_recommendation_cache():
+    """Cache rekomendasi LLM, satu per proses server (persisten di disk)"""
+    return RecommendationCache(RECOMMENDATION_CACHE_DIR, RECOMMENDATION_CACHE_TTL)
+
+
+def rule_based_result(disease_name, info_message, fallback_reason=None):
+    """Hasil rekomendasi rule-based (fallback) dengan pesan info + kartu siap tampil"""
+    recommendation = get_rule_based(disease_name)
+    return {
+        "success": True,
+        "is_rule_based": True,
+        "message": recommendation.body,
+        "card": recommendation.card(info_message),
+        "info_message": info_message,
+        "fallback_reason": fallback_reason
+    }
+
+
+def recommendation_breaker_fallback(disease_name):
+    """Saat circuit breaker terbuka: jawaban AI dari cache bila ada, selain itu rule-based"""
+    key = recommendation_key(disease_name, GEMINI_MODEL, RECOMMENDATION_PROMPT_VERSION)
+    cached = get_recommendation_cache().get(key)
+    if cached is not None:
+        return {
+            "success": True,
+            "message": cached
+        }
+    print(f"⚡ Circuit breaker rekomendasi terbuka, pakai rule-based untuk {disease_name}")
+    return rule_based_result(
+        disease_name, "⏸️ <strong>Layanan AI sedang bermasalah</strong> - Menggunakan rekomendasi berbasis aturan",
+        "circuit_open")
+
+
+@st.cache_resource
+def get_recommendation_fetcher():
+    """Fetch rekomendasi di background + circuit breaker, satu per proses server"""
+    breaker = CircuitBreaker(RECOMMENDATION_BREAKER_FAILURES, RECOMMENDATION_BREAKER_COOLDOWN)
+    return RecommendationFetcher(get_gemini_recommendation, recommendation_breaker_fallback,
+                                 RECOMMENDATION_TIMEOUT, breaker)
 
 
-def get_gemini_recommendation(disease_name):
-    """Get treatment recommendation from Gemini API with detailed error handling"""
+def get_gemini_recommendation(disease_name, client=None, cache=None):
+    """
+    Get treatment recommendation from Gemini API with detailed error handling
+    
+    client: client LLM (model_name + generate(prompt)), default GeminiClient
+    dari API key di secrets; cache: default cache bersama semua sesi
+    """
     
     # Check if Gemini library is installed
-    if not GEMINI_AVAILABLE:
+    if client is None and not GEMINI_AVAILABLE:
         return {
             "success": False,
             "error_type": "library_not_installed",
@@ -1487,7 +986,7 @@ def get_gemini_recommendation(disease_name):
     try:
         # ===== OPTION 1: Streamlit Secrets (Recommended for deployment) =====
         # Baca dari file .streamlit/secrets.toml
-        api_key = st.secrets.get("GEMINI_API_KEY", None)
+        api_key = st.secrets.get("GEMINI_API_KEY", None) if client is None else None
         
         # ===== OPTION 2: Hardcode untuk Testing (MUDAH!) =====
         # UNCOMMENT baris di bawah dan ganti dengan API key Anda:
@@ -1511,95 +1010,43 @@ def get_gemini_recommendation(disease_name):
         # import os
         # api_key = os.getenv("GEMINI_API_KEY")
         
-        if not api_key:
+        if client is None and not api_key:
             return {
                 "success": False,
                 "error_type": "no_api_key",
                 "message": "🔑 <strong>API Key tidak ditemukan</strong><br>Sistem belum dikonfigurasi dengan benar. Hubungi administrator atau pengembang aplikasi untuk mengaktifkan fitur rekomendasi AI."
             }
         
-        # Configure API
-        genai.configure(api_key=api_key)
-        
-        # ===== AUTO-SELECT MODEL (TANPA list_models untuk HEMAT QUOTA!) =====
-        print("\n" + "="*60)
-        print("🎯 SELECTING GEMINI MODEL (QUOTA-SAVING MODE)...")
-        print("="*60)
-        
-        # HARDCODE priority list - TIDAK panggil list_models() yang konsumsi quota!
-        # list_models() = 1 API request = BUANG QUOTA!
-        # Langsung pakai model tertentu = HEMAT QUOTA!
-        
-        # Use the latest available models (verified from troubleshoot_quota.py)
-        preferred_models = [
-            'gemini-2.5-flash',  # Latest, recommended, VERIFIED AVAILABLE!
-            'gemini-flash-latest',  # Stable alias, always works
-            'gemini-2.0-flash',  # Backup option
-        ]
-        
-        # IMPORTANT: Only try 1-2 models max to save quota!
-        # Don't loop through all 6 models - that wastes quota!
-        selected_model = preferred_models[0]
+        # Jawaban yang sama dipakai ulang oleh semua rerun & sesi (per hari)
+        if cache is None:
+            cache = get_recommendation_cache()
+        model_name = client.model_name if client is not None else GEMINI_MODEL
+        key = recommendation_key(disease_name, model_name, RECOMMENDATION_PROMPT_VERSION)
+        cached = cache.get(key)
+        if cached is not None:
+            return {
+                "success": True,
+                "message": cached
+            }
         
-        print(f"✅ MODEL DIPILIH: {selected_model}")
-        print("📌 Mode: Single model (hemat quota)")
-        print("="*60 + "\n")
+        if client is None:
+            client = get_gemini_client(api_key)
         
-        # Try PRIMARY model only
         try:
-            print(f"🧪 Mencoba model: {selected_model}")
-            model = genai.GenerativeModel(selected_model)
-            
-            # Create prompt
-            prompt = f"""Kamu adalah asisten pertanian untuk petani tebu. Kamu akan menerima nama penyakit daun tebu yang sudah ditentukan dari hasil klasifikasi model SVM.
-
-Penyakit yang terdeteksi: {disease_name}
-
-Tugas kamu adalah memberikan rekomendasi penanganan bersifat umum, aman, dan mudah dipahami petani, tanpa menyebutkan dosis, merek, atau bahan kimia spesifik, sesuaikan penanganan dengan cuaca terupdate hari ini. 
-
-Batasi jawaban hanya pada tiga bagian berikut:
-
-1. Penanganan agar penyakit tidak meluas
-Jelaskan langkah-langkah umum yang bisa dilakukan petani untuk mencegah penyebaran penyakit ke tanaman lain.
-
-2. Penanganan jika penyakit sudah meluas
-Jelaskan tindakan pengelolaan lahan dan tanaman secara umum jika sebagian besar tanaman sudah terdampak.
-
-3. Pencegahan pada tanaman tebu lainnya
-Berikan saran pencegahan agar tanaman tebu yang masih sehat tidak ikut terserang.
-
-Gunakan bahasa yang sederhana, non-teknis, dan ramah petani.
-
-Dilarang:
-* Memberikan rekomendasi penggunaan pestisida, fungisida, atau bahan kimia tertentu
-* Menyebutkan dosis, campuran, atau prosedur teknis berisiko
-* Memberikan diagnosis ulang atau mempertanyakan hasil klasifikasi
-
-Jika diperlukan, arahkan petani untuk berkonsultasi dengan penyuluh pertanian atau sumber resmi setempat.
-tambahkan informasi pula mengenai penyakit tersebut, yang dapat menyebabkan kerugian pada tanaman tebu.
-
-Format jawaban dalam HTML dengan struktur:
-<h4>1. Penanganan agar penyakit tidak meluas</h4>
-<p>...</p>
-
-<h4>2. Penanganan jika penyakit sudah meluas</h4>
-<p>...</p>
-
-<h4>3. Pencegahan pada tanaman tebu lainnya</h4>
-<p>...</p>
-"""
+            print(f"🧪 Meminta rekomendasi {disease_name} ke model: {model_name}")
+            prompt = RECOMMENDATION_PROMPT.format(disease_name=disease_name)
             
-            # Generate response with timeout
-            response = model.generate_content(prompt)
+            text = client.generate(prompt)
             
-            if response and response.text:
-                print(f"✅ BERHASIL dengan model: {selected_model}\n")
+            if text:
+                print(f"✅ BERHASIL dengan model: {model_name}\n")
+                cache.put(key, text)
                 return {
                     "success": True,
-                    "message": response.text
+                    "message": text
                 }
             else:
-                print(f"⚠️  Model {selected_model} tidak memberikan response\n")
+                print(f"⚠️  Model {model_name} tidak memberikan response\n")
                 # Return empty response error
                 return {
                     "success": False,
@@ -1609,14 +1056,14 @@ Format jawaban dalam HTML dengan struktur:
                 
         except Exception as model_error:
             error_str = str(model_error).lower()
-            print(f"❌ Model {selected_model} error: {error_str[:200]}\n")
+            print(f"❌ Model {model_name} error: {error_str[:200]}\n")
             
             # Check if 404 model not found → try backup model or use rule-based
             if '404' in error_str or 'not found' in error_str or 'is not found' in error_str:
                 print("\n" + "="*70)
                 print("⚠️  MODEL TIDAK DITEMUKAN (404)!")
                 print("="*70)
-                print(f"\n📌 Model '{selected_model}' tidak tersedia di API Anda")
+                print(f"\n📌 Model '{model_name}' tidak tersedia di API Anda")
                 print("\n💡 SOLUSI OTOMATIS:")
                 print("   • Menggunakan rekomendasi berbasis aturan (rule-based)")
                 print("   • Kualitas tetap bagus, tidak perlu AI!")
@@ -1624,13 +1071,9 @@ Format jawaban dalam HTML dengan struktur:
                 print("\n✅ User tetap dapat rekomendasi lengkap.")
                 print("="*70 + "\n")
                 
-                rule_based = get_rule_based_recommendation(disease_name)
-                return {
-                    "success": True,
-                    "is_rule_based": True,
-                    "message": rule_based,
-                    "info_message": "📌 <strong>Model AI tidak tersedia</strong> - Menggunakan rekomendasi berbasis aturan"
-                }
+                return rule_based_result(
+                    disease_name, "📌 <strong>Model AI tidak tersedia</strong> - Menggunakan rekomendasi berbasis aturan",
+                    "model_not_found")
             
             # Check if quota/rate limit error → use rule-based fallback
             elif any(keyword in error_str for keyword in ['quota', 'limit', '429', 'resource']):
@@ -1650,13 +1093,9 @@ Format jawaban dalam HTML dengan struktur:
                 print("\n✅ Aplikasi tetap jalan! User dapat rekomendasi rule-based.")
                 print("="*70 + "\n")
                 
-                rule_based = get_rule_based_recommendation(disease_name)
-                return {
-                    "success": True,
-                    "is_rule_based": True,
-                    "message": rule_based,
-                    "info_message": "⏰ <strong>Quota AI habis</strong> - Menggunakan rekomendasi berbasis aturan"
-                }
+                return rule_based_result(
+                    disease_name, "⏰ <strong>Quota AI habis</strong> - Menggunakan rekomendasi berbasis aturan",
+                    "quota")
             else:
                 # Other error, re-raise to be handled by outer except
                 raise model_error
@@ -1667,24 +1106,16 @@ Format jawaban dalam HTML dengan struktur:
         # Check for specific error types
         
         # 1. No internet / network error - USE RULE-BASED FALLBACK
-        if any(keyword in error_str for keyword in ['network', 'connection', 'unreachable', 'timeout', 'dns', 'failed to establish']):
-            rule_based = get_rule_based_recommendation(disease_name)
-            return {
-                "success": True,  # Changed to True because we have fallback
-                "is_rule_based": True,
-                "message": rule_based,
-                "info_message": "📡 <strong>Tidak ada koneksi internet</strong> - Menggunakan rekomendasi berbasis aturan"
-            }
+        if any(keyword in error_str for keyword in ['network', 'connection', 'unreachable', 'timeout', 'deadline', 'dns', 'failed to establish']):
+            return rule_based_result(
+                disease_name, "📡 <strong>Tidak ada koneksi internet</strong> - Menggunakan rekomendasi berbasis aturan",
+                "network")
         
         # 2. Quota exceeded - USE RULE-BASED FALLBACK
         elif any(keyword in error_str for keyword in ['quota', 'limit', 'rate limit', 'too many requests', '429']):
-            rule_based = get_rule_based_recommendation(disease_name)
-            return {
-                "success": True,  # Changed to True because we have fallback
-                "is_rule_based": True,
-                "message": rule_based,
-                "info_message": "⏰ <strong>Kuota AI Gemini habis</strong> - Menggunakan rekomendasi berbasis aturan"
-            }
+            return rule_based_result(
+                disease_name, "⏰ <strong>Kuota AI Gemini habis</strong> - Menggunakan rekomendasi berbasis aturan",
+                "quota")
         
         # 3. Invalid API key
         elif any(keyword in error_str for keyword in ['api key', 'invalid', 'unauthorized', '401', '403', 'permission']):
@@ -1711,47 +1142,102 @@ Format jawaban dalam HTML dengan struktur:
             }
 
 
+def render_recommendation(gemini_result):
+    """Tampilkan kartu rekomendasi (AI, rule-based, atau pesan error)"""
+    # Check if successful
+    if gemini_result and gemini_result.get("success"):
+        # Check if this is rule-based or AI-generated
+        is_rule_based = gemini_result.get("is_rule_based", False)
+        
+        if is_rule_based:
+            # RULE-BASED RECOMMENDATION (Fallback), kartu sudah dirender
+            st.markdown(gemini_result['card'], unsafe_allow_html=True)
+        else:
+            # AI-GENERATED RECOMMENDATION (Gemini)
+            st.markdown(ui_templates.AI_RECOMMENDATION_HTML.format(
+                message=gemini_result['message']), unsafe_allow_html=True)
+    
+    elif gemini_result and not gemini_result.get("success"):
+        # ERROR - Show specific error message based on type
+        error_type = gemini_result.get("error_type", "unknown")
+        error_message = gemini_result.get("message", "Terjadi kesalahan.")
+        
+        # Different colors for different error types
+        if error_type == "no_internet":
+            bg_color = "#e3f2fd"  # Blue for network issues
+            border_color = "#2196f3"
+            icon = "📡"
+        elif error_type == "quota_exceeded":
+            bg_color = "#fff3e0"  # Orange for quota
+            border_color = "#ff9800"
+            icon = "⏰"
+        elif error_type in ["no_api_key", "invalid_key"]:
+            bg_color = "#fce4ec"  # Pink for config issues
+            border_color = "#e91e63"
+            icon = "🔑"
+        elif error_type == "server_error":
+            bg_color = "#f3e5f5"  # Purple for server issues
+            border_color = "#9c27b0"
+            icon = "🔧"
+        else:
+            bg_color = "#ffebee"  # Red for unknown
+            border_color = "#f44336"
+            icon = "❌"
+        
+        st.markdown(ui_templates.RECOMMENDATION_ERROR_HTML.format(
+            bg_color=bg_color, border_color=border_color, error_message=error_message), unsafe_allow_html=True)
+    
+    else:
+        # FALLBACK - No result at all
+        st.markdown(ui_templates.RECOMMENDATION_UNAVAILABLE_HTML, unsafe_allow_html=True)
+
+
+def render_recommendation_section():
+    """
+    Isi bagian rekomendasi: tunggu job fetch sampai selesai atau batas waktu
+    Dijalankan sebagai fragment yang di-rerun berkala selama job belum selesai.
+    """
+    job = st.session_state.recommendation_job
+    
+    if not job.done() and not job.expired():
+        st.session_state.recommendation_polling = True
+        st.markdown(ui_templates.RECOMMENDATION_LOADING_HTML, unsafe_allow_html=True)
+        return
+    
+    if st.session_state.get('recommendation_polling'):
+        # Selesai / lewat batas waktu saat polling: rerun penuh sekali supaya polling berhenti
+        st.session_state.recommendation_polling = False
+        st.rerun()
+    
+    if job.done():
+        try:
+            gemini_result = job.result()
+        except Exception as e:
+            gemini_result = rule_based_result(
+                job.disease_name, "❌ <strong>Terjadi kesalahan pada AI</strong> - Menggunakan rekomendasi berbasis aturan")
+            print(f"❌ Fetch rekomendasi error: {e}")
+    else:
+        # Fetch tetap jalan di background; jawabannya masuk cache untuk berikutnya
+        gemini_result = rule_based_result(
+            job.disease_name, "⏱️ <strong>AI terlalu lama merespon</strong> - Menggunakan rekomendasi berbasis aturan",
+            "timeout")
+    render_recommendation(gemini_result)
+
+
 # ==================== MAIN APP ====================
 
 def main():
     model_package = load_model()
     
     # ===== HEADER =====
-    st.markdown("""
-    <div class="main-header">
-        <h1>Deteksi Penyakit Daun Tebu</h1>
-        <p>Klasifikasi Penyakit Daun Tebu Menggunakan Support Vector Machine dengan Pendekatan Explainable AI</p>
-    </div>
-    """, unsafe_allow_html=True)
+    st.markdown(ui_templates.HEADER_HTML, unsafe_allow_html=True)
     
     # ===== SIDEBAR - REMOVED (disease_info.py not available) =====
     # Sidebar information panel has been removed due to missing disease_info module
     # Core functionality (disease detection, XAI, recommendations) still works!
     
     # ===== GUIDE =====
-    st.markdown("""
-    <div class="info-box">
-        <strong>Panduan Penggunaan:</strong><br>
-        <strong>1.</strong> Upload foto daun tebu dari galeri atau ambil foto dengan kamera<br>
-        <strong>2.</strong> Preview akan muncul <span class="desktop-only">di sebelah kanan</span><span class="mobile-only">di bawah</span><br>
-        <strong>3.</strong> Klik tombol "Analisis Gambar"<br>
-        <strong>4.</strong> Lihat hasil deteksi dan analisis model<br><br>
-        <strong style="color: #d84315;">⚠️ PENTING:</strong> Hanya upload foto daun tebu! Jangan Foto Objek Lain.
-    </div>
-    """, unsafe_allow_html=True)
-    
-    # Add CSS for responsive text
-    st.markdown("""
-    <style>
-        .mobile-only { display: none; }
-        .desktop-only { display: inline; }
-        
-        @media (max-width: 768px) {
-            .mobile-only { display: inline; }
-            .desktop-only { display: none; }
-        }
-    </style>
-    """, unsafe_allow_html=True)
+    st.markdown(ui_templates.GUIDE_HTML, unsafe_allow_html=True)
     
     # ===== INPUT SECTION =====
     col_upload, col_preview = st.columns([1, 1], gap="large")
@@ -1772,24 +1258,7 @@ def main():
             key="upload_method"
         )
         
-        # CSS: Hide ENTIRE radio on desktop, show on mobile
-        st.markdown("""
-        <style>
-        /* DESKTOP (> 768px): Hide radio buttons COMPLETELY */
-        @media (min-width: 769px) {
-            [data-testid="stRadio"] {
-                display: none !important;
-            }
-        }
-        
-        /* MOBILE/TABLET (≤ 768px): Show radio buttons */
-        @media (max-width: 768px) {
-            [data-testid="stRadio"] {
-                display: block !important;
-            }
-        }
-        </style>
-        """, unsafe_allow_html=True)
+        # Radio disembunyikan di desktop lewat CSS (assets/css/app.css)
         
         # NO extra spacing
         
@@ -1808,20 +1277,13 @@ def main():
                 
                 # Check if this is a new file
                 if st.session_state.prev_image_hash != file_hash:
-                    st.session_state.image = Image.open(uploaded_file)
+                    st.session_state.image = NormalizedImage.from_bytes(uploaded_file.getvalue())
                     st.session_state.prev_image_hash = file_hash
                     st.session_state.analysis_done = False
         
         elif upload_method == "📷 Kamera":
             # Warning for localhost/HTTP
-            st.markdown("""
-            <div style="background: #fff3e0; padding: 0.8rem 1rem; border-radius: 8px; margin-bottom: 1rem; border-left: 3px solid #ff9800;">
-                <p style="margin: 0; font-size: 0.8rem; color: #e65100; line-height: 1.5;">
-                    📱 <strong>Info:</strong> Gunakan <strong>Kamera</strong>. 
-                    untuk memotret daun tebu anda!
-                </p>
-            </div>
-            """, unsafe_allow_html=True)
+            st.markdown(ui_templates.CAMERA_INFO_HTML, unsafe_allow_html=True)
             
             camera_photo = st.camera_input(
                 "Ambil foto dengan kamera",
@@ -1836,7 +1298,7 @@ def main():
                 
                 # Check if this is a new photo
                 if st.session_state.prev_image_hash != photo_hash:
-                    st.session_state.image = Image.open(camera_photo)
+                    st.session_state.image = NormalizedImage.from_bytes(camera_photo.getvalue())
                     st.session_state.prev_image_hash = photo_hash
                     st.session_state.analysis_done = False
         
@@ -1856,57 +1318,18 @@ def main():
         st.markdown('<div class="card-title">Preview Gambar</div>', unsafe_allow_html=True)
         
         if st.session_state.image is not None:
-            # Super fast preview optimization
-            preview_image = st.session_state.image.copy()
-            
-            # ✅ FIX: Convert RGBA to RGB (untuk PNG dengan transparency)
-            if preview_image.mode == 'RGBA':
-                # Create white background
-                rgb_image = Image.new('RGB', preview_image.size, (255, 255, 255))
-                rgb_image.paste(preview_image, mask=preview_image.split()[3])  # Use alpha as mask
-                preview_image = rgb_image
-            elif preview_image.mode not in ('RGB', 'L'):
-                # Convert other modes to RGB
-                preview_image = preview_image.convert('RGB')
-            
-            # Even smaller preview for speed (600x600 max)
-            max_preview_size = (600, 600)
-            
-            # Resize if needed
-            if preview_image.width > max_preview_size[0] or preview_image.height > max_preview_size[1]:
-                preview_image.thumbnail(max_preview_size, Image.Resampling.LANCZOS)
-            
-            # Fast base64 conversion with optimization
-            img_buffer = io.BytesIO()
-            preview_image.save(img_buffer, format='JPEG', quality=85, optimize=True)
-            img_base64 = base64.b64encode(img_buffer.getvalue()).decode()
-            
-            # Get file size from original
-            w, h = st.session_state.image.size
-            original_buffer = io.BytesIO()
-            st.session_state.image.save(original_buffer, format='PNG')
-            file_size_mb = len(original_buffer.getvalue()) / (1024 * 1024)
+            # Thumbnail sudah dibuat sekali saat upload (NormalizedImage)
+            image = st.session_state.image
+            img_base64 = base64.b64encode(image.preview_jpeg).decode()
+            w, h = image.original_size
+            file_size_mb = image.file_size / (1024 * 1024)
             
             # Fast rendering
-            st.markdown(f"""
-            <div class="img-preview-box">
-                <img src="data:image/jpeg;base64,{img_base64}" alt="Preview">
-                <div class="img-caption">
-                    <strong style="color: #2d5016;">{w} × {h} px</strong>
-                    <span style="color: #2d5016; margin-left: 1rem;">• {file_size_mb:.2f} MB</span>
-                </div>
-            </div>
-            """, unsafe_allow_html=True)
+            st.markdown(ui_templates.PREVIEW_HTML.format(
+                img_base64=img_base64, width=w, height=h, file_size_mb=file_size_mb), unsafe_allow_html=True)
         else:
             # Empty state
-            st.markdown("""
-            <div class="img-preview-box">
-                <div class="empty-state">
-                    <div class="empty-icon">📷</div>
-                    <p>Gambar akan ditampilkan di sini</p>
-                </div>
-            </div>
-            """, unsafe_allow_html=True)
+            st.markdown(ui_templates.EMPTY_PREVIEW_HTML, unsafe_allow_html=True)
         
         st.markdown("</div>", unsafe_allow_html=True)
     
@@ -1916,20 +1339,14 @@ def main():
     
         with col_progress:
             loading_placeholder = st.empty()
-            loading_placeholder.markdown("""
-            <div style='text-align: center; margin: 1.5rem 0 0.5rem 0;'>
-                <span style='font-size: 0.9rem; color: #2d5016; font-weight: 600;'>
-                    🔍 Memvalidasi gambar...
-                </span>
-            </div>
-            """, unsafe_allow_html=True)
+            loading_placeholder.markdown(ui_templates.VALIDATING_HTML, unsafe_allow_html=True)
         
             progress_bar = st.progress(0)
             progress_bar.progress(30)
         
             # REPLACE bagian result = predict_image dengan ini:
             result = predict_image(st.session_state.image, model_package)
-            disease_name, confidence, features_scaled, prediction, error_message = result
+            disease_name, confidence, features_scaled, inference, error_message = result
         
             progress_bar.progress(100)
             loading_placeholder.empty()
@@ -1942,41 +1359,20 @@ def main():
             st.session_state.analysis_done = False
             
             # SATU pesan sederhana untuk semua rejection
-            st.markdown(f"""
-            <div style="background: linear-gradient(135deg, #ffebee 0%, #ffcdd2 100%); 
-                        padding: 2rem; 
-                        border-radius: 20px; 
-                        border-left: 6px solid #f44336;
-                        box-shadow: 0 6px 20px rgba(244, 67, 54, 0.15);
-                        margin: 2rem 0;
-                        text-align: center;">
-                <div style="font-size: 4rem; margin-bottom: 1rem;">❌</div>
-                <h2 style="color: #c62828; margin: 0 0 1rem 0; font-size: 1.5rem; font-weight: 800;">
-                    Gambar Ditolak
-                </h2>
-                <p style="color: #d32f2f; font-size: 1.1rem; line-height: 1.7; margin: 0 0 1.5rem 0;">
-                    Mohon upload foto <strong>daun tebu</strong> yang jelas.<br>
-                    Jangan upload foto objek lain.
-                </p>
-                <div style="background: white; padding: 1.2rem; border-radius: 12px; margin-top: 1.5rem;">
-                    <p style="margin: 0; color: #1b5e20; font-size: 0.95rem; line-height: 1.7;">
-                        <strong>💡 Tips Foto yang Benar:</strong><br>
-                        • Foto <strong>daun tebu</strong> dengan jelas dan fokus<br>
-                        • Pastikan pencahayaan cukup<br>
-                        • Jangan upload foto selain daun tebu
-                    </p>
-                </div>
-            </div>
-            """, unsafe_allow_html=True)
+            st.markdown(ui_templates.REJECTED_HTML, unsafe_allow_html=True)
             
         elif disease_name is not None:
             # Gambar valid - lanjut analisis (TANPA pesan success!)
             st.session_state.disease_name = disease_name
             st.session_state.confidence = confidence
             st.session_state.features_scaled = features_scaled
-            st.session_state.prediction = prediction
+            st.session_state.inference = inference
+            st.session_state.prediction = inference.prediction
             st.session_state.analysis_done = True
             st.session_state.validation_error = None
+            st.session_state.shap_job = submit_shap_job(model_package, features_scaled,
+                                                        inference.image_key)
+            st.session_state.recommendation_job = get_recommendation_fetcher().submit(disease_name)
             
             # ❌ HAPUS baris ini:
             # st.success("✅ Gambar valid! Analisis berhasil.")
@@ -1989,16 +1385,12 @@ def main():
         col1, col2 = st.columns([1, 1], gap="large")
         
         with col1:
-            st.markdown(f"""
-            <div class="result-card">
-                <div class="result-label">Penyakit Terdeteksi</div>
-                <div class="result-value">{st.session_state.disease_name}</div>
-            </div>
-            """, unsafe_allow_html=True)
+            st.markdown(ui_templates.DISEASE_CARD_HTML.format(
+                disease_name=st.session_state.disease_name), unsafe_allow_html=True)
         
         with col2:
-            # Get all probabilities for all classes
-            all_probs = model_package['model'].predict_proba(st.session_state.features_scaled)[0]
+            # Probabilitas semua kelas dari hasil inferensi yang tersimpan
+            all_probs = st.session_state.inference.probabilities
             
             # Create HTML for all classes (excluding detected class) - HORIZONTAL
             other_classes_list = []
@@ -2010,16 +1402,8 @@ def main():
             # Join with spacing for horizontal display
             other_classes_html = '&nbsp;&nbsp;&nbsp;&nbsp;'.join(other_classes_list)
             
-            st.markdown(f"""
-            <div class="result-card">
-                <div class="result-label">Probabilitas Model</div>
-                <div class="result-value">{st.session_state.confidence:.1f}%</div>
-                <div class="result-desc">Akurasi prediksi antar kelas</div>
-                <div style="margin-top: 1rem; padding-top: 1rem; border-top: 1px solid #e1e8dd; color: #666; font-size: 0.75rem; line-height: 1.8;">
-                    {other_classes_html}
-                </div>
-            </div>
-            """, unsafe_allow_html=True)
+            st.markdown(ui_templates.PROBABILITY_CARD_HTML.format(
+                confidence=st.session_state.confidence, other_classes_html=other_classes_html), unsafe_allow_html=True)
         
         # ===== DISEASE INFORMATION - REMOVED =====
         # (disease_info module not available - using Gemini AI recommendations instead)
@@ -2027,293 +1411,20 @@ def main():
         # ===== XAI =====
         st.markdown('<div class="xai-header">Analisis Explainable AI</div>', unsafe_allow_html=True)
         
-        features_key = st.session_state.features_scaled.tobytes().hex()
-        
-        # Center progress bar
-        col_empty1, col_shap_progress, col_empty2 = st.columns([1, 2, 1])
+        # SHAP dihitung di worker pool; fragment ini polling sampai hasil siap
+        # sementara bagian lain halaman (rekomendasi) langsung tampil
+        run_every = None if st.session_state.shap_job.done() else SHAP_POLL_INTERVAL
+        st.fragment(run_every=run_every)(render_xai_section)(model_package)
         
-        with col_shap_progress:
-            # Use placeholder so we can clear it
-            shap_loading_placeholder = st.empty()
-            shap_loading_placeholder.markdown("""
-            <div style='text-align: center; margin: 0.5rem 0;'>
-                <span style='font-size: 0.85rem; color: #2d5016; font-weight: 600;'>
-                    🔍 Menganalisis model...
-                </span>
-            </div>
-            """, unsafe_allow_html=True)
-            
-            shap_progress = st.progress(0)
-            shap_progress.progress(20)
-            
-            # Compute SHAP silently
-            shap_values = compute_shap_cached(model_package, features_key)
-            
-            shap_progress.progress(100)
-            
-            # Clear loading indicators
-            shap_loading_placeholder.empty()
-            shap_progress.empty()
+        # ===== GEMINI AI RECOMMENDATION =====
+        st.markdown("<div style='margin-top: 3rem;'></div>", unsafe_allow_html=True)
+        st.markdown('<div class="xai-header">💡 Rekomendasi Penanganan dari AI</div>', unsafe_allow_html=True)
         
-        if shap_values is not None:
-            col1, col2, col3 = st.columns(3, gap="medium")
-            
-            with col1:
-                st.markdown('<div class="plot-card">', unsafe_allow_html=True)
-                st.markdown('<div class="plot-title">Feature Importance</div>', unsafe_allow_html=True)
-                
-                fig1 = create_feature_importance_plot(shap_values, model_package)
-                if fig1:
-                    st.pyplot(fig1, use_container_width=True)
-                    plt.close()
-                else:
-                    st.error("❌ Error: Plot gagal dimuat. Check console untuk details.")
-                
-                st.markdown('<div class="plot-caption">Fitur paling berpengaruh pada prediksi</div>', unsafe_allow_html=True)
-                
-                # CARA BACA GRAFIK
-                pred_class = model_package['classes'][st.session_state.prediction]
-                
-                if pred_class == "Healthy":
-                    explanation = "<strong>Cara baca grafik kiri:</strong><br>✅ Bar paling panjang = fitur paling penting<br>✅ Lihat: HSV Saturation, Hue (warna hijau) ada di atas → artinya warna hijau segar yang bikin model yakin ini SEHAT<br>✅ Tidak ada fitur merah/coklat/kasar → makanya bukan penyakit!"
-                elif pred_class == "Red Rot":
-                    explanation = "<strong>Cara baca grafik kiri:</strong><br>✅ Bar paling panjang = fitur paling penting<br>✅ Lihat: Red channel, HOG (tekstur kasar) ada di atas → artinya warna merah & tekstur kasar yang bikin model yakin ini RED ROT<br>✅ Cocok dengan Red Rot yang daunya merah kecoklatan & kasar!"
-                elif pred_class == "Mosaic":
-                    explanation = "<strong>Cara baca grafik kiri:</strong><br>✅ Bar paling panjang = fitur paling penting<br>✅ Lihat: Kontras, variance, edge ada di atas → artinya pola belang-belang tidak teratur yang bikin model yakin ini MOSAIC<br>✅ Cocok dengan Mosaic yang daunnya belang-belang!"
-                elif pred_class == "Yellow":
-                    explanation = "<strong>Cara baca grafik kiri:</strong><br>✅ Bar paling panjang = fitur paling penting<br>✅ Lihat: Yellow channel, brightness ada di atas → artinya warna kuning terang yang bikin model yakin ini YELLOW<br>✅ Cocok dengan Yellow yang daunnya menguning!"
-                elif pred_class == "Rust":
-                    explanation = "<strong>Cara baca grafik kiri:</strong><br>✅ Bar paling panjang = fitur paling penting<br>✅ Lihat: HOG (tekstur kasar), warna coklat/orange ada di atas → artinya tekstur kasar & warna karat yang bikin model yakin ini RUST<br>✅ Cocok dengan Rust yang daunnya kasar & berkarat!"
-                else:
-                    explanation = "Lihat bar paling panjang - itu fitur yang paling menentukan hasil deteksi."
-                
-                st.markdown(f"""
-                <div style="background: #fff3e0; padding: 0.7rem 0.9rem; border-radius: 6px; margin-top: 0.5rem; 
-                            border-left: 3px solid #f57c00;">
-                    <p style="margin: 0; font-size: 0.8rem; color: #e65100; line-height: 1.5;">
-                        {explanation}
-                    </p>
-                </div>
-                """, unsafe_allow_html=True)
-                
-                st.session_state.pred_class = pred_class
-                
-                st.markdown('</div>', unsafe_allow_html=True)
-            
-            with col2:
-                st.markdown('<div class="plot-card">', unsafe_allow_html=True)
-                st.markdown('<div class="plot-title">Force Plot</div>', unsafe_allow_html=True)
-                
-                fig2 = create_force_plot(
-                    shap_values,
-                    st.session_state.features_scaled,
-                    st.session_state.prediction,
-                    model_package
-                )
-                if fig2:
-                    st.pyplot(fig2, use_container_width=True)
-                    plt.close()
-                else:
-                    st.error("❌ Error: Plot gagal dimuat. Check console untuk details.")
-                
-                st.markdown('<div class="plot-caption">Dampak setiap fitur pada keputusan</div>', unsafe_allow_html=True)
-                
-                # CARA BACA GRAFIK
-                pred_class = st.session_state.get('pred_class', 'Unknown')
-                
-                if pred_class == "Healthy":
-                    explanation = "<strong>Cara baca grafik tengah:</strong><br>🟦 <strong>Biru banyak</strong> = fitur-fitur menarik ke \"SEHAT\"<br>🟥 Pink sedikit = fitur penyakit lemah<br>→ Biru > Pink = Model yakin ini SEHAT, bukan penyakit!"
-                elif pred_class == "Red Rot":
-                    explanation = "<strong>Cara baca grafik tengah:</strong><br>🟥 <strong>Pink banyak</strong> = fitur-fitur mendorong ke \"RED ROT\"<br>🟦 Biru sedikit = fitur sehat kalah<br>→ Pink > Biru = Model yakin ini RED ROT!"
-                elif pred_class == "Mosaic":
-                    explanation = "<strong>Cara baca grafik tengah:</strong><br>🟥 <strong>Pink banyak</strong> = fitur-fitur mendorong ke \"MOSAIC\"<br>🟦 Biru sedikit = fitur teratur kalah<br>→ Pink > Biru = Model yakin ini MOSAIC!"
-                elif pred_class == "Yellow":
-                    explanation = "<strong>Cara baca grafik tengah:</strong><br>🟥 <strong>Pink banyak</strong> = fitur-fitur mendorong ke \"YELLOW\"<br>🟦 Biru sedikit = fitur hijau kalah<br>→ Pink > Biru = Model yakin ini YELLOW!"
-                elif pred_class == "Rust":
-                    explanation = "<strong>Cara baca grafik tengah:</strong><br>🟥 <strong>Pink banyak</strong> = fitur-fitur mendorong ke \"RUST\"<br>🟦 Biru sedikit = fitur halus kalah<br>→ Pink > Biru = Model yakin ini RUST!"
-                else:
-                    explanation = "🟥 Pink = mendorong ke hasil deteksi | 🟦 Biru = menahan dari hasil deteksi"
-                
-                st.markdown(f"""
-                <div style="background: #e3f2fd; padding: 0.7rem 0.9rem; border-radius: 6px; margin-top: 0.5rem; 
-                            border-left: 3px solid #1976d2;">
-                    <p style="margin: 0; font-size: 0.8rem; color: #0d47a1; line-height: 1.5;">
-                        {explanation}
-                    </p>
-                </div>
-                """, unsafe_allow_html=True)
-                
-                st.markdown('</div>', unsafe_allow_html=True)
-            
-            with col3:
-                st.markdown('<div class="plot-card">', unsafe_allow_html=True)
-                st.markdown('<div class="plot-title">Waterfall Plot</div>', unsafe_allow_html=True)
-                
-                fig3 = create_waterfall_plot(
-                    shap_values,
-                    st.session_state.features_scaled,
-                    st.session_state.prediction,
-                    model_package
-                )
-                if fig3:
-                    st.pyplot(fig3, use_container_width=True)
-                    plt.close()
-                else:
-                    st.error("❌ Error: Plot gagal dimuat. Check console untuk details.")
-                
-                st.markdown('<div class="plot-caption">Alur keputusan model AI</div>', unsafe_allow_html=True)
-                
-                # CARA BACA GRAFIK
-                pred_class = st.session_state.get('pred_class', 'Unknown')
-                
-                if pred_class == "Healthy":
-                    explanation = "<strong>Cara baca grafik kanan:</strong><br>• <strong>Angka KIRI</strong> (misal: 0.85) = nilai fitur di gambar kamu<br>• <strong>Angka KANAN</strong> (misal: +0.15) = seberapa besar fitur ini bikin model yakin<br>• <strong>+0.15</strong> (positif) = NAMBAH keyakinan ke SEHAT<br>→ Banyak angka + dari fitur hijau/halus = Yakin SEHAT!"
-                elif pred_class == "Red Rot":
-                    explanation = "<strong>Cara baca grafik kanan:</strong><br>• <strong>Angka KIRI</strong> (misal: -0.75) = nilai fitur di gambar kamu<br>• <strong>Angka KANAN</strong> (misal: +0.26) = seberapa besar fitur ini bikin model yakin<br>• <strong>+0.26</strong> (besar!) = NAMBAH banyak keyakinan ke RED ROT<br>→ Angka + besar dari fitur merah/kasar = Yakin RED ROT!"
-                elif pred_class == "Mosaic":
-                    explanation = "<strong>Cara baca grafik kanan:</strong><br>• <strong>Angka KIRI</strong> (misal: -0.52) = nilai fitur di gambar kamu<br>• <strong>Angka KANAN</strong> (misal: +0.18) = seberapa besar fitur ini bikin model yakin<br>• <strong>+0.18</strong> (positif) = NAMBAH keyakinan ke MOSAIC<br>→ Angka + dari fitur kontras/pola = Yakin MOSAIC!"
-                elif pred_class == "Yellow":
-                    explanation = "<strong>Cara baca grafik kanan:</strong><br>• <strong>Angka KIRI</strong> (misal: 3.24) = nilai fitur di gambar kamu<br>• <strong>Angka KANAN</strong> (misal: +0.22) = seberapa besar fitur ini bikin model yakin<br>• <strong>+0.22</strong> (besar!) = NAMBAH banyak keyakinan ke YELLOW<br>→ Angka + besar dari fitur kuning = Yakin YELLOW!"
-                elif pred_class == "Rust":
-                    explanation = "<strong>Cara baca grafik kanan:</strong><br>• <strong>Angka KIRI</strong> (misal: -0.758) = nilai fitur di gambar kamu<br>• <strong>Angka KANAN</strong> (misal: +0.26) = seberapa besar fitur ini bikin model yakin<br>• <strong>+0.26</strong> (besar!) = NAMBAH banyak keyakinan ke RUST<br>→ Angka + besar dari fitur kasar/karat = Yakin RUST!"
-                else:
-                    explanation = "Angka kiri = nilai fitur | Angka kanan (+/-) = kontribusi ke hasil"
-                
-                st.markdown(f"""
-                <div style="background: #f3e5f5; padding: 0.7rem 0.9rem; border-radius: 6px; margin-top: 0.5rem; 
-                            border-left: 3px solid #7b1fa2;">
-                    <p style="margin: 0; font-size: 0.8rem; color: #4a148c; line-height: 1.5;">
-                        {explanation}
-                    </p>
-                </div>
-                """, unsafe_allow_html=True)
-                
-                st.markdown('</div>', unsafe_allow_html=True)
-            
-            # ===== GEMINI AI RECOMMENDATION =====
-            st.markdown("<div style='margin-top: 3rem;'></div>", unsafe_allow_html=True)
-            st.markdown('<div class="xai-header">💡 Rekomendasi Penanganan dari AI</div>', unsafe_allow_html=True)
-            
-            # Show loading while getting recommendation
-            with st.spinner('🤖 Menganalisis rekomendasi penanganan...'):
-                gemini_result = get_gemini_recommendation(st.session_state.disease_name)
-            
-            # Check if successful
-            if gemini_result and gemini_result.get("success"):
-                # Check if this is rule-based or AI-generated
-                is_rule_based = gemini_result.get("is_rule_based", False)
-                info_msg = gemini_result.get("info_message", "")
-                
-                if is_rule_based:
-                    # RULE-BASED RECOMMENDATION (Fallback)
-                    # Get the HTML content
-                    html_content = gemini_result['message']
-                    
-                    st.markdown(f"""
-                    <div style="background: linear-gradient(135deg, #e8f5e9 0%, #ffffff 100%); 
-                                padding: 1.5rem 2rem; 
-                                border-radius: 16px; 
-                                border-left: 5px solid #66bb6a;
-                                box-shadow: 0 4px 12px rgba(0,0,0,0.08);
-                                margin-bottom: 2rem;">
-                        <div style="background: #fff3e0; padding: 0.8rem 1rem; border-radius: 8px; margin-bottom: 1rem; border-left: 3px solid #ffa726;">
-                            <p style="margin: 0; font-size: 0.85rem; color: #e65100; font-weight: 600;">
-                                {info_msg}
-                            </p>
-                        </div>
-                        <div class="rule-based-recommendation">{html_content}</div>
-                        <div style="margin-top: 1.5rem; padding-top: 1rem; border-top: 1px solid #c8e6c9;">
-                            <p style="margin: 0; font-size: 0.8rem; color: #558b2f; font-style: italic;">
-                                📚 <strong>Sumber:</strong> Rekomendasi ini berdasarkan pengetahuan umum penanganan penyakit tebu. 
-                                Untuk penanganan spesifik sesuai kondisi lahan Anda, konsultasikan dengan penyuluh pertanian setempat.
-                            </p>
-                        </div>
-                    </div>
-                    """, unsafe_allow_html=True)
-                else:
-                    # AI-GENERATED RECOMMENDATION (Gemini)
-                    st.markdown(f"""
-                    <div style="background: linear-gradient(135deg, #fff8e1 0%, #ffffff 100%); 
-                                padding: 1.5rem 2rem; 
-                                border-radius: 16px; 
-                                border-left: 5px solid #ffa726;
-                                box-shadow: 0 4px 12px rgba(0,0,0,0.08);
-                                margin-bottom: 2rem;">
-                        <div class="gemini-recommendation" style="color: #e65100; font-size: 0.9rem; line-height: 1.8;">
-                            {gemini_result['message']}
-                        </div>
-                        <div style="margin-top: 1.5rem; padding-top: 1rem; border-top: 1px solid #ffe0b2;">
-                            <p style="margin: 0; font-size: 0.8rem; color: #f57c00; font-style: italic;">
-                                🤖 <strong>Sumber:</strong> Rekomendasi dari Gemini AI. 
-                                Untuk penanganan spesifik, konsultasikan dengan penyuluh pertanian setempat.
-                            </p>
-                        </div>
-                    </div>
-                    """, unsafe_allow_html=True)
-            
-            elif gemini_result and not gemini_result.get("success"):
-                # ERROR - Show specific error message based on type
-                error_type = gemini_result.get("error_type", "unknown")
-                error_message = gemini_result.get("message", "Terjadi kesalahan.")
-                
-                # Different colors for different error types
-                if error_type == "no_internet":
-                    bg_color = "#e3f2fd"  # Blue for network issues
-                    border_color = "#2196f3"
-                    icon = "📡"
-                elif error_type == "quota_exceeded":
-                    bg_color = "#fff3e0"  # Orange for quota
-                    border_color = "#ff9800"
-                    icon = "⏰"
-                elif error_type in ["no_api_key", "invalid_key"]:
-                    bg_color = "#fce4ec"  # Pink for config issues
-                    border_color = "#e91e63"
-                    icon = "🔑"
-                elif error_type == "server_error":
-                    bg_color = "#f3e5f5"  # Purple for server issues
-                    border_color = "#9c27b0"
-                    icon = "🔧"
-                else:
-                    bg_color = "#ffebee"  # Red for unknown
-                    border_color = "#f44336"
-                    icon = "❌"
-                
-                st.markdown(f"""
-                <div style="background: {bg_color}; 
-                            padding: 1.5rem 2rem; 
-                            border-radius: 16px; 
-                            border-left: 5px solid {border_color};
-                            box-shadow: 0 4px 12px rgba(0,0,0,0.08);
-                            margin-bottom: 2rem;">
-                    <div style="font-size: 0.95rem; line-height: 1.8; color: #333;">
-                        {error_message}
-                    </div>
-                    <div style="margin-top: 1.5rem; padding-top: 1rem; border-top: 1px solid rgba(0,0,0,0.1);">
-                        <p style="margin: 0; font-size: 0.85rem; color: #666; font-weight: 600;">
-                            💬 <strong>Alternatif:</strong> Hasil deteksi penyakit di atas tetap akurat. 
-                            Silakan konsultasi dengan penyuluh pertanian setempat untuk mendapatkan rekomendasi penanganan.
-                        </p>
-                    </div>
-                </div>
-                """, unsafe_allow_html=True)
-            
-            else:
-                # FALLBACK - No result at all
-                st.markdown("""
-                <div style="background: #fff3e0; padding: 1.5rem 2rem; border-radius: 16px; 
-                            border-left: 5px solid #ff9800; margin-bottom: 2rem;
-                            box-shadow: 0 4px 12px rgba(0,0,0,0.08);">
-                    <p style="margin: 0; color: #e65100; font-size: 0.95rem; line-height: 1.8;">
-                        ℹ️ <strong>Rekomendasi AI tidak tersedia saat ini</strong><br><br>
-                        Sistem tidak dapat memberikan rekomendasi otomatis. Namun hasil deteksi penyakit tetap akurat dan dapat dipercaya.<br><br>
-                        <strong>Langkah selanjutnya:</strong><br>
-                        • Catat nama penyakit yang terdeteksi<br>
-                        • Hubungi penyuluh pertanian terdekat<br>
-                        • Tunjukkan hasil deteksi ini untuk konsultasi lebih lanjut
-                    </p>
-                </div>
-                """, unsafe_allow_html=True)
-    
+        # Fetch berjalan di background sejak analisis dimulai (bersamaan dengan SHAP)
+        job = st.session_state.recommendation_job
+        run_every = None if job.done() or job.expired() else SHAP_POLL_INTERVAL
+        st.fragment(run_every=run_every)(render_recommendation_section)()
+
     # # ===== FOOTER =====
     # st.markdown("""
     # <div class="footer">
@@ -2323,12 +1434,7 @@ def main():
     # """, unsafe_allow_html=True)
     
     # ===== FLOATING TUTORIAL BUTTON =====
-    st.markdown("""
-    <a href="/Tutorial" target="_self" class="tutorial-floating-btn">
-        <span class="icon">📚</span>
-        <span>Tutorial</span>
-    </a>
-    """, unsafe_allow_html=True)
+    st.markdown(ui_templates.TUTORIAL_BUTTON_HTML, unsafe_allow_html=True)
 
 
 if __name__ == "__main__":
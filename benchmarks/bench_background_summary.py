@@ -0,0 +1,108 @@
+"""
+Benchmark trade-off ringkasan background SHAP: kecepatan vs fidelity
+
+Jalankan dari root project:
+    python benchmarks/bench_background_summary.py [--backend grouped] [--k 5 10 20 50]
+
+Untuk setiap k, explainer dibuat dengan background ringkasan lalu
+dibandingkan dengan explainer yang memakai seluruh X_background:
+waktu per gambar, jumlah baris yang dievaluasi model per gambar, korelasi
+nilai SHAP kelas terprediksi, dan selisih maksimum expected value.
+
+--compare kernel menambahkan baris referensi biaya backend lain dengan
+background penuh (mis. jumlah evaluasi 'grouped' vs 'kernel').
+"""
+
+import argparse
+import sys
+import time
+import warnings
+from pathlib import Path
+
+import joblib
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from xai import create_explainer, summarize_background, SUMMARY_METHODS
+
+
+class CountingPredict:
+    """Bungkus predict_proba dan hitung jumlah baris yang dievaluasi"""
+
+    def __init__(self, predict_fn):
+        self.predict_fn = predict_fn
+        self.rows = 0
+
+    def __call__(self, X):
+        self.rows += len(X)
+        return self.predict_fn(X)
+
+
+def explain_all(explainer, predict, samples):
+    """(nilai SHAP, detik per gambar, baris dievaluasi per gambar)"""
+    predict.rows = 0
+    start = time.perf_counter()
+    values = np.concatenate([explainer.shap_values(x[np.newaxis]) for x in samples], axis=1)
+    return values, (time.perf_counter() - start) / len(samples), predict.rows / len(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--model', default='sugarcane_disease_classifier_full.pkl')
+    parser.add_argument('--backend', default='grouped')
+    parser.add_argument('--method', default='kmeans', choices=SUMMARY_METHODS)
+    parser.add_argument('--k', type=int, nargs='+', default=[5, 10, 20, 50])
+    parser.add_argument('--compare', nargs='*', default=['kernel'],
+                        help="Backend pembanding biaya (background penuh)")
+    parser.add_argument('--samples', type=int, default=5,
+                        help="Jumlah baris background yang dijelaskan")
+    args = parser.parse_args()
+    warnings.filterwarnings('ignore')
+
+    model_package = joblib.load(args.model)
+    model = model_package['model']
+    background = np.asarray(model_package['X_background'], dtype=np.float64)
+    n_classes = len(model_package['classes'])
+
+    rng = np.random.default_rng(0)
+    samples = background[rng.choice(len(background), min(args.samples, len(background)),
+                                    replace=False)]
+    predicted = model.predict_proba(samples).argmax(axis=1)
+
+    predict = CountingPredict(model.predict_proba)
+    for backend in args.compare:
+        if backend == args.backend:
+            continue
+        explainer = create_explainer(backend, predict, background, n_classes)
+        _, elapsed, rows = explain_all(explainer, predict, samples)
+        print(f"Backend {backend}, background penuh {len(background)} baris: "
+              f"{elapsed * 1000:.1f} ms / gambar, {rows:.0f} baris dievaluasi / gambar")
+
+    reference = create_explainer(args.backend, predict, background, n_classes)
+    ref_values, ref_time, ref_rows = explain_all(reference, predict, samples)
+    print(f"Backend {args.backend}, background penuh {len(background)} baris: "
+          f"{ref_time * 1000:.1f} ms / gambar, {ref_rows:.0f} baris dievaluasi / gambar\n")
+
+    print(f"{'k':>5} {'ms/gambar':>10} {'speedup':>8} {'baris':>7} {'korelasi':>9} "
+          f"{'|ΔE[f]| maks':>13}")
+    for k in args.k:
+        if k >= len(background):
+            continue
+        data, weights = summarize_background(background, k, args.method)
+        explainer = create_explainer(args.backend, predict, data, n_classes,
+                                     background_weights=weights)
+        values, elapsed, rows = explain_all(explainer, predict, samples)
+
+        corr = np.mean([
+            np.corrcoef(values[c, s], ref_values[c, s])[0, 1]
+            for s, c in enumerate(predicted)
+        ])
+        delta_expected = np.max(np.abs(np.asarray(explainer.expected_value)
+                                       - np.asarray(reference.expected_value)))
+        print(f"{k:>5} {elapsed * 1000:>10.1f} {ref_time / elapsed:>7.1f}x {rows:>7.0f} "
+              f"{corr:>9.3f} {delta_expected:>13.4f}")
+
+
+if __name__ == "__main__":
+    main()
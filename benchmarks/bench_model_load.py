@@ -0,0 +1,92 @@
+"""
+Benchmark cold start load model: .pkl biasa vs artifact mmap
+
+Jalankan dari root project (export artifact dulu dengan model_store.py):
+    python benchmarks/bench_model_load.py [--model sugarcane_disease_classifier_full.pkl]
+
+Setiap mode diukur di proses Python baru (cold start): waktu load +
+satu prediksi, RSS, dan memori anonim/heap (tidak bisa dibagi antar
+proses; halaman file mmap tidak termasuk). Kolom terakhir adalah heap
+tambahan untuk FusedSVMPipeline (engine numpy): dibangun per proses dari
+.pkl, dipakai langsung dari artifact mmap. Memori dibaca dari
+/proc/self/smaps_rollup, khusus Linux.
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+CHILD = r"""
+import json, sys, time
+sys.path.insert(0, {root!r})
+import numpy as np
+import sklearn.preprocessing, sklearn.svm  # import library tidak ikut diukur
+from model_store import fused_pipeline, load_model_package
+
+def memory_kb():
+    result = {{}}
+    try:
+        with open('/proc/self/smaps_rollup') as f:
+            for line in f:
+                name, value = line.split(':', 1)
+                if name in ('Rss', 'Anonymous'):
+                    result[name] = int(value.split()[0])
+    except OSError:
+        pass
+    return result
+
+before = memory_kb()
+start = time.perf_counter()
+model_package = load_model_package({model!r}, mmap={mmap!r})
+loaded = time.perf_counter() - start
+x = np.asarray(model_package['X_background'][:1], dtype=np.float64)
+model_package['model'].predict_proba(model_package['scaler'].transform(x))
+total = time.perf_counter() - start
+after = memory_kb()
+pipeline = fused_pipeline(model_package)
+pipeline.predict_proba(x)
+with_pipeline = memory_kb()
+print(json.dumps({{
+    'load': loaded, 'total': total,
+    'rss': after.get('Rss', 0) - before.get('Rss', 0),
+    'heap': after.get('Anonymous', 0) - before.get('Anonymous', 0),
+    'pipeline_heap': with_pipeline.get('Anonymous', 0) - after.get('Anonymous', 0),
+}}))
+"""
+
+
+def measure(model, mmap, repeat):
+    runs = []
+    for _ in range(repeat):
+        code = CHILD.format(root=str(ROOT), model=model, mmap=mmap)
+        output = subprocess.run([sys.executable, '-c', code], check=True,
+                                capture_output=True, text=True).stdout
+        runs.append(json.loads(output.strip().splitlines()[-1]))
+    return {key: min(run[key] for run in runs) for key in runs[0]}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--model', default='sugarcane_disease_classifier_full.pkl')
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    from model_store import mmap_artifact_path
+    if not mmap_artifact_path(args.model).exists():
+        sys.exit(f"❌ Artifact mmap belum ada, jalankan: python model_store.py {args.model}")
+
+    print(f"{'mode':>6} {'load (ms)':>10} {'load+predict':>13} {'RSS (MB)':>9} {'heap (MB)':>10} "
+          f"{'+pipeline heap (MB)':>20}")
+    for label, mmap in (('pkl', False), ('mmap', True)):
+        r = measure(args.model, mmap, args.repeat)
+        print(f"{label:>6} {r['load'] * 1000:>10.1f} {r['total'] * 1000:>13.1f} "
+              f"{r['rss'] / 1024:>9.1f} {r['heap'] / 1024:>10.1f} {r['pipeline_heap'] / 1024:>20.1f}")
+
+
+if __name__ == "__main__":
+    sys.path.insert(0, str(ROOT))
+    main()
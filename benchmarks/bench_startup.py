@@ -0,0 +1,94 @@
+"""
+Benchmark cold start aplikasi: rincian waktu import per package
+
+Jalankan dari folder yang berisi file model:
+    python benchmarks/bench_startup.py
+
+Tahap 1 mengukur "import app + load_model()" (jalur klasifikasi) di proses
+baru dengan `python -X importtime`. Hasilnya waktu total, package
+termahal, dan cek bahwa dependency XAI/LLM belum ikut ter-import.
+Tahap 2 mengukur biaya import dependency yang ditunda (dibayar saat
+pertama dipakai), masing-masing di proses baru.
+"""
+
+import argparse
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+DEFERRED = ['shap', 'matplotlib', 'google.generativeai', 'sklearn.cluster']
+
+STARTUP = r"""
+import sys, time, warnings, logging
+warnings.filterwarnings('ignore')
+logging.disable(logging.WARNING)
+sys.path.insert(0, {root!r})
+start = time.perf_counter()
+import app
+imported = time.perf_counter()
+app.load_model()
+loaded = time.perf_counter()
+print('TIMING', imported - start, loaded - imported)
+print('LOADED', ','.join(m for m in {deferred!r} if m in sys.modules))
+"""
+
+
+def parse_importtime(stderr):
+    """Jumlahkan waktu self (us) per package top-level dari output -X importtime"""
+    totals = defaultdict(int)
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, _, name = line[len('import time:'):].split('|')
+        totals[name.strip().split('.')[0]] += int(self_us)
+    return totals
+
+
+def time_import(module):
+    code = f"import time; s = time.perf_counter(); import {module}; print(time.perf_counter() - s)"
+    result = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True)
+    if result.returncode != 0:
+        return None
+    return float(result.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--top', type=int, default=10, help="Jumlah package yang ditampilkan")
+    args = parser.parse_args()
+
+    code = STARTUP.format(root=str(ROOT), deferred=DEFERRED)
+    start = time.perf_counter()
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', code],
+                            capture_output=True, text=True)
+    wall = time.perf_counter() - start
+    if result.returncode != 0:
+        sys.exit(result.stderr[-2000:])
+
+    lines = dict(line.split(' ', 1) for line in result.stdout.splitlines()
+                 if line.startswith(('TIMING', 'LOADED')))
+    import_s, load_s = map(float, lines['TIMING'].split())
+
+    print(f"🚀 Cold start jalur klasifikasi (proses baru, {wall:.2f} detik total)")
+    print(f"   import app   : {import_s * 1000:8.1f} ms")
+    print(f"   load_model() : {load_s * 1000:8.1f} ms")
+    print(f"   dependency tertunda yang sudah ter-import: {lines['LOADED'].strip() or '-'}\n")
+
+    totals = parse_importtime(result.stderr)
+    print(f"{'package':<24} {'import (ms)':>12}")
+    for name, us in sorted(totals.items(), key=lambda kv: -kv[1])[:args.top]:
+        print(f"{name:<24} {us / 1000:>12.1f}")
+
+    print(f"\n{'ditunda sampai dipakai':<24} {'import (ms)':>12}")
+    for module in DEFERRED:
+        elapsed = time_import(module)
+        shown = f"{elapsed * 1000:>12.1f}" if elapsed is not None else f"{'tidak ada':>12}"
+        print(f"{module:<24} {shown}")
+
+
+if __name__ == "__main__":
+    main()
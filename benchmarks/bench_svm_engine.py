@@ -0,0 +1,109 @@
+"""
+Benchmark & verifikasi engine prediksi NumPy vs sklearn
+
+Jalankan dari root project:
+    python benchmarks/bench_svm_engine.py [--data fitur_test.npy --labels label_test.npy]
+
+--data: array fitur held-out (n, 1003) yang BELUM di-scale (hasil
+extract_features). Tanpa --data dipakai X_background dari file model
+plus versi yang diberi noise. --labels (opsional) menambah akurasi
+per engine, untuk melihat dampak float32.
+
+Yang dibandingkan:
+    sklearn          scaler.transform + SVC.predict_proba
+    engine           scaler.transform + SVMEngine.predict_proba
+    fused float64    FusedSVMPipeline (scaler dilipat ke SVM)
+    fused float32    idem, kernel dihitung dalam float32
+"""
+
+import argparse
+import sys
+import time
+import warnings
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from inference import predict_labels
+from model_store import load_model_package
+from svm_engine import FusedSVMPipeline, SVMEngine, verify_against_sklearn
+
+
+def best_time(fn, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--model', default='sugarcane_disease_classifier_full.pkl')
+    parser.add_argument('--data', help="File .npy fitur held-out (belum di-scale)")
+    parser.add_argument('--labels', help="File .npy index kelas untuk --data")
+    parser.add_argument('--repeat', type=int, default=50)
+    args = parser.parse_args()
+    warnings.filterwarnings('ignore')
+
+    model_package = load_model_package(args.model)
+    model, scaler = model_package['model'], model_package['scaler']
+    if args.data:
+        X_raw = np.load(args.data)
+    else:
+        background = np.asarray(model_package['X_background'], dtype=np.float64)
+        rng = np.random.default_rng(0)
+        noisy = background + rng.normal(scale=0.5, size=background.shape)
+        X_raw = scaler.inverse_transform(np.concatenate([background, noisy]))
+    labels = np.load(args.labels) if args.labels else None
+
+    engine = SVMEngine.from_sklearn(model)
+    predictors = {
+        'sklearn': lambda X: model.predict_proba(scaler.transform(X)),
+        'engine': lambda X: engine.predict_proba(scaler.transform(X)),
+    }
+    fused = {}
+    for dtype in (np.float64, np.float32):
+        name = f'fused {np.dtype(dtype).name}'
+        fused[name] = FusedSVMPipeline.from_sklearn(model, scaler, dtype=dtype)
+        predictors[name] = fused[name].predict_proba
+
+    print(f"Model: kernel {model.kernel}, {len(model.support_vectors_)} support vectors, "
+          f"{len(model.classes_)} kelas, {len(X_raw)} sampel uji")
+
+    print("\n🔎 Verifikasi terhadap sklearn:")
+    reports = {'engine': verify_against_sklearn(engine, model, scaler.transform(X_raw))}
+    reports.update({name: verify_against_sklearn(pipeline, model, X_raw, scaler=scaler)
+                    for name, pipeline in fused.items()})
+    print(f"{'':<15} {'|Δproba| maks':>14} {'|Δdecision| maks':>17} {'prediksi sama':>14}")
+    for name, report in reports.items():
+        print(f"{name:<15} {report['proba_max_abs_diff']:>14.2e} "
+              f"{report['decision_max_abs_diff']:>17.2e} {report['predict_agreement']:>14.1%}")
+
+    if labels is not None:
+        # Label dari vote one-vs-one, sama dengan yang ditampilkan aplikasi
+        classifiers = {'sklearn': (model, scaler.transform), 'engine': (engine, scaler.transform)}
+        classifiers.update({name: (pipeline, None) for name, pipeline in fused.items()})
+        print("\n🎯 Akurasi (label vote one-vs-one):")
+        for name, (classifier, transform) in classifiers.items():
+            X = transform(X_raw) if transform else X_raw
+            accuracy = np.mean(predict_labels(classifier, X) == labels)
+            print(f"   {name:<15} {accuracy:.4f}")
+
+    single = X_raw[:1]
+    batch = X_raw[:min(len(X_raw), 256)]
+    print(f"\n{'':<15} {'1 vektor (ms)':>14} {f'batch {len(batch)} (ms)':>16} {'speedup batch':>14}")
+    baseline = None
+    for name, predict_proba in predictors.items():
+        t_single = best_time(lambda: predict_proba(single), args.repeat)
+        t_batch = best_time(lambda: predict_proba(batch), max(1, args.repeat // 5))
+        baseline = baseline or t_batch
+        print(f"{name:<15} {t_single * 1000:>14.3f} {t_batch * 1000:>16.3f} "
+              f"{baseline / t_batch:>13.1f}x")
+
+
+if __name__ == "__main__":
+    main()
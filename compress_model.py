@@ -0,0 +1,208 @@
+"""
+Kompresi Model SVM (offline)
+
+Biaya prediksi SVM RBF sebanding dengan jumlah support vector, dan biaya
+itu dibayar di setiap request serta setiap evaluasi SHAP. Tool ini
+membuat aproksimasi SVC yang lebih kecil:
+
+    reduced  reduced-set: m titik pusat (k-means dari support vector)
+             dengan koefisien hasil proyeksi least-squares di RKHS
+    rff      random Fourier features: fungsi keputusan RBF menjadi model
+             linear eksplisit atas D fitur cos(x . w + b)
+
+Intercept dan Platt scaling (probA/probB) dipakai ulang dari model asli.
+Laporan kesepakatan dengan model asli (per kelas) dicetak dan ikut
+disimpan di artifact. Kesepakatan dihitung dari label yang sama dengan
+yang dilihat pengguna (vote one-vs-one, inference.predict_labels), bukan
+argmax probabilitas.
+
+Contoh:
+    python compress_model.py --method reduced --size 200
+    python compress_model.py --method rff --size 2000 --data fitur_test.npy
+
+Pakai di aplikasi dengan setting SVM_ENGINE = "compressed".
+"""
+
+import argparse
+import sys
+import time
+import warnings
+from pathlib import Path
+
+import joblib
+import numpy as np
+
+from inference import predict_labels
+from model_store import load_model_package
+from result_cache import file_digest
+from svm_engine import SVMEngine
+
+MODEL_PATH = 'sugarcane_disease_classifier_full.pkl'
+COMPRESSED_SUFFIX = '.compressed.joblib'
+METHODS = ('reduced', 'rff')
+
+# Aturan label di laporan kesepakatan; laporan dengan aturan lain (artifact
+# lama: argmax probabilitas) tidak dipercaya oleh aplikasi
+AGREEMENT_LABEL_RULE = 'ovo-vote'
+
+
+def compressed_model_path(model_path):
+    """Path artifact model terkompresi untuk file model .pkl"""
+    return Path(model_path).with_suffix(COMPRESSED_SUFFIX)
+
+
+def reduce_support_vectors(engine, size, random_state=0, ridge=1e-8):
+    """
+    Reduced-set: ganti SV dengan `size` pusat k-means
+
+    Koefisien baru beta meminimalkan jarak RKHS antara fungsi keputusan
+    lama dan baru untuk setiap pasangan kelas:
+        K(Z, Z) beta = K(Z, SV) alpha
+    """
+    from sklearn.cluster import KMeans
+
+    support_vectors = np.asarray(engine.support_vectors, dtype=np.float64)
+    if size >= len(support_vectors):
+        raise ValueError(f"size ({size}) harus lebih kecil dari jumlah SV ({len(support_vectors)})")
+
+    centers = KMeans(n_clusters=size, n_init=3, random_state=random_state) \
+        .fit(support_vectors).cluster_centers_
+    reduced = engine.with_support_vectors(centers, np.zeros((size, len(engine.pairs))))
+
+    K_zz = reduced.kernel_matrix(centers)
+    K_zs = engine.kernel_matrix(centers)
+    K_zz[np.diag_indices(size)] += ridge * np.trace(K_zz) / size
+    beta = np.linalg.solve(K_zz, K_zs @ engine.pair_coef)
+    return engine.with_support_vectors(centers, beta)
+
+
+def random_fourier_features(engine, size, random_state=0):
+    """
+    RFF: k(x, y) = exp(-gamma ||x - y||^2) ~ z(x) . z(y) dengan
+    z(x) = sqrt(2/D) cos(W x + b), W ~ N(0, 2 gamma I), b ~ U(0, 2 pi)
+
+    Fungsi keputusan sum alpha_i k(x, sv_i) menjadi z(x) . (Z_sv^T alpha).
+    """
+    if engine.kernel != 'rbf':
+        raise ValueError("Metode rff hanya untuk kernel rbf")
+
+    rng = np.random.default_rng(random_state)
+    n_features = engine.support_vectors.shape[1]
+    frequencies = rng.normal(scale=np.sqrt(2 * engine.gamma), size=(size, n_features))
+    offset = rng.uniform(0, 2 * np.pi, size=size)
+
+    rff = engine.with_support_vectors(frequencies, np.zeros((size, len(engine.pairs))),
+                                      kernel='rff', rff_offset=offset)
+    Z_sv = rff.kernel_matrix(engine.support_vectors)
+    return engine.with_support_vectors(frequencies, Z_sv.T @ engine.pair_coef,
+                                       kernel='rff', rff_offset=offset)
+
+
+def agreement_report(original, compressed, X, class_names):
+    """
+    Kesepakatan model terkompresi dengan model asli pada X (ter-scale)
+
+    Returns:
+        dict: agreement total, selisih probabilitas, dan per kelas (jumlah
+        sampel yang diprediksi kelas itu oleh model asli + fraksi yang sama)
+    """
+    proba_original = original.predict_proba(X)
+    proba_compressed = compressed.predict_proba(X)
+    # Index kelas dari label vote one-vs-one (sama dengan aplikasi & score_images.py)
+    pred_original = np.searchsorted(original.classes_, predict_labels(original, X))
+    pred_compressed = np.searchsorted(original.classes_, predict_labels(compressed, X))
+    diff = np.abs(proba_compressed - proba_original)
+
+    per_class = {}
+    for c, name in enumerate(class_names):
+        mask = pred_original == c
+        per_class[name] = {
+            'n': int(mask.sum()),
+            'agreement': float(np.mean(pred_compressed[mask] == c)) if mask.any() else None,
+        }
+    return {
+        'n_samples': len(X),
+        'label_rule': AGREEMENT_LABEL_RULE,
+        'agreement': float(np.mean(pred_original == pred_compressed)),
+        'proba_max_abs_diff': float(diff.max()),
+        'proba_mean_abs_diff': float(diff.mean()),
+        'per_class': per_class,
+    }
+
+
+def save_compressed_model(path, engine, method, source_digest, report):
+    joblib.dump({
+        'engine': engine,
+        'method': method,
+        'source_digest': source_digest,
+        'report': report,
+    }, path)
+
+
+def load_compressed_model(path):
+    """Dict artifact: engine (SVMEngine, ruang ter-scale), method, source_digest, report"""
+    return joblib.load(path)
+
+
+def _per_sample_time(engine, X, repeat=20):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        engine.predict_proba(X)
+        times.append(time.perf_counter() - start)
+    return min(times) / len(X)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Kompresi SVM: reduced-set atau RFF")
+    parser.add_argument('-m', '--model', default=MODEL_PATH, help="Path file model .pkl")
+    parser.add_argument('--method', choices=METHODS, default='reduced')
+    parser.add_argument('--size', type=int, required=True,
+                        help="Jumlah SV baru (reduced) atau dimensi fitur (rff)")
+    parser.add_argument('--data', help="File .npy fitur evaluasi (belum di-scale); "
+                                       "default X_background + noise")
+    parser.add_argument('--random-state', type=int, default=0)
+    parser.add_argument('-o', '--output', help=f"Path output (default: <model>{COMPRESSED_SUFFIX})")
+    args = parser.parse_args(argv)
+    warnings.filterwarnings('ignore')
+
+    model_package = load_model_package(args.model)
+    scaler = model_package['scaler']
+    original = SVMEngine.from_sklearn(model_package['model'])
+
+    if args.data:
+        X = scaler.transform(np.load(args.data))
+    else:
+        background = np.asarray(model_package['X_background'], dtype=np.float64)
+        rng = np.random.default_rng(args.random_state)
+        X = np.concatenate([background, background + rng.normal(scale=0.5, size=background.shape)])
+
+    start = time.perf_counter()
+    if args.method == 'reduced':
+        compressed = reduce_support_vectors(original, args.size, args.random_state)
+    else:
+        compressed = random_fourier_features(original, args.size, args.random_state)
+    print(f"🗜️  {args.method}: {len(original.support_vectors)} SV -> {args.size} "
+          f"({time.perf_counter() - start:.1f} detik)")
+
+    report = agreement_report(original, compressed, X, list(model_package['classes']))
+    speedup = _per_sample_time(original, X) / _per_sample_time(compressed, X)
+
+    print(f"\n📋 Kesepakatan dengan model asli ({report['n_samples']} sampel):")
+    print(f"   {'kelas':<14} {'n':>5} {'sama':>8}")
+    for name, row in report['per_class'].items():
+        shown = f"{row['agreement']:.1%}" if row['agreement'] is not None else '-'
+        print(f"   {name:<14} {row['n']:>5} {shown:>8}")
+    print(f"   {'TOTAL':<14} {report['n_samples']:>5} {report['agreement']:>8.1%}")
+    print(f"   |Δproba| maks {report['proba_max_abs_diff']:.4f}, "
+          f"rata-rata {report['proba_mean_abs_diff']:.4f}")
+    print(f"   Kecepatan prediksi: {speedup:.1f}x")
+
+    output = Path(args.output or compressed_model_path(args.model))
+    save_compressed_model(output, compressed, args.method, file_digest(args.model), report)
+    print(f"\n✅ Disimpan ke {output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
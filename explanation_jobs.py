@@ -0,0 +1,80 @@
+"""
+Worker Pool untuk Perhitungan Penjelasan SHAP di Background
+
+Script Streamlit tidak lagi menunggu explainer selesai: pekerjaan dikirim
+ke thread pool yang dipakai bersama semua sesi, sesi menyimpan handle
+(ExplanationJob) di session_state, lalu UI membaca progress/hasilnya.
+
+Gambar yang sama dari beberapa sesi sekaligus hanya dihitung sekali
+(job dengan key yang sama dipakai ulang selama masih berjalan).
+"""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+
+class ExplanationJob:
+    """Handle satu perhitungan penjelasan yang berjalan di worker pool"""
+
+    def __init__(self, key):
+        self.key = key
+        self.future = None
+        self._progress = 0.0
+
+    def report(self, fraction):
+        """Callback progress dari explainer (fraksi 0..1, tidak pernah mundur)"""
+        self._progress = max(self._progress, min(float(fraction), 1.0))
+
+    @property
+    def progress(self):
+        return 1.0 if self.done() else self._progress
+
+    def done(self):
+        return self.future.done()
+
+    def result(self):
+        """Hasil explainer; exception dari worker dilempar ulang di sini"""
+        return self.future.result()
+
+
+class ExplanationWorkerPool:
+    """
+    Thread pool bersama untuk explainer
+
+    Thread (bukan proses) dipakai agar model dan explainer tidak perlu
+    di-pickle ulang; bagian berat (NumPy, libsvm) melepas GIL.
+
+    Args:
+        max_workers: jumlah perhitungan yang boleh berjalan bersamaan
+    """
+
+    def __init__(self, max_workers=2):
+        self._executor = ThreadPoolExecutor(max_workers=max_workers,
+                                            thread_name_prefix='explainer')
+        self._jobs = {}
+        self._lock = threading.Lock()
+
+    def submit(self, key, fn, *args, **kwargs):
+        """
+        Jalankan fn(*args, progress=job.report, **kwargs) di background
+
+        Jika job dengan key yang sama masih berjalan, job itu yang dikembalikan.
+        """
+        with self._lock:
+            job = self._jobs.get(key)
+            if job is not None:
+                return job
+            job = ExplanationJob(key)
+            job.future = self._executor.submit(fn, *args, progress=job.report, **kwargs)
+            self._jobs[key] = job
+        job.future.add_done_callback(lambda _: self._forget(key))
+        return job
+
+    def _forget(self, key):
+        with self._lock:
+            self._jobs.pop(key, None)
+
+    def pending(self):
+        """Jumlah job yang sedang antre/berjalan"""
+        with self._lock:
+            return len(self._jobs)
@@ -6,21 +6,126 @@ Menggunakan pipeline yang sama dengan training notebook
 import numpy as np
 import cv2
 
+# Offset (dx, dy) GLCM: Horizontal, Diagonal /, Vertikal, Diagonal \
+GLCM_OFFSETS = [(1, 0), (1, 1), (0, 1), (-1, 1)]
+GLCM_LEVELS = 8
 
-def extract_features(img):
+_glcm_i, _glcm_j = np.indices((GLCM_LEVELS, GLCM_LEVELS))
+_GLCM_CONTRAST_W = ((_glcm_i - _glcm_j) ** 2).ravel()
+_GLCM_HOMOGENEITY_D = (1 + np.abs(_glcm_i - _glcm_j)).ravel()
+_GLCM_CORRELATION_W = (_glcm_i * _glcm_j).ravel()
+
+
+def glcm_features(gray_q):
     """
-    Ekstraksi fitur dari gambar daun tebu
+    Fitur tekstur GLCM (contrast, homogeneity, energy, correlation, entropy)
+    untuk 4 arah, versi vektor dari loop per-piksel di training notebook.
+    
+    Pasangan piksel dihitung dari interior gambar (border 1 piksel dilewati,
+    sama seperti loop aslinya) lalu di-histogram dengan np.bincount.
+    Penjumlahan akhir memakai cumsum (urutan sekuensial i, j) supaya
+    hasilnya bit-identik dengan sum() Python di versi lama.
     
     Args:
-        img: numpy array gambar (BGR format dari cv2)
+        gray_q: gambar grayscale terkuantisasi ke 0..7 (uint8)
     
     Returns:
-        numpy array dengan ~1003 fitur
+        list 20 nilai float (5 fitur x 4 arah)
+    """
+    h, w = gray_q.shape
+    center = gray_q[1:h-1, 1:w-1].astype(np.intp) * GLCM_LEVELS
+    
+    glcms = np.empty((len(GLCM_OFFSETS), GLCM_LEVELS * GLCM_LEVELS))
+    for k, (dx, dy) in enumerate(GLCM_OFFSETS):
+        neighbor = gray_q[1+dy:h-1+dy, 1+dx:w-1+dx]
+        counts = np.bincount((center + neighbor).ravel(),
+                             minlength=GLCM_LEVELS * GLCM_LEVELS)
+        glcms[k] = counts / (counts.sum() + 1e-7)
+    
+    terms = np.stack([
+        _GLCM_CONTRAST_W * glcms,
+        glcms / _GLCM_HOMOGENEITY_D,
+        glcms ** 2,
+        _GLCM_CORRELATION_W * glcms,
+        glcms * np.log(glcms + 1e-7),
+    ], axis=1)
+    totals = np.cumsum(terms, axis=2)[:, :, -1]
+    totals[:, 4] = -totals[:, 4]
+    
+    return totals.ravel().tolist()
+
+# Tetangga LBP (di, dj) dengan bobot bit 7..0, searah jarum jam dari kiri atas
+LBP_NEIGHBORS = [(-1, -1), (-1, 0), (-1, 1), (0, 1),
+                 (1, 1), (1, 0), (1, -1), (0, -1)]
+
+
+def lbp_image(gray):
+    """
+    Kode LBP 8-tetangga untuk setiap piksel interior, versi slicing array
+    dari loop per-piksel di training notebook.
+    
+    Border 1 piksel tetap bernilai 0 seperti versi loop.
+    
+    Args:
+        gray: gambar grayscale (uint8)
+    
+    Returns:
+        numpy array uint8 dengan ukuran sama seperti gray
     """
-    fv = []
+    h, w = gray.shape
+    center = gray[1:h-1, 1:w-1]
+    code = np.zeros(center.shape, dtype=np.uint8)
+    for bit, (di, dj) in zip(range(7, -1, -1), LBP_NEIGHBORS):
+        neighbor = gray[1+di:h-1+di, 1+dj:w-1+dj]
+        code |= (neighbor >= center).astype(np.uint8) << bit
+    
+    lbp = np.zeros_like(gray, dtype=np.uint8)
+    lbp[1:h-1, 1:w-1] = code
+    return lbp
+
+
+# Jumlah fitur: 384 histogram + 72 statistik + 20 GLCM + 32 LBP
+# + 48 Gabor + 441 HOG + 6 edge
+N_FEATURES = 1003
+
+# Ukuran gambar (w, h) sebelum ekstraksi, sama dengan training notebook
+IMAGE_SIZE = (256, 256)
+
+# Parameter Gabor & HOG (sama dengan training notebook)
+GABOR_KSIZE = (21, 21)
+GABOR_THETAS = np.arange(0, np.pi, np.pi/8)
+GABOR_SIGMAS = [3, 5, 7]
+HOG_WIN_SIZE = (64, 64)
+HOG_BLOCK_SIZE = (16, 16)
+HOG_BLOCK_STRIDE = (8, 8)
+HOG_CELL_SIZE = (8, 8)
+HOG_NBINS = 9
+
+# Toleransi relatif jalur Gabor FFT terhadap cv2.filter2D
+# (terukur maks ~5e-6; cv2.filter2D sendiri memakai DFT float32
+# untuk kernel 21x21, sedangkan jalur FFT dihitung penuh float64)
+GABOR_FFT_RTOL = 1e-5
+
+
+def build_gabor_kernels():
+    """Bank filter Gabor 8 orientasi x 3 sigma (urutan theta lalu sigma)"""
+    return [cv2.getGaborKernel(GABOR_KSIZE, sigma, theta, 10.0, 0.5, 0)
+            for theta in GABOR_THETAS
+            for sigma in GABOR_SIGMAS]
+
+
+def build_hog_descriptor():
+    """HOGDescriptor untuk window 64x64"""
+    return cv2.HOGDescriptor(HOG_WIN_SIZE, HOG_BLOCK_SIZE, HOG_BLOCK_STRIDE,
+                             HOG_CELL_SIZE, HOG_NBINS)
+
+
+def _extract_into(img, out, extractor):
+    """Isi `out` (array 1D panjang N_FEATURES) dengan fitur dari satu gambar BGR"""
+    k = 0
     
     # Resize ke 256x256 (sama dengan training)
-    img = cv2.resize(img, (256, 256))
+    img = cv2.resize(img, IMAGE_SIZE)
     
     # ========== Color Spaces ==========
     hsv = cv2.cvtColor(img, cv2.COLOR_BGR2HSV)
@@ -32,89 +137,171 @@ def extract_features(img):
     for color_img in [img, hsv, lab, ycrcb]:
         for ch in range(3):
             hist = cv2.calcHist([color_img], [ch], None, [32], [0, 256])
-            hist = hist.flatten() / (hist.sum() + 1e-7)
-            fv.extend(hist)
+            out[k:k+32] = hist.flatten() / (hist.sum() + 1e-7)
+            k += 32
     
     # ========== Statistical Moments (72 features) ==========
     for color_img in [img, hsv, lab, ycrcb]:
         for ch in range(3):
             ch_data = color_img[:, :, ch].flatten()
-            fv.append(np.mean(ch_data))
-            fv.append(np.std(ch_data))
-            fv.append(np.median(ch_data))
-            fv.append(np.var(ch_data))
             mean = np.mean(ch_data)
             std = np.std(ch_data) + 1e-7
-            fv.append(np.mean(((ch_data - mean) / std) ** 3))  # Skewness
-            fv.append(np.mean(((ch_data - mean) / std) ** 4))  # Kurtosis
+            out[k:k+6] = [
+                mean,
+                np.std(ch_data),
+                np.median(ch_data),
+                np.var(ch_data),
+                np.mean(((ch_data - mean) / std) ** 3),  # Skewness
+                np.mean(((ch_data - mean) / std) ** 4),  # Kurtosis
+            ]
+            k += 6
     
     # ========== GLCM Texture (20 features) ==========
     gray_q = (gray // 32).astype(np.uint8)
-    for dx, dy in [(1,0), (1,1), (0,1), (-1,1)]:
-        glcm = np.zeros((8, 8))
-        for i in range(1, gray_q.shape[0]-1):
-            for j in range(1, gray_q.shape[1]-1):
-                if 0 <= i+dy < gray_q.shape[0] and 0 <= j+dx < gray_q.shape[1]:
-                    glcm[gray_q[i,j], gray_q[i+dy,j+dx]] += 1
-        
-        glcm = glcm / (glcm.sum() + 1e-7)
-        contrast = sum([(i-j)**2 * glcm[i,j] for i in range(8) for j in range(8)])
-        homogeneity = sum([glcm[i,j]/(1+abs(i-j)) for i in range(8) for j in range(8)])
-        energy = sum([glcm[i,j]**2 for i in range(8) for j in range(8)])
-        correlation = sum([i*j*glcm[i,j] for i in range(8) for j in range(8)])
-        entropy = -sum([glcm[i,j]*np.log(glcm[i,j]+1e-7) for i in range(8) for j in range(8)])
-        fv.extend([contrast, homogeneity, energy, correlation, entropy])
+    out[k:k+20] = glcm_features(gray_q)
+    k += 20
     
     # ========== LBP Texture (32 features) ==========
-    lbp = np.zeros_like(gray)
-    for i in range(1, gray.shape[0]-1):
-        for j in range(1, gray.shape[1]-1):
-            center = gray[i,j]
-            code = 0
-            code |= (gray[i-1,j-1] >= center) << 7
-            code |= (gray[i-1,j] >= center) << 6
-            code |= (gray[i-1,j+1] >= center) << 5
-            code |= (gray[i,j+1] >= center) << 4
-            code |= (gray[i+1,j+1] >= center) << 3
-            code |= (gray[i+1,j] >= center) << 2
-            code |= (gray[i+1,j-1] >= center) << 1
-            code |= (gray[i,j-1] >= center)
-            lbp[i,j] = code
-    
-    lbp_hist = cv2.calcHist([lbp.astype(np.uint8)], [0], None, [32], [0, 256])
-    lbp_hist = lbp_hist.flatten() / (lbp_hist.sum() + 1e-7)
-    fv.extend(lbp_hist)
+    lbp = lbp_image(gray)
+    
+    lbp_hist = cv2.calcHist([lbp], [0], None, [32], [0, 256])
+    out[k:k+32] = lbp_hist.flatten() / (lbp_hist.sum() + 1e-7)
+    k += 32
     
     # ========== Gabor Wavelets (48 features) ==========
-    for theta in np.arange(0, np.pi, np.pi/8):
-        for sigma in [3, 5, 7]:
-            kernel = cv2.getGaborKernel((21, 21), sigma, theta, 10.0, 0.5, 0)
-            filtered = cv2.filter2D(gray, cv2.CV_64F, kernel)
-            fv.append(np.mean(filtered))
-            fv.append(np.std(filtered))
-    
-    # ========== HOG Features ==========
-    winSize = (64, 64)
-    blockSize = (16, 16)
-    blockStride = (8, 8)
-    cellSize = (8, 8)
-    nbins = 9
-    gray_resized = cv2.resize(gray, winSize)
-    hog = cv2.HOGDescriptor(winSize, blockSize, blockStride, cellSize, nbins)
-    hog_features = hog.compute(gray_resized)
-    hog_features = hog_features.flatten()[::4]
-    fv.extend(hog_features)
+    out[k:k+48] = extractor.gabor_features(gray)
+    k += 48
+    
+    # ========== HOG Features (441 features) ==========
+    gray_resized = cv2.resize(gray, HOG_WIN_SIZE)
+    hog_features = extractor.hog.compute(gray_resized).flatten()[::4]
+    out[k:k+len(hog_features)] = hog_features
+    k += len(hog_features)
     
     # ========== Edge Features (6 features) ==========
     sobelx = cv2.Sobel(gray, cv2.CV_64F, 1, 0, ksize=5)
     sobely = cv2.Sobel(gray, cv2.CV_64F, 0, 1, ksize=5)
     sobel = np.sqrt(sobelx**2 + sobely**2)
-    fv.extend([np.mean(sobel), np.std(sobel), np.max(sobel), 
-               np.percentile(sobel, 75), np.percentile(sobel, 90)])
     canny = cv2.Canny(gray, 50, 150)
-    fv.append(np.sum(canny > 0) / canny.size)
+    out[k:k+6] = [np.mean(sobel), np.std(sobel), np.max(sobel),
+                  np.percentile(sobel, 75), np.percentile(sobel, 90),
+                  np.sum(canny > 0) / canny.size]
+    k += 6
     
-    return np.array(fv)
+    if k != out.shape[0]:
+        raise ValueError(f"Jumlah fitur {k} tidak sama dengan {out.shape[0]}")
+    return out
+
+
+class FeatureExtractor:
+    """
+    Ekstraktor fitur dengan bank filter Gabor dan HOGDescriptor yang
+    dibuat sekali lalu dipakai ulang untuk setiap gambar.
+    
+    Gunakan get_feature_extractor() untuk instance bersama (app.py dan
+    tool batch), atau buat instance sendiri bila butuh konfigurasi lain.
+    
+    Args:
+        gabor_fft: True = filter Gabor di domain frekuensi (FFT gambar
+            gray dihitung sekali lalu dikalikan dengan spektrum kernel
+            yang di-cache). Hasil Mean/Std Gabor berbeda dari jalur
+            spasial cv2.filter2D maksimal GABOR_FFT_RTOL * max(1, |nilai|);
+            fitur lain identik.
+    """
+    
+    def __init__(self, gabor_fft=False):
+        self.gabor_fft = gabor_fft
+        self.gabor_kernels = build_gabor_kernels()
+        self.hog = build_hog_descriptor()
+        self._gabor_spectra = {}
+    
+    def extract(self, img):
+        """Fitur dari satu gambar BGR -> array (1003,)"""
+        out = np.empty(N_FEATURES)
+        return _extract_into(img, out, self)
+    
+    def extract_batch(self, images):
+        """Fitur dari list/stack gambar BGR -> array (N, 1003)"""
+        features = np.empty((len(images), N_FEATURES))
+        for i, img in enumerate(images):
+            _extract_into(img, features[i], self)
+        return features
+    
+    def gabor_features(self, gray):
+        """48 fitur Gabor (Mean, Std per kernel) dari gambar gray"""
+        if self.gabor_fft:
+            return self._gabor_features_fft(gray)
+        
+        feats = np.empty(2 * len(self.gabor_kernels))
+        for i, kernel in enumerate(self.gabor_kernels):
+            filtered = cv2.filter2D(gray, cv2.CV_64F, kernel)
+            feats[2*i] = np.mean(filtered)
+            feats[2*i+1] = np.std(filtered)
+        return feats
+    
+    def _gabor_features_fft(self, gray):
+        # Padding BORDER_REFLECT_101 (default filter2D) selebar radius kernel,
+        # lalu korelasi = konvolusi dengan kernel yang dibalik
+        r = GABOR_KSIZE[0] // 2
+        h, w = gray.shape
+        padded = cv2.copyMakeBorder(gray, r, r, r, r, cv2.BORDER_REFLECT_101)
+        fft_shape, spectra = self._get_gabor_spectra(padded.shape)
+        
+        spectrum = np.fft.rfft2(padded.astype(np.float64), s=fft_shape)
+        filtered = np.fft.irfft2(spectrum * spectra, s=fft_shape)
+        filtered = filtered[:, 2*r:2*r+h, 2*r:2*r+w]
+        
+        feats = np.empty(2 * len(self.gabor_kernels))
+        feats[0::2] = filtered.mean(axis=(1, 2))
+        feats[1::2] = filtered.std(axis=(1, 2))
+        return feats
+    
+    def _get_gabor_spectra(self, padded_shape):
+        """Spektrum kernel Gabor untuk ukuran gambar tertentu (di-cache)"""
+        if padded_shape not in self._gabor_spectra:
+            kh, kw = GABOR_KSIZE
+            fft_shape = (cv2.getOptimalDFTSize(padded_shape[0] + kh - 1),
+                         cv2.getOptimalDFTSize(padded_shape[1] + kw - 1))
+            flipped = np.stack([kernel[::-1, ::-1] for kernel in self.gabor_kernels])
+            spectra = np.fft.rfft2(flipped, s=fft_shape)
+            self._gabor_spectra[padded_shape] = (fft_shape, spectra)
+        return self._gabor_spectra[padded_shape]
+
+
+_default_extractors = {}
+
+
+def get_feature_extractor(gabor_fft=False):
+    """Instance FeatureExtractor bersama (dibuat saat pertama dipakai)"""
+    if gabor_fft not in _default_extractors:
+        _default_extractors[gabor_fft] = FeatureExtractor(gabor_fft=gabor_fft)
+    return _default_extractors[gabor_fft]
+
+
+def extract_features(img):
+    """
+    Ekstraksi fitur dari gambar daun tebu
+    
+    Args:
+        img: numpy array gambar (BGR format dari cv2)
+    
+    Returns:
+        numpy array dengan ~1003 fitur
+    """
+    return get_feature_extractor().extract(img)
+
+
+def extract_features_batch(images):
+    """
+    Ekstraksi fitur untuk banyak gambar sekaligus
+    
+    Args:
+        images: list gambar BGR, atau array (N, H, W, 3)
+    
+    Returns:
+        numpy array (N, 1003)
+    """
+    return get_feature_extractor().extract_batch(images)
 
 
 def create_readable_feature_names():
@@ -176,4 +363,48 @@ def create_readable_feature_names():
         'Edge: Canny Density'
     ])
     
-    return feature_names
\ No newline at end of file
+    return feature_names
+
+def create_feature_groups():
+    """
+    Kelompok fitur semantik untuk XAI per grup (23 grup)
+    
+    Returns:
+        list of (nama_grup, numpy array index fitur), urut sesuai vektor fitur
+    """
+    groups = []
+    k = 0
+    
+    def add(name, size):
+        nonlocal k
+        groups.append((name, np.arange(k, k + size)))
+        k += size
+    
+    spaces = ['RGB', 'HSV', 'LAB', 'YCrCb']
+    
+    # 1. Color Histograms per color space (4 x 96)
+    for space in spaces:
+        add(f"Warna: Histogram {space}", 96)
+    
+    # 2. Statistical per color space (4 x 18)
+    for space in spaces:
+        add(f"Statistik: {space}", 18)
+    
+    # 3. GLCM per arah (4 x 5)
+    for direction in ['Horizontal', 'Diagonal /', 'Vertikal', 'Diagonal \\']:
+        add(f"Tekstur: GLCM {direction}", 5)
+    
+    # 4. LBP (32)
+    add("LBP: Histogram", 32)
+    
+    # 5. Gabor per orientasi (8 x 6)
+    for ori in ['0°', '22.5°', '45°', '67.5°', '90°', '112.5°', '135°', '157.5°']:
+        add(f"Gabor: {ori}", 6)
+    
+    # 6. HOG (441)
+    add("HOG: Bentuk & Tepi Lokal", N_FEATURES - k - 6)
+    
+    # 7. Edge (6)
+    add("Edge: Sobel & Canny", 6)
+    
+    return groups
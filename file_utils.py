@@ -0,0 +1,42 @@
+"""
+Utilitas File
+
+atomic_write dipakai semua cache di disk (hasil analisis, rekomendasi LLM,
+stylesheet static) supaya pembaca tidak pernah melihat file setengah jadi.
+"""
+
+import os
+import tempfile
+from contextlib import contextmanager
+from pathlib import Path
+
+
+@contextmanager
+def atomic_write(path, mode='wb', encoding=None, permissions=None):
+    """
+    Tulis file secara atomik: isi ditulis ke file sementara di folder yang
+    sama lalu di-rename dengan os.replace. Jika gagal, file sementara
+    dihapus dan file lama (jika ada) tetap utuh.
+
+    Args:
+        path: file tujuan
+        mode: mode open ('wb' atau 'w')
+        encoding: encoding untuk mode teks
+        permissions: mode file akhir, mis. 0o644 (mkstemp membuat file 0600)
+
+    Contoh:
+        with atomic_write(path, 'w', encoding='utf-8') as f:
+            f.write(text)
+    """
+    path = Path(path)
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix='.tmp')
+    try:
+        with os.fdopen(fd, mode, encoding=encoding) as f:
+            yield f
+        if permissions is not None:
+            os.chmod(tmp_path, permissions)
+        os.replace(tmp_path, path)
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
@@ -0,0 +1,128 @@
+"""
+Ingest Gambar Upload
+
+Foto kamera HP bisa 12 MP (~36 MB array RGB), padahal preview cuma
+600 px dan ekstraksi fitur langsung me-resize ke 256x256. Di sini JPEG
+di-decode dengan draft mode (libjpeg menskala DCT 1/2, 1/4, 1/8 saat
+decode) sehingga hasil decode sudah dekat ukuran yang dibutuhkan. Format
+lain di-reduce (box filter, faktor bulat) setelah decode.
+
+Setiap upload disimpan sekali sebagai NormalizedImage (buffer RGB
+terbatas + thumbnail JPEG) yang dipakai bersama oleh preview dan
+inferensi; gambar resolusi penuh tidak disimpan di session.
+"""
+
+import io
+from dataclasses import dataclass
+
+import cv2
+import numpy as np
+from PIL import Image
+
+from feature_extraction import IMAGE_SIZE
+
+# Batas ukuran (w, h) thumbnail preview
+PREVIEW_SIZE = (600, 600)
+PREVIEW_QUALITY = 85
+
+
+def open_image(data):
+    """PIL Image lazy (baru header yang dibaca) dari bytes, path, atau file-like"""
+    if isinstance(data, (bytes, bytearray, memoryview)):
+        data = io.BytesIO(data)
+    return Image.open(data)
+
+
+def to_rgb(image):
+    """Mode RGB; gambar transparan (RGBA/LA/P) dikomposit di atas latar putih"""
+    if image.mode == 'RGB':
+        return image
+    if image.mode in ('RGBA', 'LA') or 'transparency' in image.info:
+        image = image.convert('RGBA')
+        background = Image.new('RGB', image.size, (255, 255, 255))
+        background.paste(image, mask=image.getchannel('A'))
+        return background
+    return image.convert('RGB')
+
+
+def decode_reduced(image, min_size):
+    """
+    Decode gambar sekecil mungkin tanpa kurang dari min_size (w, h)
+
+    Args:
+        image: PIL Image yang belum di-load (hasil open_image)
+        min_size: ukuran minimum (w, h) hasil decode
+
+    Returns:
+        PIL Image mode RGB
+    """
+    image.draft('RGB', min_size)  # hanya berefek untuk JPEG
+    return _reduce(to_rgb(image), min_size)
+
+
+def _reduce(image, min_size):
+    """Perkecil dengan faktor bulat terbesar yang masih >= min_size"""
+    factor = min(image.width // min_size[0], image.height // min_size[1])
+    if factor >= 2:
+        image = image.reduce(factor)
+    return image
+
+
+@dataclass(frozen=True, eq=False)
+class NormalizedImage:
+    """
+    Satu gambar upload, di-decode sekali lalu dipakai preview & inferensi
+
+    Attributes:
+        rgb: array uint8 (h, w, 3) read-only, cukup besar untuk preview
+            dan fitur tapi tidak lebih
+        preview_jpeg: thumbnail JPEG (maks PREVIEW_SIZE)
+        original_size: ukuran (w, h) file asli
+        file_size: ukuran file upload dalam byte
+    """
+    rgb: np.ndarray
+    preview_jpeg: bytes
+    original_size: tuple
+    file_size: int
+
+    @classmethod
+    def from_bytes(cls, data, preview_size=PREVIEW_SIZE):
+        image = open_image(data)
+        original_size = image.size
+        rgb = _decode_normalized(image, preview_size)
+
+        preview = rgb.copy()
+        preview.thumbnail(preview_size, Image.Resampling.LANCZOS)
+        buffer = io.BytesIO()
+        preview.save(buffer, format='JPEG', quality=PREVIEW_QUALITY, optimize=True)
+
+        array = np.asarray(rgb)
+        array.setflags(write=False)
+        return cls(array, buffer.getvalue(), original_size, len(data))
+
+    def feature_input(self, size=IMAGE_SIZE):
+        """Array BGR uint8 (dekat ukuran `size`) siap untuk FeatureExtractor.extract"""
+        return _feature_array(Image.fromarray(self.rgb), size)
+
+
+def _decode_normalized(image, preview_size):
+    """Decode secukupnya untuk thumbnail preview dan untuk input fitur"""
+    scale = min(preview_size[0] / image.width, preview_size[1] / image.height, 1.0)
+    min_size = (max(round(image.width * scale), IMAGE_SIZE[0]),
+                max(round(image.height * scale), IMAGE_SIZE[1]))
+    return decode_reduced(image, min_size)
+
+
+def _feature_array(rgb_image, size):
+    rgb = np.asarray(_reduce(rgb_image, size))
+    return cv2.cvtColor(rgb, cv2.COLOR_RGB2BGR)
+
+
+def load_feature_input(data, preview_size=PREVIEW_SIZE, size=IMAGE_SIZE):
+    """
+    Input fitur (BGR) dari bytes/path tanpa membuat thumbnail preview
+
+    Hasilnya sama persis dengan NormalizedImage.from_bytes(data).feature_input(),
+    jadi pemrosesan batch memberi label yang sama dengan aplikasi.
+    """
+    return _feature_array(_decode_normalized(open_image(data), preview_size), size)
@@ -0,0 +1,135 @@
+"""
+Inference Module untuk Klasifikasi Penyakit Daun Tebu
+Menjalankan model sekali per gambar dan menyimpan semua hasilnya
+"""
+
+from dataclasses import dataclass
+
+import numpy as np
+
+# Naikkan jika aturan prediksi berubah: ikut di key cache hasil, jadi hasil
+# lama (prediksi dengan aturan sebelumnya) tidak dipakai lagi
+INFERENCE_VERSION = 2
+
+
+@dataclass(frozen=True)
+class InferenceResult:
+    """
+    Hasil inferensi satu gambar, dihitung sekali lalu dipakai ulang
+    oleh panel hasil, XAI, dan rekomendasi.
+
+    Attributes:
+        prediction: index kelas (index ke model_package['classes'])
+        probabilities: array (n_classes,) probabilitas Platt
+        decision_values: array nilai decision_function model
+        image_key: key cache hasil untuk gambar asalnya (None = tanpa cache)
+    """
+    prediction: int
+    probabilities: np.ndarray
+    decision_values: np.ndarray
+    image_key: str = None
+
+    @property
+    def confidence(self):
+        """Probabilitas kelas terprediksi dalam persen"""
+        return float(self.probabilities[self.prediction] * 100)
+
+    @property
+    def max_confidence(self):
+        """Probabilitas tertinggi dalam persen"""
+        return float(np.max(self.probabilities) * 100)
+
+    def to_arrays(self):
+        """Array untuk disimpan di cache hasil"""
+        return {
+            'prediction': np.int64(self.prediction),
+            'probabilities': self.probabilities,
+            'decision_values': self.decision_values,
+        }
+
+    @classmethod
+    def from_arrays(cls, arrays, image_key=None):
+        """Kebalikan to_arrays()"""
+        return cls(
+            prediction=int(arrays['prediction']),
+            probabilities=arrays['probabilities'],
+            decision_values=arrays['decision_values'],
+            image_key=image_key,
+        )
+
+
+def predict_from_decision(model, decision_values):
+    """
+    Label kelas dari decision_function bentuk ovr, sama dengan model.predict
+
+    Decision ovr sklearn = jumlah vote one-vs-one + confidence / (3 (|confidence| + 1)),
+    dan bagian confidence selalu < 1/3, jadi vote didapat dengan pembulatan.
+    Seperti libsvm (break_ties=False), vote seri dimenangkan kelas pertama,
+    bukan kelas dengan confidence terbesar.
+
+    Args:
+        model: classifier dengan classes_ (SVC, SVMEngine, FusedSVMPipeline)
+        decision_values: array (n_samples, n_classes) hasil model.decision_function
+
+    Returns:
+        array label (n_samples,), atau None jika bukan decision ovr multikelas
+        (pakai model.predict)
+    """
+    decision_values = np.asarray(decision_values)
+    n_classes = len(model.classes_)
+    if n_classes < 3 or getattr(model, 'decision_function_shape', 'ovr') != 'ovr' \
+            or decision_values.ndim != 2 or decision_values.shape[1] != n_classes:
+        return None
+    if getattr(model, 'break_ties', False):
+        return model.classes_[np.argmax(decision_values, axis=1)]
+    votes = np.round(decision_values)
+    return model.classes_[np.argmax(votes, axis=1)]
+
+
+def predict_labels(model, X):
+    """
+    Label kelas untuk banyak baris dengan aturan yang sama seperti run_inference
+
+    Dipakai scoring massal dan laporan kesepakatan/akurasi, supaya yang diukur
+    adalah label yang dilihat pengguna (vote one-vs-one), bukan argmax
+    probabilitas.
+    """
+    labels = None
+    if hasattr(model, 'decision_function'):
+        labels = predict_from_decision(model, np.atleast_2d(model.decision_function(X)))
+    return model.predict(X) if labels is None else labels
+
+
+def run_inference(model, features_scaled):
+    """
+    Prediksi kelas, probabilitas, dan decision values untuk satu vektor
+
+    Kelas diturunkan dari decision_function (lihat predict_from_decision),
+    sehingga tidak perlu memanggil model.predict terpisah. Jika decision
+    bukan ovr multikelas, fallback ke model.predict.
+
+    Args:
+        model: classifier sklearn (SVC dengan probability=True) atau SVMEngine
+        features_scaled: array (1, n_features) yang sudah di-scale
+
+    Returns:
+        InferenceResult
+    """
+    probabilities = model.predict_proba(features_scaled)[0]
+
+    decision_values = np.empty(0)
+    prediction = None
+    if hasattr(model, 'decision_function'):
+        decision = np.atleast_2d(model.decision_function(features_scaled))
+        decision_values = decision[0]
+        labels = predict_from_decision(model, decision)
+        if labels is not None:
+            prediction = labels[0]
+    if prediction is None:
+        prediction = model.predict(features_scaled)[0]
+
+    return InferenceResult(
+        prediction=int(prediction),
+        probabilities=probabilities,
+        decision_values=decision_values,
+    )
@@ -0,0 +1,117 @@
+"""
+Artifact Model yang Bisa di-Memory-Map
+
+File .pkl hasil training di-unpickle penuh ke heap di setiap proses
+(server Streamlit, worker score_images.py). Artifact mmap menyimpan
+paket model yang sama sebagai joblib tanpa kompresi, sehingga array
+numerik besar (support vectors, dual coef, mean/scale scaler,
+X_background) bisa di-memory-map: halaman file dibagi antar proses lewat
+page cache OS dan load hampir instan.
+
+Artifact juga menyimpan FusedSVMPipeline (float64 dan float32) yang sudah
+jadi. Support vector yang sudah dibagi scale (sv / scale) ikut di-map,
+jadi tidak dibangun ulang di heap setiap proses (server, tiap worker CLI).
+
+Export sekali setelah training / update model:
+    python model_store.py sugarcane_disease_classifier_full.pkl
+    -> sugarcane_disease_classifier_full.mmap.joblib
+
+load_model_package() otomatis memakai artifact tersebut bila ada dan
+tidak lebih lama dari file .pkl-nya.
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import joblib
+import numpy as np
+
+from svm_engine import PIPELINE_VERSION, FusedSVMPipeline
+
+MMAP_SUFFIX = '.mmap.joblib'
+
+# dtype FusedSVMPipeline yang disimpan di artifact (SVM_FLOAT32 / --float32)
+PIPELINE_DTYPES = (np.float64, np.float32)
+
+
+def mmap_artifact_path(model_path):
+    """Path artifact mmap untuk file model .pkl"""
+    return Path(model_path).with_suffix(MMAP_SUFFIX)
+
+
+def export_mmap_artifact(model_path, output_path=None):
+    """
+    Tulis ulang paket model sebagai artifact joblib tanpa kompresi
+
+    Returns:
+        path artifact yang ditulis
+    """
+    output_path = Path(output_path or mmap_artifact_path(model_path))
+    model_package = joblib.load(model_path)
+    # Simpan background sebagai float64 C-contiguous supaya bisa langsung
+    # dipakai explainer tanpa salinan
+    model_package['X_background'] = np.ascontiguousarray(model_package['X_background'],
+                                                         dtype=np.float64)
+    try:
+        model_package['fused_pipelines'] = {
+            np.dtype(dtype).name: FusedSVMPipeline.from_sklearn(
+                model_package['model'], model_package['scaler'], dtype=dtype)
+            for dtype in PIPELINE_DTYPES
+        }
+        model_package['fused_pipeline_version'] = PIPELINE_VERSION
+    except (ValueError, AttributeError) as e:
+        print(f"⚠️  FusedSVMPipeline tidak disimpan di artifact: {e}")
+    joblib.dump(model_package, output_path, compress=0)
+    return output_path
+
+
+def load_model_package(model_path, mmap=True):
+    """
+    Load paket model, memakai artifact mmap bila tersedia dan masih baru
+
+    Array di-map dengan mode 'c' (copy-on-write): halaman tetap dibagi antar
+    proses selama tidak ditulis, dan buffer tetap writable karena libsvm
+    (sklearn SVC) menolak array read-only.
+    """
+    artifact = mmap_artifact_path(model_path)
+    if mmap and artifact.exists() and \
+            artifact.stat().st_mtime >= Path(model_path).stat().st_mtime:
+        return joblib.load(artifact, mmap_mode='c')
+    return joblib.load(model_path)
+
+
+def fused_pipeline(model_package, dtype=np.float64):
+    """
+    FusedSVMPipeline untuk paket model
+
+    Dipakai dari artifact mmap bila ada (array dibagi antar proses), selain
+    itu dibangun dari model + scaler di heap proses ini.
+    """
+    pipelines = model_package.get('fused_pipelines')
+    if pipelines and model_package.get('fused_pipeline_version') == PIPELINE_VERSION:
+        pipeline = pipelines.get(np.dtype(dtype).name)
+        if pipeline is not None:
+            return pipeline
+    return FusedSVMPipeline.from_sklearn(model_package['model'], model_package['scaler'],
+                                         dtype=dtype)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Export model .pkl ke artifact yang bisa di-memory-map")
+    parser.add_argument('model', nargs='?', default='sugarcane_disease_classifier_full.pkl',
+                        help="Path file model .pkl")
+    parser.add_argument('-o', '--output', help=f"Path output (default: <model>{MMAP_SUFFIX})")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    output_path = export_mmap_artifact(args.model, args.output)
+    size_mb = output_path.stat().st_size / (1024 * 1024)
+    print(f"✅ {output_path} ({size_mb:.1f} MB) dalam {time.perf_counter() - start:.1f} detik")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,103 @@
+"""
+Cache Rekomendasi LLM
+
+Rekomendasi penanganan cuma bergantung pada nama penyakit (5 kelas), model
+LLM, versi prompt, dan tanggal (prompt meminta penyesuaian dengan kondisi
+hari ini). Jadi satu jawaban LLM bisa dipakai ulang oleh setiap rerun
+Streamlit dan semua sesi, tanpa request ulang ke API.
+
+Entry disimpan di memori dan sebagai file JSON di disk (tetap ada setelah
+restart), dengan TTL. Hanya jawaban LLM yang berhasil yang disimpan;
+fallback rule-based tidak.
+
+Client LLM cukup punya atribut `model_name` dan method
+`generate(prompt) -> str`, sehingga bisa diganti stub lokal untuk testing.
+"""
+
+import datetime
+import hashlib
+import json
+import threading
+import time
+from pathlib import Path
+
+from file_utils import atomic_write
+
+
+def recommendation_key(disease_name, model_name, prompt_version, day=None):
+    """Key cache (hex, aman untuk nama file) dari (penyakit, model, versi prompt, tanggal)"""
+    day = day or datetime.date.today()
+    raw = f"{disease_name}|{model_name}|{prompt_version}|{day.isoformat()}"
+    return hashlib.blake2b(raw.encode(), digest_size=16).hexdigest()
+
+
+class RecommendationCache:
+    """
+    Cache teks rekomendasi di memori + disk dengan TTL
+
+    Args:
+        directory: folder file JSON (None = hanya di memori)
+        ttl_seconds: umur entry maksimum (None = tanpa batas)
+    """
+
+    def __init__(self, directory=None, ttl_seconds=24 * 3600):
+        self.directory = Path(directory) if directory else None
+        if self.directory:
+            self.directory.mkdir(parents=True, exist_ok=True)
+        self.ttl_seconds = ttl_seconds
+        self._entries = {}  # key -> (created, message)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _path(self, key):
+        return self.directory / f"{key}.json"
+
+    def _expired(self, created):
+        return self.ttl_seconds is not None and time.time() - created > self.ttl_seconds
+
+    def _load(self, key):
+        if not self.directory:
+            return None
+        try:
+            with open(self._path(key), encoding='utf-8') as f:
+                entry = json.load(f)
+            return entry['created'], entry['message']
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def get(self, key):
+        """Teks rekomendasi untuk key, atau None (miss / kedaluwarsa)"""
+        with self._lock:
+            item = self._entries.get(key) or self._load(key)
+            if item is not None and self._expired(item[0]):
+                self._entries.pop(key, None)
+                if self.directory:
+                    self._path(key).unlink(missing_ok=True)
+                item = None
+            if item is None:
+                self.misses += 1
+                return None
+            self._entries[key] = item
+            self.hits += 1
+            return item[1]
+
+    def put(self, key, message):
+        created = time.time()
+        with self._lock:
+            self._entries[key] = (created, message)
+        if not self.directory:
+            return
+        with atomic_write(self._path(key), 'w', encoding='utf-8') as f:
+            json.dump({'created': created, 'message': message}, f, ensure_ascii=False)
+
+    def stats(self):
+        """Statistik untuk monitoring"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+            }
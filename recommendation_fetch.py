@@ -0,0 +1,154 @@
+"""
+Ambil Rekomendasi LLM di Background
+
+Request ke Gemini bisa makan beberapa detik (atau menggantung saat layanan
+lambat). Fetch dijalankan di thread pool bersama semua sesi, bersamaan
+dengan SHAP dan plot; UI hanya menunggu sampai batas waktu lalu memakai
+rekomendasi rule-based.
+
+Circuit breaker: setelah beberapa kali berturut-turut gagal karena quota
+atau jaringan, request ke LLM dihentikan selama masa cooldown dan
+rekomendasi rule-based langsung dipakai. Setelah cooldown, satu request
+percobaan menentukan breaker ditutup lagi atau dibuka ulang.
+
+Fungsi fetch mengembalikan dict hasil seperti get_gemini_recommendation;
+kegagalan ditandai dengan 'fallback_reason' di BREAKER_REASONS.
+"""
+
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+
+# fallback_reason yang dihitung sebagai kegagalan oleh circuit breaker
+BREAKER_REASONS = ('quota', 'network')
+
+
+class CircuitBreaker:
+    """
+    Breaker closed -> open -> half-open
+
+    Args:
+        failure_threshold: jumlah gagal berturut-turut sebelum breaker terbuka
+        cooldown_seconds: lama breaker terbuka sebelum request percobaan
+    """
+
+    def __init__(self, failure_threshold=3, cooldown_seconds=300, clock=time.monotonic):
+        self.failure_threshold = failure_threshold
+        self.cooldown_seconds = cooldown_seconds
+        self._clock = clock
+        self._failures = 0
+        self._opened_at = None
+        self._trial_running = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self):
+        with self._lock:
+            if self._opened_at is None:
+                return 'closed'
+            if self._clock() - self._opened_at < self.cooldown_seconds:
+                return 'open'
+            return 'half-open'
+
+    def allow(self):
+        """True jika request boleh dikirim (saat half-open cuma satu percobaan)"""
+        with self._lock:
+            if self._opened_at is None:
+                return True
+            if self._clock() - self._opened_at < self.cooldown_seconds or self._trial_running:
+                return False
+            self._trial_running = True
+            return True
+
+    def record_success(self):
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._trial_running = False
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            if self._trial_running or self._failures >= self.failure_threshold:
+                self._opened_at = self._clock()
+            self._trial_running = False
+
+
+class RecommendationJob:
+    """Handle satu fetch rekomendasi dengan batas waktu"""
+
+    def __init__(self, disease_name, future, deadline):
+        self.disease_name = disease_name
+        self.future = future
+        self.deadline = deadline
+
+    def done(self):
+        return self.future.done()
+
+    def expired(self):
+        """Batas waktu lewat dan hasil belum ada"""
+        return not self.done() and time.monotonic() > self.deadline
+
+    def result(self):
+        """Dict hasil fetch; exception dari worker dilempar ulang di sini"""
+        return self.future.result()
+
+
+class RecommendationFetcher:
+    """
+    Thread pool bersama untuk fetch rekomendasi + circuit breaker
+
+    Args:
+        fetch: fetch(disease_name) -> dict hasil
+        fallback: fallback(disease_name) -> dict hasil saat breaker terbuka
+        timeout_seconds: batas waktu tunggu UI per fetch
+        breaker: CircuitBreaker (default: bawaan)
+        max_workers: jumlah fetch yang boleh berjalan bersamaan
+    """
+
+    def __init__(self, fetch, fallback, timeout_seconds=10, breaker=None, max_workers=2):
+        self.fetch = fetch
+        self.fallback = fallback
+        self.timeout_seconds = timeout_seconds
+        self.breaker = breaker or CircuitBreaker()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers,
+                                            thread_name_prefix='recommendation')
+        self._jobs = {}
+        self._lock = threading.Lock()
+
+    def submit(self, disease_name):
+        """
+        Mulai fetch di background, kembalikan RecommendationJob
+
+        Jika fetch untuk penyakit yang sama masih berjalan, future-nya dipakai
+        ulang. Saat breaker terbuka, job langsung selesai dengan hasil fallback.
+        """
+        deadline = time.monotonic() + self.timeout_seconds
+        with self._lock:
+            future = self._jobs.get(disease_name)
+            if future is None:
+                if not self.breaker.allow():
+                    future = Future()
+                    future.set_result(self.fallback(disease_name))
+                    return RecommendationJob(disease_name, future, deadline)
+                future = self._executor.submit(self._run, disease_name)
+                self._jobs[disease_name] = future
+        future.add_done_callback(lambda done: self._forget(disease_name, done))
+        return RecommendationJob(disease_name, future, deadline)
+
+    def _run(self, disease_name):
+        try:
+            result = self.fetch(disease_name)
+        except Exception:
+            self.breaker.record_failure()
+            raise
+        if result.get('fallback_reason') in BREAKER_REASONS:
+            self.breaker.record_failure()
+        else:
+            self.breaker.record_success()
+        return result
+
+    def _forget(self, disease_name, future):
+        with self._lock:
+            if self._jobs.get(disease_name) is future:
+                del self._jobs[disease_name]
@@ -0,0 +1,170 @@
+"""
+Rekomendasi Rule-based (pre-rendered)
+
+Teks rekomendasi per kelas penyakit (berdasarkan pengetahuan domain
+penyakit tebu) dipakai saat Gemini tidak tersedia. Teks dan markup kartunya
+dirender sekali saat import ke store immutable yang dipakai bersama semua
+sesi, dengan key (nama kelas, locale). Jalur fallback cukup lookup dict
+lalu menyambung pesan info.
+"""
+
+from types import MappingProxyType
+from typing import NamedTuple
+
+DEFAULT_LOCALE = 'id'
+
+_RECOMMENDATIONS = {
+    'id': {
+        "Healthy": """<h3>🌿 Daun Sehat - Tips Perawatan Lanjutan</h3>
+            
+            <h4>1. Menjaga Kesehatan Daun Tebu</h4>
+            <p><strong>Langkah-langkah perawatan rutin:</strong></p>
+            <ul>
+                <li>Lakukan inspeksi visual setiap 1-2 minggu untuk deteksi dini penyakit</li>
+                <li>Jaga kebersihan lahan dari gulma dan sisa tanaman</li>
+                <li>Pastikan drainase lahan baik agar tidak tergenang air</li>
+                <li>Berikan nutrisi seimbang sesuai fase pertumbuhan</li>
+            </ul>
+            
+            <h4>2. Pencegahan Serangan Penyakit</h4>
+            <p><strong>Tips pencegahan umum:</strong></p>
+            <ul>
+                <li>Gunakan varietas tebu yang tahan penyakit sesuai wilayah</li>
+                <li>Terapkan rotasi tanaman untuk memutus siklus penyakit</li>
+                <li>Hindari luka pada batang saat pemeliharaan</li>
+                <li>Jaga jarak tanam yang cukup untuk sirkulasi udara</li>
+            </ul>
+            
+            <h4>3. Monitoring Berkala</h4>
+            <p><strong>Yang perlu diperhatikan:</strong></p>
+            <ul>
+                <li>Perhatikan perubahan warna daun (menguning, kecoklatan, belang)</li>
+                <li>Cek tekstur daun (bintik-bintik, karat, bercak)</li>
+                <li>Amati pertumbuhan tanaman secara keseluruhan</li>
+                <li>Catat kondisi cuaca dan kelembaban</li>
+            </ul>""",
+        
+        "Red Rot": """<h3>Red Rot - Rekomendasi Penanganan</h3>
+            
+            <h4>1. Penanganan agar penyakit tidak meluas</h4>
+            <p><strong>Tindakan segera yang perlu dilakukan:</strong></p>
+            <p>Red rot pada tebu yang disebabkan oleh Colletotrichum falcatum merupakan penyakit utama yang dapat menurunkan produktivitas secara signifikan. Berdasarkan Hossain dkk. (2020), upaya untuk mencegah agar penyakit tidak meluas dilakukan melalui penerapan Integrated Disease Management (IDM). Pendekatan ini mencakup penggunaan bahan tanam (setts) bebas patogen, penanaman varietas tebu yang memiliki ketahanan terhadap red rot, serta penerapan sanitasi lahan dan kebun secara ketat. Selain itu, praktik agronomis seperti rotasi tanaman dan pengelolaan drainase yang baik direkomendasikan untuk menekan keberadaan dan perkembangan inokulum jamur di lapangan, sehingga potensi penyebaran penyakit dapat diminimalkan.</p>
+
+            
+            <h4>2. Penanganan jika penyakit sudah meluas</h4>
+            <p><strong>Strategi pengelolaan lahan:</strong></p>
+            <p>Apabila penyakit red rot telah muncul dan menyebar di pertanaman, Hossain dkk. (2020) menegaskan bahwa pengendalian dengan satu metode saja, khususnya secara kimia, tidak memberikan hasil yang efektif. Oleh karena itu, pengelolaan penyakit tetap harus dilakukan secara terpadu, dengan mengombinasikan beberapa strategi seperti penggunaan varietas tahan, perlakuan bahan tanam, serta metode fisik pendukung. Salah satu teknik yang dilaporkan dapat membantu menekan infeksi patogen pada bahan tanam adalah heat therapy, yang digunakan sebagai bagian dari sistem manajemen terpadu untuk mengurangi tingkat infeksi ketika populasi patogen di lapangan sudah relatif tinggi </p>
+            
+            <h4>3. Pencegahan pada tanaman tebu lainnya</h4>
+            <p><strong>Langkah pencegahan:</strong></p>
+            <p>Untuk mencegah terjadinya serangan red rot pada area tanam lain atau pada musim tanam berikutnya, Hossain dkk. (2020) menekankan pentingnya keberlanjutan praktik pencegahan. Langkah-langkah yang direkomendasikan meliputi penggunaan material tanam yang bebas patogen, pemilihan varietas yang toleran atau tahan terhadap red rot, serta penerapan sanitasi kebun dan rotasi tanaman secara konsisten. Penerapan manajemen lahan yang baik bertujuan untuk mencegah akumulasi inokulum jamur di tanah, sehingga risiko serangan red rot pada pertanaman berikutnya dapat ditekan</p>""",
+        
+        "Mosaic": """<h3>Mosaic - Rekomendasi Penanganan</h3>
+            
+            <h4>1. Penanganan agar penyakit tidak meluas</h4>
+            <p><strong>Tindakan pencegahan penyebaran:</strong></p>
+            <p>Penyakit mosaic pada tebu disebabkan oleh beberapa virus utama, yaitu Sugarcane mosaic virus (SCMV), Sorghum mosaic virus (SrMV), dan Sugarcane streak mosaic virus (SCSMV), yang dapat menurunkan aktivitas fotosintesis dan pertumbuhan tanaman. Lu dkk. (2021) menjelaskan bahwa upaya pencegahan agar penyakit tidak meluas terutama difokuskan pada penggunaan material tanam bebas virus serta pemanfaatan varietas yang memiliki tingkat ketahanan lebih baik. Hal ini penting karena sistem perbanyakan tebu secara vegetatif memungkinkan virus terakumulasi dan menyebar apabila bahan tanam yang terinfeksi terus digunakan</p>
+            
+            <h4>2. Penanganan jika penyakit sudah meluas</h4>
+            <p><strong>Strategi pengelolaan:</strong></p>
+            <p>Apabila penyakit mosaic telah muncul dan menyebar di pertanaman, Lu dkk. (2021) merekomendasikan pendekatan pengelolaan yang berfokus pada identifikasi virus secara akurat menggunakan metode molekuler, seperti teknik berbasis PCR, untuk memastikan jenis virus penyebab infeksi. Selain itu, pengendalian penyebaran dilakukan melalui pengelolaan vektor serangga serta penghapusan tanaman yang terinfeksi (roguing) guna mengurangi sumber inokulum virus di lahan dan menekan penyebaran lanjutan ke tanaman sehat</p>
+            
+            <h4>3. Pencegahan pada tanaman tebu lainnya</h4>
+            <p><strong>Langkah pencegahan:</strong></p>
+            <p>Untuk mencegah terjadinya serangan mosaic pada area tanam lain atau pada musim tanam berikutnya, Lu dkk. (2021) menekankan pentingnya keberlanjutan praktik pencegahan. Langkah-langkah yang direkomendasikan meliputi penggunaan material tanam yang bebas virus, pemilihan varietas yang toleran atau tahan terhadap mosaic, serta penerapan sanitasi kebun dan rotasi tanaman secara konsisten. Penerapan manajemen lahan yang baik bertujuan untuk mencegah akumulasi inokulum virus di tanah, sehingga risiko serangan mosaic pada pertanaman berikutnya dapat ditekan</p>""",
+        
+        "Yellow": """<h3>Yellow/Chlorotic - Rekomendasi Penanganan</h3>
+            
+            <h4>1. Penanganan agar penyakit tidak meluas</h4>
+            <p><strong>Tindakan perbaikan nutrisi dan kesehatan:</strong></p>
+            <p>Yellow leaf disease disebabkan oleh Sugarcane yellow leaf virus (SCYLV) dan sering ditularkan oleh vektor seperti kutu daun, sehingga riset ilmiah menekankan pentingnya resistensi genetis varietas terhadap virus ini serta pengendalian terhadap vektor serangga jika tersedia. (Bertasello dkk., 2023)</p>
+            
+            <h4>2. Penanganan jika penyakit sudah meluas</h4>
+            <p><strong>Perbaikan kondisi lahan:</strong></p>
+            <p>Setelah yellow leaf menyebar, manajemen dapat melibatkan monitoring populasi vektor dan penggunaan varietas yang toleran terhadap SCYLV, karena stress virus lebih mudah dikelola dengan pendekatan varietas yang lebih tahan dan kontrol populasi vektor di lapangan. (Bertasello dkk., 2023)</p>
+            
+            <h4>3. Pencegahan pada tanaman tebu lainnya</h4>
+            <p><strong>Langkah pencegahan:</strong></p>
+            <p>Pencegahan pada tanaman baru mempertimbangkan screening varietas berdasarkan preferensi vektor dan resistensi terhadap virus untuk mengurangi peluang tersebarnya yellow leaf di blok tanaman lain. (Bertasello dkk., 2023)</p>""",
+        
+        "Rust": """<h3>Rust/Karat - Rekomendasi Penanganan</h3>
+            
+            <h4>1. Penanganan agar penyakit tidak meluas</h4>
+            <p><strong>Tindakan pengendalian penyakit karat:</strong></p>
+            <p>Rust pada tebu, yang termasuk penyakit daun foliar utama, biasanya dikontrol terutama melalui pemilihan varietas yang tahan karena resistensi varietas sangat penting untuk menahan penyebaran penyakit ini. Serangan rust dapat menyebar melalui uredospora yang terbawa angin sehingga varietas tahan mengurangi kemungkinan epidemi lanjutan (Viswanathan, 2022).</p>
+            
+            <h4>2. Penanganan jika penyakit sudah meluas</h4>
+            <p><strong>Strategi pengelolaan serangan berat:</strong></p>
+            <p>Ketika rust sudah menyebar di ladang, literature jurnal mencatat bahwa pengendalian kimia yang efektif sulit dan penggunaan fungisida berulang mungkin diperlukan di lapangan yang sangat terserang, tetapi strategi utama tetap pada varietas tahan dan pengelolaan tangguh terhadap kondisi lingkungan yang mendukung rust (Viswanathan, 2022).</p>
+            
+            <h4>3. Pencegahan pada tanaman tebu lainnya</h4>
+            <p><strong>Langkah pencegahan:</strong></p>
+            <p>Untuk pencegahan pada tanaman tebu lainnya, menjaga keragaman varietas dan tidak tergantung hanya pada satu tipe varietas dapat membantu menekan epidemi rust di area yang lebih luas karena variasi genetik dapat memperlambat penyebaran varietas rust yang agresif (Viswanathan, 2022).</p>"""
+    },
+}
+
+# Dipakai untuk kelas yang tidak punya rekomendasi khusus
+_GENERAL_INFO = {
+    'id': """<h4>ℹ️ Informasi Umum</h4>
+        <p>Untuk rekomendasi penanganan penyakit ini, silakan konsultasikan dengan penyuluh pertanian setempat 
+        atau hubungi Dinas Pertanian terdekat untuk mendapatkan panduan yang sesuai dengan kondisi lahan Anda.</p>""",
+}
+
+# Markup kartu rule-based: (sebelum pesan info, sesudah pesan info sampai isi + sumber)
+_CARD_TEMPLATES = {
+    'id': ("""
+            <div style="background: linear-gradient(135deg, #e8f5e9 0%, #ffffff 100%); 
+                        padding: 1.5rem 2rem; 
+                        border-radius: 16px; 
+                        border-left: 5px solid #66bb6a;
+                        box-shadow: 0 4px 12px rgba(0,0,0,0.08);
+                        margin-bottom: 2rem;">
+                <div style="background: #fff3e0; padding: 0.8rem 1rem; border-radius: 8px; margin-bottom: 1rem; border-left: 3px solid #ffa726;">
+                    <p style="margin: 0; font-size: 0.85rem; color: #e65100; font-weight: 600;">
+                        """, """
+                    </p>
+                </div>
+                <div class="rule-based-recommendation">{body}</div>
+                <div style="margin-top: 1.5rem; padding-top: 1rem; border-top: 1px solid #c8e6c9;">
+                    <p style="margin: 0; font-size: 0.8rem; color: #558b2f; font-style: italic;">
+                        📚 <strong>Sumber:</strong> Rekomendasi ini berdasarkan pengetahuan umum penanganan penyakit tebu. 
+                        Untuk penanganan spesifik sesuai kondisi lahan Anda, konsultasikan dengan penyuluh pertanian setempat.
+                    </p>
+                </div>
+            </div>
+            """),
+}
+
+
+class RenderedRecommendation(NamedTuple):
+    """Satu rekomendasi yang sudah dirender: isi HTML + kartu tanpa pesan info"""
+    body: str
+    card_head: str
+    card_tail: str
+
+    def card(self, info_message):
+        """Markup kartu lengkap dengan pesan info (alasan fallback)"""
+        return self.card_head + info_message + self.card_tail
+
+
+def _render(body, locale):
+    body = body.strip()
+    card_head, card_tail = _CARD_TEMPLATES[locale]
+    return RenderedRecommendation(body, card_head, card_tail.format(body=body))
+
+
+def _build_store():
+    store = {}
+    for locale, recommendations in _RECOMMENDATIONS.items():
+        for disease_name, body in recommendations.items():
+            store[(disease_name, locale)] = _render(body, locale)
+        store[(None, locale)] = _render(_GENERAL_INFO[locale], locale)
+    return MappingProxyType(store)
+
+
+RULE_BASED_STORE = _build_store()
+
+
+def get_rule_based(disease_name, locale=DEFAULT_LOCALE):
+    """RenderedRecommendation untuk kelas (fallback: informasi umum)"""
+    return RULE_BASED_STORE.get((disease_name, locale)) or RULE_BASED_STORE[(None, locale)]
@@ -0,0 +1,191 @@
+"""
+Cache Hasil Analisis
+
+DiskResultCache (content-addressed, persisten di disk):
+Key = hash piksel gambar yang sudah di-decode + versi model, sehingga foto
+yang sama (nama file apa pun, sesi apa pun, setelah restart) langsung
+mendapat fitur, probabilitas, dan nilai SHAP tanpa dihitung ulang.
+
+Setiap entry disimpan sebagai satu file .npz berisi array bernama
+(mis. 'features', 'probabilities', 'shap-grouped-kmeans-k10'). Ukuran total
+dibatasi; entry yang paling lama tidak diakses dihapus lebih dulu (LRU,
+berdasarkan mtime file).
+
+ExplanationCache (di memori proses, dipakai bersama semua sesi):
+Cache nilai SHAP dengan batas jumlah entry, batas byte, dan TTL. Key
+berupa digest biner 16 byte dari vektor fitur, bukan string hex.
+"""
+
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+
+import numpy as np
+
+from file_utils import atomic_write
+
+
+def image_digest(img_array):
+    """Hash isi piksel (plus shape & dtype) dari gambar yang sudah di-decode"""
+    img_array = np.ascontiguousarray(img_array)
+    h = hashlib.blake2b(digest_size=20)
+    h.update(f"{img_array.shape}|{img_array.dtype}".encode())
+    h.update(img_array.data)
+    return h.hexdigest()
+
+
+def file_digest(path, chunk_size=1 << 20):
+    """Hash isi file (dipakai sebagai versi model)"""
+    h = hashlib.blake2b(digest_size=8)
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+class DiskResultCache:
+    """
+    Cache array hasil analisis per gambar di disk dengan batas ukuran LRU
+
+    Args:
+        directory: folder cache (dibuat otomatis)
+        max_bytes: batas total ukuran file cache
+        model_version: string versi model, ikut menjadi bagian key
+    """
+
+    def __init__(self, directory, max_bytes, model_version):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.model_version = model_version
+        self._lock = threading.Lock()
+        self._total_bytes = sum(p.stat().st_size for p in self.directory.glob('*.npz'))
+
+    def key(self, img_array):
+        """Key cache untuk array gambar yang sudah di-decode"""
+        return f"{self.model_version}-{image_digest(img_array)}"
+
+    def _path(self, key):
+        return self.directory / f"{key}.npz"
+
+    def get(self, key):
+        """Semua array tersimpan untuk key (dict), atau None jika belum ada"""
+        path = self._path(key)
+        try:
+            with np.load(path) as data:
+                entry = {name: data[name] for name in data.files}
+            os.utime(path)  # tandai baru diakses (LRU)
+            return entry
+        except (FileNotFoundError, OSError, ValueError):
+            return None
+
+    def put(self, key, arrays):
+        """Gabungkan `arrays` (dict nama -> array) ke entry key lalu simpan"""
+        path = self._path(key)
+        # Baca-gabung-tulis di dalam lock: dua thread yang menambah array
+        # berbeda ke key yang sama tidak saling menimpa
+        with self._lock:
+            entry = self.get(key) or {}
+            entry.update({name: np.asarray(value) for name, value in arrays.items()})
+
+            old_size = path.stat().st_size if path.exists() else 0
+            with atomic_write(path) as f:
+                np.savez(f, **entry)
+            self._total_bytes += path.stat().st_size - old_size
+            if self._total_bytes > self.max_bytes:
+                self._evict()
+
+    def _evict(self):
+        """Hapus entry paling lama diakses sampai ukuran total <= 90% batas"""
+        files = sorted(self.directory.glob('*.npz'), key=lambda p: p.stat().st_mtime)
+        total = sum(p.stat().st_size for p in files)
+        target = self.max_bytes * 0.9
+        for path in files:
+            if total <= target:
+                break
+            try:
+                size = path.stat().st_size
+                path.unlink()
+                total -= size
+            except FileNotFoundError:
+                pass
+        self._total_bytes = total
+
+
+def explanation_key(features_scaled, config=''):
+    """Digest biner 16 byte dari vektor fitur + konfigurasi explainer"""
+    features_scaled = np.ascontiguousarray(features_scaled)
+    h = hashlib.blake2b(digest_size=16)
+    h.update(config.encode())
+    h.update(features_scaled.data)
+    return h.digest()
+
+
+class ExplanationCache:
+    """
+    Cache nilai SHAP di memori dengan batas entry, byte, dan TTL (LRU)
+
+    Args:
+        max_entries: jumlah entry maksimum
+        max_bytes: total ukuran array maksimum
+        ttl_seconds: umur entry maksimum (None = tanpa batas)
+    """
+
+    def __init__(self, max_entries=128, max_bytes=64 * 1024 * 1024, ttl_seconds=3600):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self._entries = OrderedDict()  # key -> (expires_at, array)
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key):
+        """Array tersimpan untuk key, atau None (miss / kedaluwarsa)"""
+        with self._lock:
+            item = self._entries.get(key)
+            if item is not None and item[0] is not None and item[0] < time.monotonic():
+                self._remove(key)
+                item = None
+            if item is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return item[1]
+
+    def put(self, key, value):
+        value = np.asarray(value)
+        value.setflags(write=False)  # dipakai bersama antar sesi
+        expires_at = time.monotonic() + self.ttl_seconds if self.ttl_seconds else None
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (expires_at, value)
+            self._bytes += value.nbytes
+            while self._entries and (len(self._entries) > self.max_entries
+                                     or self._bytes > self.max_bytes):
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+
+    def _remove(self, key):
+        _, value = self._entries.pop(key)
+        self._bytes -= value.nbytes
+
+    def stats(self):
+        """Statistik untuk monitoring"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+            }
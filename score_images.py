@@ -0,0 +1,231 @@
+"""
+CLI Scoring Massal Gambar Daun Tebu (tanpa Streamlit)
+
+Memproses satu folder (rekursif) atau file daftar path gambar memakai
+process pool, lalu menulis hasil klasifikasi secara bertahap ke CSV atau
+Parquet.
+
+Contoh:
+    python score_images.py foto_survey/ -o hasil.csv
+    python score_images.py daftar_foto.txt -o hasil.parquet --workers 8
+"""
+
+import argparse
+import csv
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+from feature_extraction import get_feature_extractor
+from image_ingest import load_feature_input
+from inference import predict_labels
+from model_store import fused_pipeline, load_model_package
+
+MODEL_PATH = 'sugarcane_disease_classifier_full.pkl'
+IMAGE_EXTENSIONS = {'.jpg', '.jpeg', '.png'}
+
+
+# ==================== INPUT ====================
+
+def collect_image_paths(source):
+    """
+    Kumpulkan path gambar dari folder (rekursif) atau file daftar
+    (satu path per baris, baris kosong dan '#' diabaikan)
+    """
+    source = Path(source)
+    if source.is_dir():
+        return sorted(str(p) for p in source.rglob('*')
+                      if p.suffix.lower() in IMAGE_EXTENSIONS)
+
+    with open(source, encoding='utf-8') as f:
+        lines = (line.strip() for line in f)
+        return [line for line in lines if line and not line.startswith('#')]
+
+
+def chunked(items, size):
+    """Bagi list menjadi potongan berukuran `size`"""
+    return [items[i:i+size] for i in range(0, len(items), size)]
+
+
+# ==================== WORKER ====================
+
+_worker_state = {}
+
+
+def _init_worker(model_path, gabor_fft, engine, float32):
+    """Load model sekali per proses worker (artifact mmap dibagi antar worker)"""
+    # Paralelisme sudah di level proses, jangan biarkan OpenCV spawn thread
+    cv2.setNumThreads(1)
+    model_package = load_model_package(model_path)
+    scaler, model = model_package['scaler'], model_package['model']
+    if engine == 'numpy':
+        # Scaler dilipat ke SVM: fitur mentah langsung -> probabilitas
+        # Dari artifact mmap: semua worker berbagi halaman SV yang sama
+        pipeline = fused_pipeline(model_package, np.float32 if float32 else np.float64)
+        _worker_state['predict'] = lambda X: _predict(pipeline, X)
+    else:
+        _worker_state['predict'] = lambda X: _predict(model, scaler.transform(X))
+    _worker_state['classes'] = list(model_package['classes'])
+    _worker_state['extractor'] = get_feature_extractor(gabor_fft=gabor_fft)
+
+
+def _predict(model, X):
+    """Probabilitas dan label kelas dengan aturan yang sama seperti aplikasi (run_inference)"""
+    return model.predict_proba(X), predict_labels(model, X)
+
+
+def _score_chunk(paths):
+    """Ekstraksi fitur + prediksi untuk satu potongan path -> list baris hasil"""
+    images, loaded, rows = [], [], []
+    for path in paths:
+        # Decode sama dengan upload di aplikasi (draft mode JPEG + reduce)
+        try:
+            img = load_feature_input(path)
+        except (OSError, ValueError) as e:
+            rows.append({'path': path, 'error': f'gagal membaca gambar: {e}'})
+        else:
+            images.append(img)
+            loaded.append(path)
+
+    if images:
+        features = _worker_state['extractor'].extract_batch(images)
+        probabilities, labels = _worker_state['predict'](features)
+        rows.extend(_result_rows(loaded, probabilities, labels, _worker_state['classes']))
+
+    return rows
+
+
+def _result_rows(paths, probabilities, labels, classes):
+    rows = []
+    for path, probs, label in zip(paths, probabilities, labels):
+        best = int(label)
+        row = {
+            'path': path,
+            'prediction': classes[best],
+            'confidence': float(probs[best] * 100),
+            'error': '',
+        }
+        for class_name, p in zip(classes, probs):
+            row[f'prob_{class_name}'] = float(p)
+        rows.append(row)
+    return rows
+
+
+# ==================== OUTPUT ====================
+
+class CsvResultWriter:
+    """Tulis hasil ke CSV baris demi baris"""
+
+    def __init__(self, path, columns):
+        self.file = open(path, 'w', newline='', encoding='utf-8')
+        self.writer = csv.DictWriter(self.file, fieldnames=columns, restval='')
+        self.writer.writeheader()
+
+    def write(self, rows):
+        self.writer.writerows(rows)
+        self.file.flush()
+
+    def close(self):
+        self.file.close()
+
+
+class ParquetResultWriter:
+    """Tulis hasil ke Parquet per row group (butuh pyarrow)"""
+
+    def __init__(self, path, columns):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise SystemExit("❌ Output Parquet butuh pyarrow: pip install pyarrow")
+
+        fields = []
+        for col in columns:
+            dtype = pa.float64() if col == 'confidence' or col.startswith('prob_') else pa.string()
+            fields.append(pa.field(col, dtype))
+        self.pa = pa
+        self.columns = columns
+        self.schema = pa.schema(fields)
+        self.writer = pq.ParquetWriter(path, self.schema)
+
+    def write(self, rows):
+        if not rows:
+            return
+        data = {col: [row.get(col) for row in rows] for col in self.columns}
+        self.writer.write_table(self.pa.Table.from_pydict(data, schema=self.schema))
+
+    def close(self):
+        self.writer.close()
+
+
+def open_writer(path, columns):
+    if Path(path).suffix.lower() == '.parquet':
+        return ParquetResultWriter(path, columns)
+    return CsvResultWriter(path, columns)
+
+
+# ==================== MAIN ====================
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Klasifikasi massal foto daun tebu ke CSV/Parquet")
+    parser.add_argument('source', help="Folder gambar atau file daftar path (.txt)")
+    parser.add_argument('-o', '--output', default='hasil_klasifikasi.csv',
+                        help="File output .csv atau .parquet")
+    parser.add_argument('-m', '--model', default=MODEL_PATH,
+                        help="Path file model .pkl")
+    parser.add_argument('-w', '--workers', type=int, default=os.cpu_count(),
+                        help="Jumlah proses worker (default: jumlah CPU)")
+    parser.add_argument('--chunk-size', type=int, default=32,
+                        help="Jumlah gambar per tugas worker")
+    parser.add_argument('--gabor-fft', action='store_true',
+                        help="Pakai filter Gabor domain frekuensi")
+    parser.add_argument('--engine', choices=('numpy', 'sklearn'), default='numpy',
+                        help="Engine prediksi SVM (default: numpy)")
+    parser.add_argument('--float32', action='store_true',
+                        help="Hitung kernel SVM dalam float32 (engine numpy)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    paths = collect_image_paths(args.source)
+    if not paths:
+        print(f"⚠️  Tidak ada gambar ditemukan di {args.source}")
+        return 1
+
+    classes = list(load_model_package(args.model)['classes'])
+    columns = ['path', 'prediction', 'confidence'] + \
+              [f'prob_{c}' for c in classes] + ['error']
+
+    print(f"🔍 {len(paths)} gambar, {args.workers} worker, chunk {args.chunk_size}")
+    start = time.perf_counter()
+    done = 0
+
+    writer = open_writer(args.output, columns)
+    try:
+        with ProcessPoolExecutor(max_workers=args.workers,
+                                 initializer=_init_worker,
+                                 initargs=(args.model, args.gabor_fft,
+                                           args.engine, args.float32)) as pool:
+            for rows in pool.map(_score_chunk, chunked(paths, args.chunk_size)):
+                writer.write(rows)
+                done += len(rows)
+                elapsed = time.perf_counter() - start
+                print(f"\r   {done}/{len(paths)} gambar ({done / elapsed:.1f} gambar/detik)",
+                      end='', flush=True)
+    finally:
+        writer.close()
+
+    print(f"\n✅ Selesai dalam {time.perf_counter() - start:.1f} detik → {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,336 @@
+"""
+Engine Inferensi SVM Native NumPy
+
+Menghitung decision function dan probabilitas Platt dari SVC sklearn
+(probability=True) langsung dari support vector dengan operasi matriks
+NumPy (BLAS), tanpa overhead validasi per panggilan sklearn/libsvm.
+
+    engine = SVMEngine.from_sklearn(model_package['model'])
+    engine.predict_proba(features_scaled)      # sama dengan SVC.predict_proba
+    engine.decision_function(features_scaled)  # sama dengan SVC (ovr)
+
+    pipeline = FusedSVMPipeline.from_sklearn(model_package['model'],
+                                             model_package['scaler'], dtype=np.float32)
+    pipeline.predict_proba(features)           # fitur mentah, tanpa scaler.transform
+
+Hasil mengikuti libsvm: decision one-vs-one per pasangan kelas, sigmoid
+Platt per pasangan, lalu penggabungan probabilitas multikelas (Wu, Lin &
+Weng 2004, metode 2, iterasi sama persis dengan libsvm).
+"""
+
+import numpy as np
+
+# 'rff' = random Fourier features (hasil compress_model.py): "support vector"
+# berisi frekuensi acak dan kernel = sqrt(2/D) cos(x . w + offset)
+SUPPORTED_KERNELS = ('rbf', 'poly', 'linear', 'sigmoid', 'rff')
+
+# Batas bawah/atas probabilitas pasangan, sama dengan min_prob di libsvm
+MIN_PAIRWISE_PROB = 1e-7
+
+# Naikkan bila atribut FusedSVMPipeline berubah: pipeline yang tersimpan di
+# artifact mmap (model_store.py) dengan versi lain dibangun ulang
+PIPELINE_VERSION = 1
+
+
+class SVMEngine:
+    """
+    Salinan ringan parameter SVC untuk prediksi dengan NumPy
+
+    Attributes (mengikuti nama sklearn agar bisa dipakai run_inference):
+        classes_: label kelas
+
+    dtype: tipe data perkalian kernel (float64 = identik dengan sklearn,
+    float32 = setengah bandwidth memori). Sigmoid Platt dan penggabungan
+    probabilitas selalu float64.
+    """
+
+    def __init__(self, support_vectors, pair_coef, intercept, classes,
+                 kernel='rbf', gamma=1.0, degree=3, coef0=0.0, prob_a=None, prob_b=None,
+                 rff_offset=None, dtype=np.float64):
+        if kernel not in SUPPORTED_KERNELS:
+            raise ValueError(f"Kernel tidak didukung: {kernel} "
+                             f"(pilihan: {', '.join(SUPPORTED_KERNELS)})")
+        self.dtype = np.dtype(dtype)
+        self.support_vectors = np.ascontiguousarray(support_vectors, dtype=self.dtype)
+        self.intercept = np.asarray(intercept, dtype=np.float64)
+        self.classes_ = np.asarray(classes)
+        self.kernel = kernel
+        self.gamma = float(gamma)
+        self.degree = degree
+        self.coef0 = float(coef0)
+        self.prob_a = None if prob_a is None or len(prob_a) == 0 else np.asarray(prob_a, dtype=np.float64)
+        self.prob_b = None if prob_b is None or len(prob_b) == 0 else np.asarray(prob_b, dtype=np.float64)
+        self.rff_offset = None if rff_offset is None else np.asarray(rff_offset, dtype=self.dtype)
+
+        n_classes = len(self.classes_)
+        self.pairs = [(i, j) for i in range(n_classes) for j in range(i + 1, n_classes)]
+        self.pair_i = np.array([i for i, _ in self.pairs], dtype=np.intp)
+        self.pair_j = np.array([j for _, j in self.pairs], dtype=np.intp)
+        # Matriks (n_pairs, n_classes) untuk menjumlahkan hasil per pasangan ke kelas
+        self.pair_to_i = np.eye(n_classes)[self.pair_i]
+        self.pair_to_j = np.eye(n_classes)[self.pair_j]
+        sv = np.asarray(support_vectors, dtype=np.float64)
+        self.sv_sq_norms = np.einsum('ij,ij->i', sv, sv).astype(self.dtype)
+        # Koefisien OvO sebagai satu matriks (n_SV, n_pairs): decision = K @ W + b
+        self.pair_coef = np.ascontiguousarray(pair_coef, dtype=self.dtype)
+
+    @classmethod
+    def from_sklearn(cls, model, dtype=np.float64):
+        """Bangun engine dari sklearn.svm.SVC yang sudah di-fit"""
+        return cls(
+            support_vectors=model.support_vectors_,
+            # _dual_coef_/_intercept_ = nilai asli libsvm (sebelum sign flip kasus biner)
+            pair_coef=pair_coefficients(model._dual_coef_, model._n_support),
+            intercept=model._intercept_,
+            classes=model.classes_,
+            kernel=model.kernel,
+            gamma=model._gamma,
+            degree=model.degree,
+            coef0=model.coef0,
+            prob_a=getattr(model, '_probA', None),
+            prob_b=getattr(model, '_probB', None),
+            dtype=dtype,
+        )
+
+    def with_support_vectors(self, support_vectors, pair_coef, kernel=None, rff_offset=None):
+        """Engine baru dengan kelas, intercept, dan Platt yang sama tapi SV lain"""
+        return SVMEngine(support_vectors, pair_coef, self.intercept, self.classes_,
+                         kernel=kernel or self.kernel, gamma=self.gamma, degree=self.degree,
+                         coef0=self.coef0, prob_a=self.prob_a, prob_b=self.prob_b,
+                         rff_offset=rff_offset, dtype=self.dtype)
+
+    def kernel_matrix(self, X):
+        """Matriks kernel (n_samples, n_SV) untuk fitur ter-scale X"""
+        return self._kernel(np.atleast_2d(np.asarray(X, dtype=self.dtype)))
+
+    def _dot(self, X):
+        """(X . sv untuk semua SV, ||x||^2) di ruang fitur ter-scale"""
+        return X @ self.support_vectors.T, np.einsum('ij,ij->i', X, X)
+
+    def _kernel(self, X):
+        """Matriks kernel (n_samples, n_SV)"""
+        dot, x_sq = self._dot(X)
+        if self.kernel == 'rbf':
+            sq_dist = x_sq[:, np.newaxis] + self.sv_sq_norms - 2.0 * dot
+            return np.exp(-self.gamma * np.maximum(sq_dist, 0.0))
+        if self.kernel == 'poly':
+            return (self.gamma * dot + self.coef0) ** self.degree
+        if self.kernel == 'sigmoid':
+            return np.tanh(self.gamma * dot + self.coef0)
+        if self.kernel == 'rff':
+            return np.sqrt(2.0 / len(self.support_vectors)) * np.cos(dot + self.rff_offset)
+        return dot
+
+    def pairwise_decision(self, X):
+        """Decision value one-vs-one (n_samples, n_pairs), urutan pasangan libsvm"""
+        X = np.asarray(X, dtype=self.dtype)
+        if X.ndim == 1:
+            X = X[np.newaxis]
+        return np.asarray(self._kernel(X) @ self.pair_coef, dtype=np.float64) + self.intercept
+
+    def decision_function(self, X):
+        """Decision function bentuk 'ovr' (sama dengan SVC default)"""
+        dec = self.pairwise_decision(X)
+        n_classes = len(self.classes_)
+        if n_classes == 2:
+            return -dec[:, 0]
+
+        votes = self._votes(dec)
+        confidences = dec @ (self.pair_to_i - self.pair_to_j)
+        return votes + confidences / (3 * (np.abs(confidences) + 1))
+
+    def _votes(self, dec):
+        """Jumlah kemenangan one-vs-one per kelas (n_samples, n_classes)"""
+        win_i = dec > 0
+        return win_i @ self.pair_to_i + ~win_i @ self.pair_to_j
+
+    def predict(self, X):
+        """Kelas hasil voting one-vs-one (seperti libsvm, seri -> kelas pertama)"""
+        votes = self._votes(self.pairwise_decision(X))
+        return self.classes_[np.argmax(votes, axis=1)]
+
+    def predict_proba(self, X):
+        """Probabilitas Platt multikelas (n_samples, n_classes)"""
+        if self.prob_a is None:
+            raise AttributeError("Model tidak dilatih dengan probability=True")
+
+        dec = self.pairwise_decision(X)
+        f = dec * self.prob_a + self.prob_b
+        # Sigmoid Platt stabil numerik, sama dengan sigmoid_predict di libsvm
+        with np.errstate(over='ignore'):
+            pair_prob = np.where(f >= 0, np.exp(-f) / (1.0 + np.exp(-f)), 1.0 / (1.0 + np.exp(f)))
+        pair_prob = np.clip(pair_prob, MIN_PAIRWISE_PROB, 1 - MIN_PAIRWISE_PROB)
+
+        n_classes = len(self.classes_)
+        r = np.zeros((len(dec), n_classes, n_classes))
+        r[:, self.pair_i, self.pair_j] = pair_prob
+        r[:, self.pair_j, self.pair_i] = 1 - pair_prob
+        return _multiclass_probability(r)
+
+
+def pair_coefficients(dual_coef, n_support):
+    """
+    Matriks koefisien (n_SV, n_pairs) dari dual_coef libsvm
+
+    Pasangan (i, j) memakai SV kelas i dengan dual_coef[j-1] dan SV kelas j
+    dengan dual_coef[i], sama seperti svm_predict_values di libsvm.
+    """
+    dual_coef = np.asarray(dual_coef, dtype=np.float64)
+    n_classes = len(n_support)
+    start = np.concatenate([[0], np.cumsum(n_support)])
+    pairs = [(i, j) for i in range(n_classes) for j in range(i + 1, n_classes)]
+    coef = np.zeros((dual_coef.shape[1], len(pairs)))
+    for p, (i, j) in enumerate(pairs):
+        coef[start[i]:start[i+1], p] = dual_coef[j - 1, start[i]:start[i+1]]
+        coef[start[j]:start[j+1], p] = dual_coef[i, start[j]:start[j+1]]
+    return coef
+
+
+class FusedSVMPipeline(SVMEngine):
+    """
+    StandardScaler + SVMEngine dalam satu langkah, input fitur mentah
+
+    mean/scale scaler dilipat ke support vector saat dibuat, sehingga tidak
+    ada array fitur ter-scale perantara di jalur prediksi:
+
+        x_s . sv  = x . (sv / scale) - (mean / scale) . sv
+        ||x_s||^2 = x^2 . (1 / scale^2) - 2 x . (mean / scale^2) + ||mean / scale||^2
+
+    transform() tetap tersedia untuk kebutuhan yang butuh fitur ter-scale
+    (SHAP), tanpa overhead validasi sklearn.
+    """
+
+    @classmethod
+    def from_sklearn(cls, model, scaler=None, dtype=np.float64):
+        """Bangun pipeline dari SVC dan StandardScaler yang sudah di-fit"""
+        return cls.from_engine(SVMEngine.from_sklearn(model), scaler, dtype=dtype)
+
+    @classmethod
+    def from_engine(cls, engine, scaler=None, dtype=np.float64):
+        """Bangun pipeline dari SVMEngine (mis. model hasil compress_model.py)"""
+        pipeline = cls(engine.support_vectors, engine.pair_coef, engine.intercept,
+                       engine.classes_, kernel=engine.kernel, gamma=engine.gamma,
+                       degree=engine.degree, coef0=engine.coef0, prob_a=engine.prob_a,
+                       prob_b=engine.prob_b, rff_offset=engine.rff_offset, dtype=dtype)
+        n_features = engine.support_vectors.shape[1]
+        mean = getattr(scaler, 'mean_', None)
+        scale = getattr(scaler, 'scale_', None)
+        pipeline._fold_scaler(np.zeros(n_features) if mean is None else mean,
+                              np.ones(n_features) if scale is None else scale,
+                              engine.support_vectors)
+        return pipeline
+
+    def _fold_scaler(self, mean, scale, support_vectors):
+        mean = np.asarray(mean, dtype=np.float64)
+        scale = np.asarray(scale, dtype=np.float64)
+        sv = np.asarray(support_vectors, dtype=np.float64)
+
+        self.mean = mean
+        self.scale = scale
+        self.support_vectors = np.ascontiguousarray(sv / scale, dtype=self.dtype)
+        self.sv_offset = ((mean / scale) @ sv.T).astype(self.dtype)
+        self.inv_var = (1.0 / scale ** 2).astype(self.dtype)
+        self.mean_inv_var = (mean / scale ** 2).astype(self.dtype)
+        self.mean_sq = self.dtype.type(np.sum((mean / scale) ** 2))
+
+    def transform(self, X):
+        """Sama dengan StandardScaler.transform (float64)"""
+        return (np.asarray(X, dtype=np.float64) - self.mean) / self.scale
+
+    def _dot(self, X):
+        dot = X @ self.support_vectors.T - self.sv_offset
+        x_sq = np.einsum('ij,ij,j->i', X, X, self.inv_var) - 2 * (X @ self.mean_inv_var) + self.mean_sq
+        return dot, x_sq
+
+
+def _multiclass_probability(r):
+    """
+    Probabilitas multikelas dari probabilitas pasangan r[:, i, j] = P(i | i atau j)
+
+    Port batch dari multiclass_probability libsvm: iterasi per kelas
+    dijalankan untuk semua sampel sekaligus, sampel yang sudah konvergen
+    dibekukan supaya hasilnya identik dengan pemanggilan per sampel.
+    """
+    n, k, _ = r.shape
+    if n == 1:
+        # Satu vektor (jalur predict_image): loop skalar jauh lebih cepat
+        # daripada puluhan operasi NumPy kecil
+        return np.array([_multiclass_probability_single(r[0].tolist())])
+
+    eye = np.eye(k, dtype=bool)
+    Q = -r.transpose(0, 2, 1) * r
+    Q[:, eye] = np.sum(np.where(eye, 0.0, r ** 2), axis=1)
+
+    p = np.full((n, k), 1.0 / k)
+    eps = 0.005 / k
+    active = np.ones(n, dtype=bool)
+
+    for _ in range(max(100, k)):
+        Qp = np.einsum('ntj,nj->nt', Q, p)
+        pQp = np.einsum('nt,nt->n', p, Qp)
+        active &= np.max(np.abs(Qp - pQp[:, np.newaxis]), axis=1) >= eps
+        if not active.any():
+            break
+
+        idx = np.flatnonzero(active)
+        Qa, pa, Qpa, pQpa = Q[idx], p[idx], Qp[idx], pQp[idx]
+        for t in range(k):
+            diff = (-Qpa[:, t] + pQpa) / Qa[:, t, t]
+            pa[:, t] += diff
+            scale = 1 + diff
+            pQpa = (pQpa + diff * (diff * Qa[:, t, t] + 2 * Qpa[:, t])) / scale / scale
+            Qpa = (Qpa + diff[:, np.newaxis] * Qa[:, t, :]) / scale[:, np.newaxis]
+            pa /= scale[:, np.newaxis]
+        p[idx] = pa
+
+    return p
+
+
+def _multiclass_probability_single(r):
+    """multiclass_probability libsvm untuk satu sampel (r: list k x k)"""
+    k = len(r)
+    Q = [[-r[j][t] * r[t][j] for j in range(k)] for t in range(k)]
+    for t in range(k):
+        Q[t][t] = sum(r[j][t] ** 2 for j in range(k) if j != t)
+
+    p = [1.0 / k] * k
+    eps = 0.005 / k
+    for _ in range(max(100, k)):
+        Qp = [sum(Q[t][j] * p[j] for j in range(k)) for t in range(k)]
+        pQp = sum(p[t] * Qp[t] for t in range(k))
+        if max(abs(Qp[t] - pQp) for t in range(k)) < eps:
+            break
+        for t in range(k):
+            diff = (-Qp[t] + pQp) / Q[t][t]
+            p[t] += diff
+            pQp = (pQp + diff * (diff * Q[t][t] + 2 * Qp[t])) / (1 + diff) / (1 + diff)
+            for j in range(k):
+                Qp[j] = (Qp[j] + diff * Q[t][j]) / (1 + diff)
+                p[j] /= (1 + diff)
+    return p
+
+
+def verify_against_sklearn(engine, model, X, scaler=None):
+    """
+    Bandingkan engine dengan SVC sklearn pada data X
+
+    Args:
+        X: fitur ter-scale untuk SVMEngine, atau fitur mentah untuk
+            FusedSVMPipeline (beri juga `scaler` untuk input sklearn)
+
+    Returns:
+        dict selisih absolut maksimum probabilitas dan decision function,
+        serta fraksi prediksi yang sama
+    """
+    X = np.asarray(X, dtype=np.float64)
+    X_model = scaler.transform(X) if scaler is not None else X
+    report = {
+        'n_samples': len(X),
+        'decision_max_abs_diff': float(np.max(np.abs(
+            engine.decision_function(X) - model.decision_function(X_model)))),
+        'predict_agreement': float(np.mean(engine.predict(X) == model.predict(X_model))),
+    }
+    if engine.prob_a is not None:
+        report['proba_max_abs_diff'] = float(np.max(np.abs(
+            engine.predict_proba(X) - model.predict_proba(X_model))))
+    return report
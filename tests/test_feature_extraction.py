@@ -0,0 +1,98 @@
+"""
+Test kesetaraan operator tekstur versi vektor dengan loop per-piksel asli
+
+Referensi di sini adalah salinan loop dari training notebook (versi
+feature_extraction.py sebelum divektorisasi). Hasil versi baru harus sama
+persis, bukan sekadar mendekati, karena model dilatih dengan versi loop.
+
+Jalankan dari root project:
+    python -m pytest tests/
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from feature_extraction import glcm_features, lbp_image
+
+
+def reference_glcm(gray_q):
+    """Loop GLCM per-piksel asli (training notebook), 20 nilai"""
+    fv = []
+    for dx, dy in [(1,0), (1,1), (0,1), (-1,1)]:
+        glcm = np.zeros((8, 8))
+        for i in range(1, gray_q.shape[0]-1):
+            for j in range(1, gray_q.shape[1]-1):
+                if 0 <= i+dy < gray_q.shape[0] and 0 <= j+dx < gray_q.shape[1]:
+                    glcm[gray_q[i,j], gray_q[i+dy,j+dx]] += 1
+
+        glcm = glcm / (glcm.sum() + 1e-7)
+        contrast = sum([(i-j)**2 * glcm[i,j] for i in range(8) for j in range(8)])
+        homogeneity = sum([glcm[i,j]/(1+abs(i-j)) for i in range(8) for j in range(8)])
+        energy = sum([glcm[i,j]**2 for i in range(8) for j in range(8)])
+        correlation = sum([i*j*glcm[i,j] for i in range(8) for j in range(8)])
+        entropy = -sum([glcm[i,j]*np.log(glcm[i,j]+1e-7) for i in range(8) for j in range(8)])
+        fv.extend([contrast, homogeneity, energy, correlation, entropy])
+    return fv
+
+
+def reference_lbp(gray):
+    """Loop LBP per-piksel asli (training notebook)"""
+    lbp = np.zeros_like(gray)
+    for i in range(1, gray.shape[0]-1):
+        for j in range(1, gray.shape[1]-1):
+            center = gray[i,j]
+            code = 0
+            code |= (gray[i-1,j-1] >= center) << 7
+            code |= (gray[i-1,j] >= center) << 6
+            code |= (gray[i-1,j+1] >= center) << 5
+            code |= (gray[i,j+1] >= center) << 4
+            code |= (gray[i+1,j+1] >= center) << 3
+            code |= (gray[i+1,j] >= center) << 2
+            code |= (gray[i+1,j-1] >= center) << 1
+            code |= (gray[i,j-1] >= center)
+            lbp[i,j] = code
+    return lbp
+
+
+def random_gray(shape, seed):
+    """Grayscale acak penuh 0..255 (hampir tidak ada nilai kembar antar tetangga)"""
+    return np.random.default_rng(seed).integers(0, 256, size=shape, dtype=np.uint8)
+
+
+def tie_heavy_gray(shape, seed):
+    """Grayscale dengan sedikit level (banyak tetangga bernilai sama dengan pusat)"""
+    rng = np.random.default_rng(seed)
+    return rng.choice(np.array([0, 1, 128, 255], dtype=np.uint8), size=shape)
+
+
+GRAY_IMAGES = [
+    pytest.param(random_gray((256, 256), 0), id='random-256'),
+    pytest.param(random_gray((37, 61), 1), id='random-ganjil'),
+    pytest.param(tie_heavy_gray((256, 256), 2), id='ties-256'),
+    pytest.param(tie_heavy_gray((23, 17), 3), id='ties-kecil'),
+    pytest.param(np.full((16, 16), 77, dtype=np.uint8), id='konstan'),
+    pytest.param(np.zeros((3, 3), dtype=np.uint8), id='minimal'),
+]
+
+
+@pytest.mark.parametrize('gray', GRAY_IMAGES)
+def test_glcm_features_bit_identical_to_reference_loop(gray):
+    gray_q = (gray // 32).astype(np.uint8)
+    expected = reference_glcm(gray_q)
+    result = glcm_features(gray_q)
+    assert len(result) == 20
+    # Bandingkan bit per bit (bukan approx), termasuk hasil sum() Python
+    assert np.array_equal(np.array(result), np.array(expected, dtype=np.float64))
+
+
+@pytest.mark.parametrize('gray', GRAY_IMAGES)
+def test_lbp_image_matches_reference_loop(gray):
+    expected = reference_lbp(gray)
+    result = lbp_image(gray)
+    assert result.dtype == expected.dtype
+    np.testing.assert_array_equal(result, expected)
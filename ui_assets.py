@@ -0,0 +1,121 @@
+"""
+Aset UI Statis (CSS & template HTML)
+
+Sebelumnya tema halaman dikirim sebagai blok <style> lewat st.markdown di
+setiap rerun (puluhan KB per rerun per sesi). Sekarang sumber CSS ada di
+assets/css/<nama>.css, di-minify sekali saat modul di-import, lalu ditulis
+ke static/<nama>.min.css yang di-serve Streamlit di app/static/
+(server.enableStaticServing). Halaman cukup mengirim satu tag <link> kecil
+dan browser men-cache stylesheet-nya; query ?v=<digest> berganti saat CSS
+berubah.
+
+Jika static serving mati atau folder static/ tidak bisa ditulis, CSS
+minified dikirim inline sebagai <style> (tetap lebih kecil dari aslinya).
+
+Template HTML halaman juga di-minify sekali di sini (modul ini di-cache
+di sys.modules, beda dengan script halaman yang dijalankan ulang setiap
+rerun).
+"""
+
+import hashlib
+import re
+from functools import lru_cache
+from pathlib import Path
+
+import streamlit as st
+
+from file_utils import atomic_write
+
+ROOT_DIR = Path(__file__).resolve().parent
+CSS_DIR = ROOT_DIR / 'assets' / 'css'
+STATIC_DIR = ROOT_DIR / 'static'  # folder static/ di samping app.py (main script)
+STATIC_URL = 'app/static'
+
+_CSS_COMMENT = re.compile(r'/\*.*?\*/', re.DOTALL)
+_CSS_SPACE_AROUND = re.compile(r'\s*([{};,>])\s*')
+_CSS_SPACE_AFTER_COLON = re.compile(r':\s+')
+_HTML_SPACE = re.compile(r'\s+')
+
+
+def minify_css(css):
+    """
+    Minify CSS sederhana: buang komentar dan whitespace yang tidak perlu
+
+    Spasi sebelum ':' sengaja tidak dibuang (`.a :hover` beda dengan
+    `.a:hover`).
+    """
+    css = _CSS_COMMENT.sub('', css)
+    css = _HTML_SPACE.sub(' ', css)
+    css = _CSS_SPACE_AROUND.sub(r'\1', css)
+    css = _CSS_SPACE_AFTER_COLON.sub(':', css)
+    return css.replace(';}', '}').strip()
+
+
+def minify_html(html):
+    """
+    Satukan whitespace template HTML menjadi satu spasi (satu baris)
+
+    Spasi antar tag tidak dibuang karena berarti untuk elemen inline.
+    Jangan dipakai untuk template yang berisi <pre> atau <script>.
+    """
+    return _HTML_SPACE.sub(' ', html.strip())
+
+
+def _write_if_changed(path, text):
+    """Tulis file secara atomik, hanya jika isinya berbeda"""
+    try:
+        if path.read_text(encoding='utf-8') == text:
+            return
+    except OSError:
+        pass
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with atomic_write(path, 'w', encoding='utf-8', permissions=0o644) as f:
+        f.write(text)
+
+
+def _css_servable():
+    """Streamlit lama (Tornado) hanya men-serve ekstensi tertentu dengan content-type aslinya"""
+    try:
+        from streamlit.web.server.app_static_file_handler import SAFE_APP_STATIC_FILE_EXTENSIONS
+    except ImportError:
+        return True
+    return '.css' in SAFE_APP_STATIC_FILE_EXTENSIONS
+
+
+def _static_serving_enabled():
+    try:
+        return bool(st.get_option('server.enableStaticServing')) and _css_servable()
+    except Exception:
+        return False
+
+
+@lru_cache(maxsize=None)
+def build_stylesheet(name):
+    """
+    Minify assets/css/<name>.css dan tulis ke static/<name>.min.css
+
+    Returns:
+        tuple (css_minified, digest, path atau None jika gagal ditulis)
+    """
+    css = minify_css((CSS_DIR / f'{name}.css').read_text(encoding='utf-8'))
+    digest = hashlib.blake2b(css.encode(), digest_size=6).hexdigest()
+    path = STATIC_DIR / f'{name}.min.css'
+    try:
+        _write_if_changed(path, css)
+    except OSError as e:
+        print(f"⚠️  Gagal menulis {path}: {e} (CSS dikirim inline)")
+        path = None
+    return css, digest, path
+
+
+@lru_cache(maxsize=None)
+def stylesheet_html(name):
+    """
+    HTML untuk memuat stylesheet `name` di halaman (untuk st.markdown)
+
+    <link> ke file static jika static serving aktif, selain itu <style> inline.
+    """
+    css, digest, path = build_stylesheet(name)
+    if path is not None and _static_serving_enabled():
+        return f'<link rel="stylesheet" href="{STATIC_URL}/{path.name}?v={digest}">'
+    return f'<style>{css}</style>'
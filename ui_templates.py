@@ -0,0 +1,306 @@
+"""
+Template HTML Halaman
+
+Blok HTML statis app.py dan pages/Tutorial.py, di-minify sekali saat
+import (script halaman sendiri dijalankan ulang di setiap rerun, modul ini
+tidak). Template dengan placeholder {nama} diisi dengan .format().
+"""
+
+import textwrap
+
+from ui_assets import minify_html
+
+# ==================== app.py ====================
+
+HEADER_HTML = minify_html("""
+<div class="main-header">
+    <h1>Deteksi Penyakit Daun Tebu</h1>
+    <p>Klasifikasi Penyakit Daun Tebu Menggunakan Support Vector Machine dengan Pendekatan Explainable AI</p>
+</div>
+""")
+
+GUIDE_HTML = minify_html("""
+<div class="info-box">
+    <strong>Panduan Penggunaan:</strong><br>
+    <strong>1.</strong> Upload foto daun tebu dari galeri atau ambil foto dengan kamera<br>
+    <strong>2.</strong> Preview akan muncul <span class="desktop-only">di sebelah kanan</span><span class="mobile-only">di bawah</span><br>
+    <strong>3.</strong> Klik tombol "Analisis Gambar"<br>
+    <strong>4.</strong> Lihat hasil deteksi dan analisis model<br><br>
+    <strong style="color: #d84315;">⚠️ PENTING:</strong> Hanya upload foto daun tebu! Jangan Foto Objek Lain.
+</div>
+""")
+
+CAMERA_INFO_HTML = minify_html("""
+<div style="background: #fff3e0; padding: 0.8rem 1rem; border-radius: 8px; margin-bottom: 1rem; border-left: 3px solid #ff9800;">
+    <p style="margin: 0; font-size: 0.8rem; color: #e65100; line-height: 1.5;">
+        📱 <strong>Info:</strong> Gunakan <strong>Kamera</strong>.
+        untuk memotret daun tebu anda!
+    </p>
+</div>
+""")
+
+# {img_base64}, {width}, {height}, {file_size_mb}
+PREVIEW_HTML = minify_html("""
+<div class="img-preview-box">
+    <img src="data:image/jpeg;base64,{img_base64}" alt="Preview">
+    <div class="img-caption">
+        <strong style="color: #2d5016;">{width} × {height} px</strong>
+        <span style="color: #2d5016; margin-left: 1rem;">• {file_size_mb:.2f} MB</span>
+    </div>
+</div>
+""")
+
+EMPTY_PREVIEW_HTML = minify_html("""
+<div class="img-preview-box">
+    <div class="empty-state">
+        <div class="empty-icon">📷</div>
+        <p>Gambar akan ditampilkan di sini</p>
+    </div>
+</div>
+""")
+
+_STATUS_HTML = minify_html("""
+<div style='text-align: center; margin: {margin};'>
+    <span style='font-size: {font_size}; color: #2d5016; font-weight: 600;'>
+        {text}
+    </span>
+</div>
+""")
+VALIDATING_HTML = _STATUS_HTML.format(margin='1.5rem 0 0.5rem 0', font_size='0.9rem',
+                                      text='🔍 Memvalidasi gambar...')
+SHAP_LOADING_HTML = _STATUS_HTML.format(margin='0.5rem 0', font_size='0.85rem',
+                                        text='🔍 Menganalisis model...')
+RECOMMENDATION_LOADING_HTML = _STATUS_HTML.format(margin='0.5rem 0', font_size='0.85rem',
+                                                  text='🤖 Menganalisis rekomendasi penanganan...')
+
+REJECTED_HTML = minify_html("""
+<div style="background: linear-gradient(135deg, #ffebee 0%, #ffcdd2 100%);
+            padding: 2rem;
+            border-radius: 20px;
+            border-left: 6px solid #f44336;
+            box-shadow: 0 6px 20px rgba(244, 67, 54, 0.15);
+            margin: 2rem 0;
+            text-align: center;">
+    <div style="font-size: 4rem; margin-bottom: 1rem;">❌</div>
+    <h2 style="color: #c62828; margin: 0 0 1rem 0; font-size: 1.5rem; font-weight: 800;">
+        Gambar Ditolak
+    </h2>
+    <p style="color: #d32f2f; font-size: 1.1rem; line-height: 1.7; margin: 0 0 1.5rem 0;">
+        Mohon upload foto <strong>daun tebu</strong> yang jelas.<br>
+        Jangan upload foto objek lain.
+    </p>
+    <div style="background: white; padding: 1.2rem; border-radius: 12px; margin-top: 1.5rem;">
+        <p style="margin: 0; color: #1b5e20; font-size: 0.95rem; line-height: 1.7;">
+            <strong>💡 Tips Foto yang Benar:</strong><br>
+            • Foto <strong>daun tebu</strong> dengan jelas dan fokus<br>
+            • Pastikan pencahayaan cukup<br>
+            • Jangan upload foto selain daun tebu
+        </p>
+    </div>
+</div>
+""")
+
+# {disease_name}
+DISEASE_CARD_HTML = minify_html("""
+<div class="result-card">
+    <div class="result-label">Penyakit Terdeteksi</div>
+    <div class="result-value">{disease_name}</div>
+</div>
+""")
+
+# {confidence}, {other_classes_html}
+PROBABILITY_CARD_HTML = minify_html("""
+<div class="result-card">
+    <div class="result-label">Probabilitas Model</div>
+    <div class="result-value">{confidence:.1f}%</div>
+    <div class="result-desc">Akurasi prediksi antar kelas</div>
+    <div style="margin-top: 1rem; padding-top: 1rem; border-top: 1px solid #e1e8dd; color: #666; font-size: 0.75rem; line-height: 1.8;">
+        {other_classes_html}
+    </div>
+</div>
+""")
+
+# {background}, {border}, {color}, {explanation}
+PLOT_NOTE_HTML = minify_html("""
+<div style="background: {background}; padding: 0.7rem 0.9rem; border-radius: 6px; margin-top: 0.5rem;
+            border-left: 3px solid {border};">
+    <p style="margin: 0; font-size: 0.8rem; color: {color}; line-height: 1.5;">
+        {explanation}
+    </p>
+</div>
+""")
+
+# {message}
+AI_RECOMMENDATION_HTML = minify_html("""
+<div style="background: linear-gradient(135deg, #fff8e1 0%, #ffffff 100%);
+            padding: 1.5rem 2rem;
+            border-radius: 16px;
+            border-left: 5px solid #ffa726;
+            box-shadow: 0 4px 12px rgba(0,0,0,0.08);
+            margin-bottom: 2rem;">
+    <div class="gemini-recommendation" style="color: #e65100; font-size: 0.9rem; line-height: 1.8;">
+        {message}
+    </div>
+    <div style="margin-top: 1.5rem; padding-top: 1rem; border-top: 1px solid #ffe0b2;">
+        <p style="margin: 0; font-size: 0.8rem; color: #f57c00; font-style: italic;">
+            🤖 <strong>Sumber:</strong> Rekomendasi dari Gemini AI.
+            Untuk penanganan spesifik, konsultasikan dengan penyuluh pertanian setempat.
+        </p>
+    </div>
+</div>
+""")
+
+# {bg_color}, {border_color}, {error_message}
+RECOMMENDATION_ERROR_HTML = minify_html("""
+<div style="background: {bg_color};
+            padding: 1.5rem 2rem;
+            border-radius: 16px;
+            border-left: 5px solid {border_color};
+            box-shadow: 0 4px 12px rgba(0,0,0,0.08);
+            margin-bottom: 2rem;">
+    <div style="font-size: 0.95rem; line-height: 1.8; color: #333;">
+        {error_message}
+    </div>
+    <div style="margin-top: 1.5rem; padding-top: 1rem; border-top: 1px solid rgba(0,0,0,0.1);">
+        <p style="margin: 0; font-size: 0.85rem; color: #666; font-weight: 600;">
+            💬 <strong>Alternatif:</strong> Hasil deteksi penyakit di atas tetap akurat.
+            Silakan konsultasi dengan penyuluh pertanian setempat untuk mendapatkan rekomendasi penanganan.
+        </p>
+    </div>
+</div>
+""")
+
+RECOMMENDATION_UNAVAILABLE_HTML = minify_html("""
+<div style="background: #fff3e0; padding: 1.5rem 2rem; border-radius: 16px;
+            border-left: 5px solid #ff9800; margin-bottom: 2rem;
+            box-shadow: 0 4px 12px rgba(0,0,0,0.08);">
+    <p style="margin: 0; color: #e65100; font-size: 0.95rem; line-height: 1.8;">
+        ℹ️ <strong>Rekomendasi AI tidak tersedia saat ini</strong><br><br>
+        Sistem tidak dapat memberikan rekomendasi otomatis. Namun hasil deteksi penyakit tetap akurat dan dapat dipercaya.<br><br>
+        <strong>Langkah selanjutnya:</strong><br>
+        • Catat nama penyakit yang terdeteksi<br>
+        • Hubungi penyuluh pertanian terdekat<br>
+        • Tunjukkan hasil deteksi ini untuk konsultasi lebih lanjut
+    </p>
+</div>
+""")
+
+TUTORIAL_BUTTON_HTML = minify_html("""
+<a href="/Tutorial" target="_self" class="tutorial-floating-btn">
+    <span class="icon">📚</span>
+    <span>Tutorial</span>
+</a>
+""")
+
+# ==================== pages/Tutorial.py ====================
+
+# Berisi <script>, jadi tidak di-minify
+FLOATING_MENU_HTML = textwrap.dedent("""
+<div class="floating-menu-btn" onclick="toggleFloatingMenu()">☰</div>
+
+<div class="floating-menu" id="floatingMenu">
+    <a href="/">🏠 Beranda</a>
+    <a href="/Tutorial" class="active">📚 Tutorial</a>
+    <a href="/Penyakit">🌿 Penyakit</a>
+</div>
+
+<script>
+function toggleFloatingMenu() {
+    var menu = document.getElementById('floatingMenu');
+    menu.classList.toggle('show');
+}
+
+document.addEventListener('click', function(event) {
+    var menu = document.getElementById('floatingMenu');
+    var btn = document.querySelector('.floating-menu-btn');
+    if (!menu.contains(event.target) && !btn.contains(event.target)) {
+        menu.classList.remove('show');
+    }
+});
+</script>
+""")
+
+TUTORIAL_HEADER_HTML = minify_html("""
+<div class="tutorial-header">
+    <h1>📚 Tutorial Penggunaan</h1>
+    <p>Panduan lengkap menggunakan sistem deteksi penyakit daun tebu</p>
+</div>
+""")
+
+DO_CARD_HTML = minify_html("""
+<div class="do-card">
+    <h3>✅ Yang Harus Dilakukan</h3>
+    <ul>
+        <li><strong>Fokus pada 1 daun</strong> yang jelas terlihat</li>
+        <li><strong>Jarak 20-50 cm</strong> dari daun</li>
+        <li><strong>Daun mengisi 60-70%</strong> area foto</li>
+        <li><strong>Foto di siang hari</strong> dengan cahaya cukup</li>
+        <li><strong>Pastikan tajam</strong> dan tidak blur</li>
+    </ul>
+</div>
+""")
+
+DONT_CARD_HTML = minify_html("""
+<div class="dont-card">
+    <h3>❌ Yang Harus Dihindari</h3>
+    <ul>
+        <li><strong>Foto dari jarak terlalu jauh</strong></li>
+        <li><strong>Banyak daun lain</strong> dalam frame</li>
+        <li><strong>Ada tangan atau orang</strong> dalam foto</li>
+        <li><strong>Foto blur</strong> atau tidak fokus</li>
+        <li><strong>Pencahayaan terlalu gelap</strong></li>
+    </ul>
+</div>
+""")
+
+STEPS_HTML = [minify_html(step) for step in ("""
+<div class="step-box">
+    <h3>1️⃣ Upload Foto Daun</h3>
+    <p><strong>Dari HP:</strong> Klik tombol 'Browse files', kemudian pilih foto dari galeri atau ambil foto langsung</p>
+    <p><strong>Dari Laptop:</strong> Klik tombol 'Browse files' atau langsung drag & drop foto ke area upload</p>
+</div>
+""", """
+<div class="step-box">
+    <h3>2️⃣ Lakukan Analisis</h3>
+    <ul>
+        <li>Preview foto akan muncul di layar</li>
+        <li>Klik tombol hijau <strong>'Analisis Gambar'</strong></li>
+        <li>Tunggu 5-15 detik untuk proses analisis</li>
+        <li>Jangan tutup atau refresh aplikasi selama proses</li>
+    </ul>
+</div>
+""", """
+<div class="step-box">
+    <h3>3️⃣ Lihat dan Pahami Hasil</h3>
+    <p>Setelah analisis selesai, sistem akan menampilkan:</p>
+    <ul>
+        <li><strong>Nama penyakit</strong> yang terdeteksi</li>
+        <li><strong>Tingkat keyakinan</strong> sistem dalam persentase</li>
+        <li><strong>3 visualisasi XAI</strong> untuk menjelaskan keputusan AI</li>
+        <li><strong>Rekomendasi penanganan</strong> yang dapat dilakukan</li>
+    </ul>
+</div>
+""")]
+
+_FAQ = [
+    ("❓ Kamera HP tidak bisa diakses?",
+     "Gunakan opsi 'Browse files' untuk memilih foto dari galeri. Fitur kamera langsung membutuhkan koneksi HTTPS untuk alasan keamanan."),
+    ("❓ Apakah foto blur bisa dianalisis?",
+     "Bisa, namun hasilnya kemungkinan kurang akurat. Sebaiknya ambil foto ulang yang lebih fokus dan tajam untuk hasil terbaik."),
+    ("❓ Berapa lama waktu analisis?",
+     "Normalnya memakan waktu 5-15 detik, tergantung kecepatan koneksi internet dan ukuran file foto."),
+    ("❓ Apakah hasil analisis bisa salah?",
+     "Tidak ada sistem AI yang 100% sempurna. Untuk hasil terbaik, gunakan foto berkualitas tinggi dan perhatikan tingkat keyakinan sistem (>80% = hasil akurat)."),
+    ("❓ Bisa analisis banyak foto sekaligus?",
+     "Saat ini sistem hanya dapat menganalisis satu foto per waktu. Untuk menganalisis foto berikutnya, silakan upload foto baru dan klik 'Analisis Gambar' lagi."),
+    ("❓ Bagaimana cara mendapat hasil paling akurat?",
+     "Ambil foto di siang hari dengan cahaya alami, fokuskan pada 1 daun yang menunjukkan gejala jelas, pastikan jarak 20-50 cm, dan foto harus tajam (tidak blur)."),
+]
+
+FAQ_HTML = ''.join(
+    minify_html(f"""
+    <div class="faq-card">
+        <div class="faq-question">{question}</div>
+        <div class="faq-answer">{answer}</div>
+    </div>
+    """) for question, answer in _FAQ)
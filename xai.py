@@ -0,0 +1,369 @@
+"""
+Explainable AI Module untuk Klasifikasi Penyakit Daun Tebu
+Backend explainer yang bisa dipilih untuk tab Force/Waterfall/Importance
+
+Semua backend punya antarmuka yang sama:
+    explainer.expected_value            -> array (n_classes,)
+    explainer.shap_values(features, progress=None)
+                                        -> array (n_classes, 1, n_players)
+    explainer.feature_values(features)  -> array (1, n_players)
+    explainer.group_names               -> None (per fitur) / list nama grup
+
+n_players = n_features untuk backend per fitur, atau jumlah grup untuk
+backend 'grouped'. `progress` (opsional) dipanggil dengan fraksi 0..1
+selama perhitungan, dipakai untuk progress bar di UI.
+
+shap dan sklearn.cluster baru di-import saat dibutuhkan, jadi backend
+'linear' dan import modul ini tidak membayar biaya import shap.
+"""
+
+import hashlib
+from pathlib import Path
+
+import numpy as np
+
+from feature_extraction import create_feature_groups
+
+SUMMARY_METHODS = ('kmeans', 'medoids')
+
+# Koalisi acak tambahan di atas 2 x jumlah grup (default nsamples backend 'grouped')
+GROUPED_EXTRA_SAMPLES = 64
+
+
+def normalize_shap_values(shap_values, n_classes):
+    """Samakan bentuk output SHAP menjadi (n_classes, n_samples, n_features)"""
+    if isinstance(shap_values, list):
+        shap_values = np.stack(shap_values, axis=0)
+
+    if shap_values.ndim == 3:
+        if shap_values.shape[2] == n_classes:
+            shap_values = np.transpose(shap_values, (2, 0, 1))
+        elif shap_values.shape[1] == n_classes:
+            shap_values = np.transpose(shap_values, (1, 0, 2))
+    elif shap_values.ndim == 2:
+        shap_values = shap_values[np.newaxis, :, :]
+
+    return shap_values
+
+
+def summarize_background(background, k, method='kmeans', random_state=0):
+    """
+    Ringkas background SHAP menjadi k titik berbobot
+
+    Args:
+        background: array (n, n_features)
+        k: jumlah titik ringkasan (None/0 atau >= n = tanpa ringkasan)
+        method: 'kmeans' (pusat cluster) atau 'medoids' (baris asli yang
+            paling dekat dengan pusat cluster)
+
+    Returns:
+        (data (k, n_features), weights (k,)) dengan sum(weights) == 1
+    """
+    background = np.asarray(background, dtype=np.float64)
+    if method not in SUMMARY_METHODS:
+        raise ValueError(f"Metode ringkasan tidak dikenal: {method} "
+                         f"(pilihan: {', '.join(SUMMARY_METHODS)})")
+    if not k or k >= len(background):
+        return background, np.full(len(background), 1.0 / len(background))
+
+    from sklearn.cluster import KMeans
+    kmeans = KMeans(n_clusters=k, n_init=10, random_state=random_state).fit(background)
+    weights = np.bincount(kmeans.labels_, minlength=k) / len(background)
+
+    if method == 'kmeans':
+        return kmeans.cluster_centers_, weights
+
+    medoids = np.empty((k, background.shape[1]))
+    for c in range(k):
+        members = background[kmeans.labels_ == c]
+        dist = np.sum((members - kmeans.cluster_centers_[c]) ** 2, axis=1)
+        medoids[c] = members[np.argmin(dist)]
+    return medoids, weights
+
+
+def load_background_summary(model_path, background, k, method='kmeans'):
+    """
+    Ringkasan background dengan cache di disk di sebelah file model
+
+    File cache: <model>.background-<method>-k<k>.npz, dihitung ulang
+    otomatis bila isi background di model berubah.
+    """
+    background = np.ascontiguousarray(background, dtype=np.float64)
+    if not k or k >= len(background):
+        return summarize_background(background, k, method)
+
+    digest = hashlib.sha1(background.tobytes()).hexdigest()
+    model_path = Path(model_path)
+    cache_path = model_path.with_name(f"{model_path.stem}.background-{method}-k{k}.npz")
+
+    if cache_path.exists():
+        try:
+            cached = np.load(cache_path)
+            if str(cached['digest']) == digest:
+                return cached['data'], cached['weights']
+        except Exception as e:
+            print(f"⚠️  Cache background rusak, dihitung ulang: {e}")
+
+    data, weights = summarize_background(background, k, method)
+    try:
+        np.savez(cache_path, data=data, weights=weights, digest=digest)
+    except OSError as e:
+        print(f"⚠️  Cache background tidak bisa disimpan: {e}")
+    return data, weights
+
+
+class KernelShapExplainer:
+    """
+    SHAP KernelExplainer (exact, lambat: 10-30 detik per gambar)
+
+    Semua koalisi satu gambar dievaluasi KernelExplainer dalam satu panggilan
+    model besar (nsamples x baris background). Panggilan itu dipecah per
+    batch supaya `progress` bergerak selama perhitungan, bukan hanya sekali
+    di akhir gambar. KernelExplainer menyimpan state per panggilan di
+    instance-nya, jadi dibuat baru per gambar (aman dipakai beberapa thread
+    worker sekaligus).
+    """
+    name = 'kernel'
+    group_names = None
+
+    def __init__(self, predict_fn, background, n_classes, background_weights=None,
+                 nsamples=50, batch_size=8192):
+        import shap
+        from shap.utils._legacy import DenseData
+
+        if background_weights is not None:
+            background = DenseData(np.asarray(background),
+                                   [str(i) for i in range(np.shape(background)[1])],
+                                   None, np.array(background_weights, dtype=np.float64))
+        self.predict_fn = predict_fn
+        self.background = background
+        self.n_background = np.shape(getattr(background, 'data', background))[0]
+        self.batch_size = batch_size
+        self.expected_value = shap.KernelExplainer(predict_fn, background).expected_value
+        self.n_classes = n_classes
+        self.nsamples = nsamples
+
+    def _batched_predict(self, X, progress=None):
+        """predict_fn per batch, progress dilaporkan setelah setiap batch"""
+        # Hanya panggilan koalisi yang dilaporkan; f(x) dan evaluasi background
+        # (expected value) diabaikan. Minimal ~10 batch agar progress bertahap.
+        if not progress or len(X) <= self.n_background:
+            return self.predict_fn(X)
+        rows = max(1, min(self.batch_size, -(-len(X) // 10)))
+        outputs = []
+        for start in range(0, len(X), rows):
+            outputs.append(np.asarray(self.predict_fn(X[start:start+rows])))
+            progress((start + len(outputs[-1])) / len(X))
+        return np.concatenate(outputs)
+
+    def shap_values(self, features_scaled, progress=None):
+        import shap
+
+        results = []
+        for s in range(len(features_scaled)):
+            report = None
+            if progress:
+                report = lambda done, s=s: progress((s + done) / len(features_scaled))
+            explainer = shap.KernelExplainer(
+                lambda X: self._batched_predict(X, report), self.background)
+            values = explainer.shap_values(features_scaled[s:s+1], nsamples=self.nsamples)
+            results.append(normalize_shap_values(values, self.n_classes))
+            if progress:
+                progress((s + 1) / len(features_scaled))
+        return np.concatenate(results, axis=1)
+
+    def feature_values(self, features_scaled):
+        return features_scaled
+
+
+class LinearSurrogateExplainer:
+    """
+    Surrogate linear dari model di sekitar titik-titik background
+
+    Saat dibuat, Jacobian probabilitas tiap kelas terhadap fitur dihitung
+    (central finite difference, dievaluasi dalam batch) di maksimal
+    `max_centers` titik background. Saat menjelaskan gambar, Jacobian dari
+    titik terdekat dipakai sebagai bobot linear:
+
+        phi_j = w_j * (x_j - E[x_j])
+
+    lalu selisih terhadap f(x) - E[f(x)] dibagi proporsional ke |phi| agar
+    total kontribusi tetap sama dengan output model (local accuracy).
+    Biaya per gambar: satu panggilan predict_proba.
+    """
+    name = 'linear'
+    group_names = None
+
+    def __init__(self, predict_fn, background, n_classes, background_weights=None,
+                 max_centers=10, epsilon=1e-3, batch_size=2048):
+        background = np.asarray(background, dtype=np.float64)
+        self.predict_fn = predict_fn
+        self.n_classes = n_classes
+        self.background_mean = np.average(background, axis=0, weights=background_weights)
+        self.expected_value = np.average(np.asarray(predict_fn(background)), axis=0,
+                                         weights=background_weights)
+
+        if len(background) > max_centers:
+            if background_weights is not None:
+                idx = np.sort(np.argsort(background_weights)[::-1][:max_centers])
+            else:
+                idx = np.linspace(0, len(background) - 1, max_centers).round().astype(int)
+            self.centers = background[idx]
+        else:
+            self.centers = background
+
+        self.jacobians = np.stack([
+            self._jacobian(center, epsilon, batch_size) for center in self.centers
+        ])
+
+    def _jacobian(self, center, epsilon, batch_size):
+        """Jacobian (n_classes, n_features) dengan central difference"""
+        n_features = center.shape[0]
+        steps = np.eye(n_features) * epsilon
+        points = np.concatenate([center + steps, center - steps])
+
+        outputs = np.concatenate([
+            np.asarray(self.predict_fn(points[i:i+batch_size]))
+            for i in range(0, len(points), batch_size)
+        ])
+        return ((outputs[:n_features] - outputs[n_features:]) / (2 * epsilon)).T
+
+    def shap_values(self, features_scaled, progress=None):
+        features_scaled = np.asarray(features_scaled, dtype=np.float64)
+        output = np.asarray(self.predict_fn(features_scaled))
+
+        result = np.empty((self.n_classes,) + features_scaled.shape)
+        for s, x in enumerate(features_scaled):
+            nearest = np.argmin(np.sum((self.centers - x) ** 2, axis=1))
+            phi = self.jacobians[nearest] * (x - self.background_mean)
+
+            # Local accuracy: sum(phi) == f(x) - E[f(x)]
+            residual = (output[s] - self.expected_value) - phi.sum(axis=1)
+            weight = np.abs(phi)
+            weight_sum = weight.sum(axis=1, keepdims=True)
+            weight = np.divide(weight, weight_sum, where=weight_sum > 0,
+                               out=np.full_like(weight, 1.0 / weight.shape[1]))
+            result[:, s, :] = phi + residual[:, np.newaxis] * weight
+            if progress:
+                progress((s + 1) / len(features_scaled))
+
+        return result
+
+    def feature_values(self, features_scaled):
+        return features_scaled
+
+
+class GroupedKernelShapExplainer:
+    """
+    KernelSHAP per kelompok fitur semantik (default 23 grup dari
+    create_feature_groups) alih-alih 1003 fitur independen
+
+    Setiap "pemain" adalah satu grup: grup yang tidak hadir diisi nilai
+    background. Ruang koalisi turun dari 2^1003 ke 2^23, sehingga
+    `nsamples` kecil sudah stabil dan jumlah evaluasi model per gambar
+    = nsamples x jumlah baris background.
+
+    Default nsamples = 2 x jumlah grup + GROUPED_EXTRA_SAMPLES: semua
+    koalisi ukuran 1 dan G-1 dienumerasi exact oleh KernelExplainer, sisanya
+    sampel acak.
+    """
+    name = 'grouped'
+
+    def __init__(self, predict_fn, background, n_classes, background_weights=None,
+                 groups=None, nsamples=None, batch_size=8192):
+        if groups is None:
+            groups = create_feature_groups()
+        if nsamples is None:
+            nsamples = 2 * len(groups) + GROUPED_EXTRA_SAMPLES
+        self.predict_fn = predict_fn
+        self.background = np.asarray(background, dtype=np.float64)
+        if background_weights is None:
+            background_weights = np.ones(len(self.background))
+        self.background_weights = np.asarray(background_weights, dtype=np.float64)
+        self.background_weights = self.background_weights / self.background_weights.sum()
+        self.n_classes = n_classes
+        self.nsamples = nsamples
+        self.batch_size = batch_size
+
+        self.group_names = [name for name, _ in groups]
+        self.membership = np.zeros((len(groups), self.background.shape[1]))
+        for g, (_, indices) in enumerate(groups):
+            self.membership[g, indices] = 1.0
+
+        self.expected_value = self.background_weights @ np.asarray(predict_fn(self.background))
+
+    def _masked_predict(self, x, masks, progress=None):
+        """Rata-rata prediksi atas background untuk setiap mask grup (n, G)"""
+        feature_masks = masks @ self.membership
+        n_bg, n_features = self.background.shape
+        delta = x - self.background
+
+        outputs = np.empty((len(masks), self.n_classes))
+        rows = max(1, self.batch_size // n_bg)
+        # Progress hanya untuk evaluasi koalisi; panggilan 1 baris (f(x) dan
+        # expected value) diabaikan. Minimal ~10 batch agar progress bertahap.
+        if len(masks) == 1:
+            progress = None
+        if progress:
+            rows = min(rows, max(1, -(-len(masks) // 10)))
+        for start in range(0, len(masks), rows):
+            m = feature_masks[start:start+rows]
+            synth = self.background[np.newaxis] + m[:, np.newaxis, :] * delta[np.newaxis]
+            pred = np.asarray(self.predict_fn(synth.reshape(-1, n_features)))
+            outputs[start:start+len(m)] = np.tensordot(
+                pred.reshape(len(m), n_bg, -1), self.background_weights, axes=([1], [0]))
+            if progress:
+                progress((start + len(m)) / len(masks))
+        return outputs
+
+    def shap_values(self, features_scaled, progress=None):
+        import shap
+
+        features_scaled = np.asarray(features_scaled, dtype=np.float64)
+        n_groups = len(self.group_names)
+
+        result = np.empty((self.n_classes, len(features_scaled), n_groups))
+        for s, x in enumerate(features_scaled):
+            report = None
+            if progress:
+                report = lambda done, s=s: progress((s + done) / len(features_scaled))
+            explainer = shap.KernelExplainer(
+                lambda masks: self._masked_predict(x, masks, report), np.zeros((1, n_groups)))
+            values = explainer.shap_values(np.ones((1, n_groups)), nsamples=self.nsamples,
+                                           l1_reg=False, silent=True)
+            result[:, s, :] = normalize_shap_values(values, self.n_classes)[:, 0, :]
+        return result
+
+    def feature_values(self, features_scaled):
+        """Nilai rata-rata fitur (ter-scale) dalam setiap grup"""
+        return (features_scaled @ self.membership.T) / self.membership.sum(axis=1)
+
+
+EXPLAINER_BACKENDS = {
+    KernelShapExplainer.name: KernelShapExplainer,
+    LinearSurrogateExplainer.name: LinearSurrogateExplainer,
+    GroupedKernelShapExplainer.name: GroupedKernelShapExplainer,
+}
+
+DEFAULT_BACKEND = LinearSurrogateExplainer.name
+
+
+def create_explainer(backend, predict_fn, background, n_classes,
+                     background_weights=None, **kwargs):
+    """
+    Buat explainer sesuai nama backend
+
+    Args:
+        backend: 'linear' (cepat, default), 'grouped' (KernelSHAP per grup
+            fitur) atau 'kernel' (KernelExplainer exact per fitur)
+        predict_fn: fungsi X -> probabilitas (n_samples, n_classes)
+        background: data background yang sudah di-scale
+        n_classes: jumlah kelas
+        background_weights: bobot tiap baris background (hasil
+            summarize_background), None = bobot sama
+    """
+    if backend not in EXPLAINER_BACKENDS:
+        raise ValueError(f"Backend explainer tidak dikenal: {backend} "
+                         f"(pilihan: {', '.join(EXPLAINER_BACKENDS)})")
+    return EXPLAINER_BACKENDS[backend](predict_fn, background, n_classes,
+                                       background_weights=background_weights, **kwargs)